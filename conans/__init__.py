@@ -17,7 +17,9 @@ CHECKSUM_DEPLOY = "checksum_deploy"  # Only when v2
 REVISIONS = "revisions"  # Only when enabled in config, not by default look at server_launcher.py
 ONLY_V2 = "only_v2"  # Remotes and virtuals from Artifactory returns this capability
 OAUTH_TOKEN = "oauth_token"
-SERVER_CAPABILITIES = [COMPLEX_SEARCH_CAPABILITY, REVISIONS]  # Server is always with revisions
+ARCHIVE_XZ = "archive_xz"  # The remote accepts .txz archives of recipes and packages
+SERVER_CAPABILITIES = [COMPLEX_SEARCH_CAPABILITY, REVISIONS, ARCHIVE_XZ,
+                       CHECKSUM_DEPLOY]  # Server is always with revisions
 DEFAULT_REVISION_V1 = "0"
 
 __version__ = '1.21.0-dev'
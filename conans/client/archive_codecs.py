@@ -0,0 +1,91 @@
+import os
+import tarfile
+
+from conans import ARCHIVE_XZ
+from conans.errors import ConanException
+from conans.util.files import gzopen_without_timestamps
+
+DEFAULT_ARCHIVE_CODEC = "gzip"
+
+
+class GzipCodec(object):
+    name = "gzip"
+    extension = ".tgz"
+    capability = None  # Every remote understands it
+
+    @staticmethod
+    def available():
+        return True
+
+    @staticmethod
+    def open(name, fileobj):
+        return gzopen_without_timestamps(name, mode="w", fileobj=fileobj)
+
+
+class XzCodec(object):
+    name = "xz"
+    extension = ".txz"
+    capability = ARCHIVE_XZ
+
+    @staticmethod
+    def available():
+        try:
+            import lzma  # Not in the Python 2 stdlib
+            lzma.LZMAFile
+        except (ImportError, AttributeError):
+            return False
+        return True
+
+    @staticmethod
+    def open(name, fileobj):
+        # xz doesn't store timestamps, the archive is reproducible as the gzip one
+        return tarfile.open(name, mode="w:xz", fileobj=fileobj)
+
+
+# In order of preference to download, when a recipe or package has archives of several codecs
+ARCHIVE_CODECS = [GzipCodec, XzCodec]
+
+
+def get_codec(name):
+    for codec in ARCHIVE_CODECS:
+        if codec.name == name:
+            if not codec.available():
+                raise ConanException("The '%s' archive codec is not available in this Python"
+                                     % name)
+            return codec
+    raise ConanException("Unknown archive codec '%s', use one of: %s"
+                         % (name, ", ".join(c.name for c in ARCHIVE_CODECS)))
+
+
+def archive_name(tgz_name, codec):
+    """ the name of the archive of a codec, i.e. conan_package.txz for conan_package.tgz
+    """
+    return os.path.splitext(tgz_name)[0] + codec.extension
+
+
+def codec_for(filename):
+    """ the codec of an archive file name
+    """
+    extension = os.path.splitext(filename)[1]
+    for codec in ARCHIVE_CODECS:
+        if codec.extension == extension:
+            return codec
+    raise ConanException("Unknown archive format '%s'" % filename)
+
+
+def filter_archives(tgz_name, files):
+    """ the list of files to download of a recipe or package, with just one of the archives
+    for tgz_name, the first one present in the preferred order
+    """
+    bare_name = os.path.splitext(tgz_name)[0]
+    present = [f for f in files if os.path.splitext(f)[0] == bare_name]
+    selected = None
+    for codec in ARCHIVE_CODECS:
+        name = archive_name(tgz_name, codec)
+        if name in present and codec.available():
+            selected = name
+            break
+    if present and not selected:
+        raise ConanException("This Conan version is not prepared to handle '%s' file format. "
+                             "Please upgrade conan client." % present[0])
+    return [f for f in files if f == selected or f not in present]
@@ -0,0 +1,120 @@
+import os
+import shutil
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from conans.util.files import mkdir, replace_atomically, rmdir, touch
+
+ARCHIVE_CACHE_FOLDER = "archive_cache"
+
+# The summary hashes of the archives used by the threads of this process (e.g. concurrent
+# uploads), that can't be evicted while in use
+_in_use = defaultdict(int)
+_in_use_lock = threading.Lock()
+
+
+class ArchiveCache(object):
+    """ Archives (conan_export.tgz, conan_sources.tgz, conan_package.tgz, of any codec) built for
+    an upload or obtained by a download, stored in the client cache by the summary hash of the
+    manifest of their recipe or package. As long as the manifest doesn't change, uploading it
+    again, to the same or other remote, reuses them instead of compressing again. When the
+    stored archives exceed max_size (MB), the least recently used ones are removed
+    """
+
+    def __init__(self, cache_folder, max_size):
+        self._folder = os.path.join(cache_folder, ARCHIVE_CACHE_FOLDER)
+        self._max_size = max_size * 1024 * 1024 if max_size else None
+
+    @property
+    def enabled(self):
+        return bool(self._max_size)
+
+    def _path(self, summary_hash, name):
+        return os.path.join(self._folder, summary_hash, name)
+
+    def get(self, summary_hash, name):
+        """ the path of the stored archive, or None if not stored
+        """
+        if not self.enabled:
+            return None
+        path = self._path(summary_hash, name)
+        try:
+            touch(path)  # Recently used, the last one to be evicted
+        except OSError:
+            return None
+        return path
+
+    @contextmanager
+    def in_use(self, summary_hash):
+        """ the archives of summary_hash are not evicted (by any ArchiveCache of this process)
+        while in use
+        """
+        with _in_use_lock:
+            _in_use[summary_hash] += 1
+        try:
+            yield
+        finally:
+            with _in_use_lock:
+                _in_use[summary_hash] -= 1
+                if not _in_use[summary_hash]:
+                    del _in_use[summary_hash]
+
+    def store(self, summary_hash, name, path):
+        """ moves the archive at path to the cache, returning its new path, or None if it
+        wasn't stored (the archive is kept at path)
+        """
+        if not self.enabled or os.path.getsize(path) > self._max_size:
+            return None
+        cache_path = self._path(summary_hash, name)
+        # Other processes can be storing the same archive, it is atomically replaced. If it
+        # fails, the archive is moved back to path
+        try:
+            mkdir(os.path.dirname(cache_path))
+            replace_atomically(cache_path, lambda tmp_path: shutil.move(path, tmp_path),
+                               discard=lambda tmp_path: shutil.move(tmp_path, path))
+        except (IOError, OSError):
+            return None
+        self._evict(keep=summary_hash)
+        return cache_path
+
+    def _evict(self, keep):
+        """ removes the least recently used archives until the size of the cache is below the
+        limit. The archives of 'keep' and the ones in use are never removed
+        """
+        with _in_use_lock:
+            pinned = set(_in_use)
+        pinned.add(keep)
+        entries = []
+        total_size = 0
+        for summary_hash in os.listdir(self._folder):
+            folder = os.path.join(self._folder, summary_hash)
+            try:
+                names = os.listdir(folder)
+            except OSError:  # Concurrently evicted
+                continue
+            for name in names:
+                path = os.path.join(folder, name)
+                try:
+                    st = os.stat(path)
+                except OSError:  # Concurrently evicted
+                    continue
+                total_size += st.st_size
+                if summary_hash not in pinned:
+                    entries.append((st.st_mtime, st.st_size, path))
+
+        for _, size, path in sorted(entries):
+            if total_size <= self._max_size:
+                break
+            try:
+                os.remove(path)
+                total_size -= size
+            except OSError:
+                continue
+            try:  # Take advantage that os.rmdir does not delete non-empty dirs
+                os.rmdir(os.path.dirname(path))
+            except OSError:
+                pass
+
+    def clear(self):
+        rmdir(self._folder)
@@ -0,0 +1,54 @@
+import imp
+import marshal
+import os
+import sys
+
+from conans.util.files import evict_least_recently_used, save_atomically, to_file_bytes, touch
+from conans.util.sha import sha1
+
+BYTECODE_CACHE_FOLDER = "bytecode_cache"
+BYTECODE_CACHE_MAX_ENTRIES = 1000
+
+
+class BytecodeCache(object):
+    """ Compiled code objects of the conanfiles (recipes and python_requires), stored in the
+    client cache, so an unchanged conanfile is just unmarshaled instead of compiled again. As the
+    .pyc files, there is one entry per conanfile path and Python version, valid while the hash
+    of the conanfile contents doesn't change. Just the BYTECODE_CACHE_MAX_ENTRIES most recently
+    used entries are kept
+    """
+
+    def __init__(self, cache_folder):
+        self._folder = os.path.join(cache_folder, BYTECODE_CACHE_FOLDER)
+
+    def _path(self, conanfile_path):
+        key = "%s\n%s" % (os.path.abspath(conanfile_path), sys.version)
+        return os.path.join(self._folder, "%s.bin" % sha1(to_file_bytes(key)))
+
+    def code(self, conanfile_path):
+        """ the code object of the conanfile, from the cache if it was already compiled with
+        the same contents, otherwise compiled and stored for the next time
+        """
+        with open(conanfile_path, "rb") as f:
+            source = f.read()
+        header = imp.get_magic() + to_file_bytes(sha1(source)) + b"\n"
+        path = self._path(conanfile_path)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            if data.startswith(header):
+                code = marshal.loads(data[len(header):])
+                touch(path)  # Recently used, the last one to be evicted
+                return code
+        except Exception:  # Missing or corrupted entry, it is just a cache
+            pass
+
+        code = compile(source, conanfile_path, "exec", dont_inherit=True)
+        # Other processes can be reading or writing the same entry, it is atomically replaced
+        try:
+            save_atomically(path, header + marshal.dumps(code))
+        except (IOError, OSError):  # Not stored, it will be compiled again next time
+            pass
+        else:
+            evict_least_recently_used(self._folder, BYTECODE_CACHE_MAX_ENTRIES)
+        return code
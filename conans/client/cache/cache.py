@@ -4,8 +4,12 @@ import shutil
 from collections import OrderedDict
 from os.path import join
 
+from conans.client.cache.archive_cache import ArchiveCache
 from conans.client.cache.editable import EditablePackages
 from conans.client.cache.remote_registry import RemoteRegistry
+from conans.client.cache.bytecode_cache import BytecodeCache
+from conans.client.cache.digest_cache import DigestCache
+from conans.client.cache.remote_search_cache import RemoteSearchCache
 from conans.client.conf import ConanClientConfigParser, default_client_conf, default_settings_yml
 from conans.client.conf.detect import detect_defaults_settings
 from conans.client.output import Color
@@ -106,6 +110,24 @@ class ClientCache(object):
     def remotes_path(self):
         return join(self.cache_folder, REMOTES)
 
+    @property
+    def bytecode_cache(self):
+        if not self.config.bytecode_cache:
+            return None
+        return BytecodeCache(self.cache_folder)
+
+    @property
+    def remote_search_cache(self):
+        return RemoteSearchCache(self.cache_folder, self.config.remote_search_cache_ttl)
+
+    @property
+    def digest_cache(self):
+        return DigestCache(self.cache_folder)
+
+    @property
+    def archive_cache(self):
+        return ArchiveCache(self.cache_folder, self.config.archive_cache_size)
+
     @property
     def registry(self):
         return RemoteRegistry(self, self._output)
@@ -0,0 +1,39 @@
+import json
+import os
+
+from conans.util.files import load, rmdir, save_atomically, to_file_bytes
+from conans.util.sha import sha1
+
+DIGEST_CACHE_FOLDER = "digest_cache"
+
+
+class DigestCache(object):
+    """ md5 of the files hashed to create the manifests, stored in the client cache, so the
+    files that didn't change since the previous manifest of the same folder are not hashed
+    again. The entries are {path: [size, mtime_ns, inode, md5]}, one file per folder
+    """
+
+    def __init__(self, cache_folder):
+        self._folder = os.path.join(cache_folder, DIGEST_CACHE_FOLDER)
+
+    def _path(self, folder):
+        key = sha1(to_file_bytes(os.path.abspath(folder)))
+        return os.path.join(self._folder, "%s.json" % key)
+
+    def load(self, folder):
+        try:
+            return json.loads(load(self._path(folder)))
+        except Exception:  # Missing or corrupted, it is just a cache
+            return {}
+
+    def save(self, folder, entries):
+        """ replaces the entries of the folder, so the ones of removed files don't accumulate
+        """
+        # Other processes can be reading or writing the same file, it is atomically replaced
+        try:
+            save_atomically(self._path(folder), json.dumps(entries))
+        except (IOError, OSError):  # Not stored, they will be hashed again next time
+            pass
+
+    def clear(self):
+        rmdir(self._folder)
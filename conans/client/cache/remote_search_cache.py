@@ -0,0 +1,58 @@
+import json
+import os
+import time
+
+from conans.model.ref import ConanFileReference
+from conans.util.files import load, rmdir, save_atomically
+from conans.util.sha import sha1
+
+REMOTE_SEARCH_CACHE_FOLDER = "search_cache"
+
+
+class RemoteSearchCache(object):
+    """ Results of the recipe searches in the remotes, stored in the client cache, used to
+    resolve version ranges without searching again in the remotes, until they expire (ttl)
+    """
+
+    def __init__(self, cache_folder, ttl):
+        self._folder = os.path.join(cache_folder, REMOTE_SEARCH_CACHE_FOLDER)
+        self._ttl = ttl
+
+    def _path(self, remote, pattern):
+        key = sha1(("%s\n%s" % (remote.url, pattern)).encode())
+        return os.path.join(self._folder, "%s.json" % key)
+
+    def get(self, remote, pattern):
+        """ the list of references found in the remote for that pattern, or None if not cached
+        or expired
+        """
+        if not self._ttl:
+            return None
+        path = self._path(remote, pattern)
+        if not os.path.isfile(path):
+            return None
+        try:
+            data = json.loads(load(path))
+            if data["url"] != remote.url or data["pattern"] != pattern:
+                return None
+            if time.time() - data["timestamp"] > self._ttl:
+                return None
+            return [ConanFileReference.loads(r, validate=False) for r in data["refs"]]
+        except Exception:  # Corrupted, or concurrently written, it is just a cache
+            return None
+
+    def set(self, remote, pattern, refs):
+        if not self._ttl:
+            return
+        data = {"url": remote.url,
+                "pattern": pattern,
+                "timestamp": time.time(),
+                "refs": [repr(r) for r in refs or []]}
+        # Other processes can be reading or writing the same file, it is atomically replaced
+        try:
+            save_atomically(self._path(remote, pattern), json.dumps(data))
+        except (IOError, OSError):  # Not stored, it will be searched again next time
+            pass
+
+    def clear(self):
+        rmdir(self._folder)
@@ -53,10 +53,11 @@ def check_casing_conflict(cache, ref):
 
 
 def cmd_export(app, conanfile_path, name, version, user, channel, keep_source,
-               export=True, graph_lock=None, ignore_dirty=False):
+               export=True, graph_lock=None, ignore_dirty=False, no_digest_cache=False):
     """ Export the recipe
     param conanfile_path: the original source directory of the user containing a
                        conanfile.py
+    param no_digest_cache: hash all the exported files, even if the digest cache is enabled
     """
     loader, cache, hook_manager, output = app.loader, app.cache, app.hook_manager, app.out
     revisions_enabled = app.config.revisions_enabled
@@ -145,7 +146,11 @@ def cmd_export(app, conanfile_path, name, version, user, channel, keep_source,
                              conanfile_path=package_layout.conanfile())
 
         # Compute the new digest
-        manifest = FileTreeManifest.create(package_layout.export(), package_layout.export_sources())
+        digest_cache = None
+        if cache.config.digest_cache and not no_digest_cache:
+            digest_cache = cache.digest_cache
+        manifest = FileTreeManifest.create(package_layout.export(), package_layout.export_sources(),
+                                           digest_cache=digest_cache, origin_folder=origin_folder)
         modified_recipe |= not previous_manifest or previous_manifest != manifest
         if modified_recipe:
             output.success('A new %s version was exported' % CONANFILE)
@@ -1,20 +1,24 @@
 import os
 import stat
 import tarfile
+import threading
 import time
 from collections import defaultdict
+from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
 
 from conans.util import progress_bar
+from conans.client.archive_codecs import DEFAULT_ARCHIVE_CODEC, GzipCodec, archive_name, \
+    codec_for, get_codec
 from conans.client.remote_manager import is_package_snapshot_complete, calc_files_checksum
 from conans.client.source import complete_recipe_sources
 from conans.errors import ConanException, NotFoundException
 from conans.model.manifest import gather_files, FileTreeManifest
 from conans.model.ref import ConanFileReference, PackageReference, check_valid_ref
 from conans.paths import (CONAN_MANIFEST, CONANFILE, EXPORT_SOURCES_TGZ_NAME,
-                          EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, CONANINFO)
+                          EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, CONANINFO, archive_names)
 from conans.search.search import search_packages, search_recipes
-from conans.util.files import (load, clean_dirty, is_dirty,
-                               gzopen_without_timestamps, set_dirty_context_manager)
+from conans.util.files import load, clean_dirty, is_dirty, set_dirty_context_manager
 from conans.util.log import logger
 from conans.util.tracer import (log_recipe_upload, log_compressed_files,
                                 log_package_upload)
@@ -56,6 +60,9 @@ class CmdUpload(object):
             - Decide which files to upload and delete from server:
               "_package_files_to_upload". Can raise if policy is NOT overwrite
             - Do the actual upload
+      With general.parallel_upload, the refs of every remote are uploaded concurrently by
+      that many threads "_upload_refs_concurrently": first all the recipes, then all the
+      binaries of all the refs
 
     All the REVISIONS are local defined, not retrieved from servers
 
@@ -73,6 +80,8 @@ class CmdUpload(object):
         self._remote_manager = remote_manager
         self._loader = loader
         self._hook_manager = hook_manager
+        # The metadata file lock is between processes, not between the threads of this one
+        self._metadata_lock = threading.Lock()
 
     def upload(self, reference_or_pattern, remotes, upload_recorder, package_id=None,
                all_packages=None, confirm=False, retry=None, retry_wait=None, integrity_check=False,
@@ -81,9 +90,14 @@ class CmdUpload(object):
         refs, confirm = self._collects_refs_to_upload(package_id, reference_or_pattern, confirm)
         refs_by_remote = self._collect_packages_to_upload(refs, confirm, remotes, all_packages,
                                                           query, package_id)
+        parallel = self._cache.config.parallel_upload
         # Do the job
         for remote, refs in refs_by_remote.items():
             self._output.info("Uploading to remote '{}':".format(remote.name))
+            if parallel and len(refs) + sum(len(prefs) for _, _, prefs in refs) > 1:
+                self._upload_refs_concurrently(refs, parallel, retry, retry_wait, integrity_check,
+                                               policy, remote, upload_recorder, remotes)
+                continue
             for (ref, conanfile, prefs) in refs:
                 self._upload_ref(conanfile, ref, prefs, retry, retry_wait,
                                  integrity_check, policy, remote, upload_recorder, remotes)
@@ -207,6 +221,57 @@ class CmdUpload(object):
         self._hook_manager.execute("post_upload", conanfile_path=conanfile_path, reference=ref,
                                    remote=recipe_remote)
 
+    def _upload_refs_concurrently(self, refs, parallel, retry, retry_wait, integrity_check,
+                                  policy, remote, upload_recorder, remotes):
+        """ uploads the recipes and binaries of the refs with at most 'parallel' threads. The
+        binaries are uploaded once all the recipes have been, so a package is never uploaded
+        before its recipe. The first error is raised once the running uploads have finished, and
+        no binary is uploaded if any recipe failed
+        """
+        # Authenticate now, the user could be asked for the credentials by every thread
+        self._remote_manager.check_credentials(remote)
+
+        # Also the hooks, loading them from several threads isn't safe
+        self._hook_manager.initialize()
+        # The archives stored by a thread can't evict the ones other threads are uploading
+        archive_cache = self._cache.archive_cache
+
+        def _upload_recipe(item):
+            ref, conanfile, _ = item
+            layout = self._cache.package_layout(ref)
+            conanfile_path = layout.conanfile()
+            self._hook_manager.execute("pre_upload", conanfile_path=conanfile_path,
+                                       reference=ref, remote=remote)
+            self._output.info("Uploading %s to remote '%s'" % (str(ref), remote.name))
+            with archive_cache.in_use(_summary_hash(layout.export())):
+                self._upload_recipe(ref, conanfile, retry, retry_wait, policy, remote, remotes)
+            upload_recorder.add_recipe(ref, remote.name, remote.url)
+
+        def _upload_package(item):
+            pref, index, total = item
+            self._output.info("Uploading package %d/%d: %s of %s to '%s'"
+                              % (index + 1, total, str(pref.id), str(pref.ref), remote.name))
+            package_folder = self._cache.package_layout(pref.ref, short_paths=None).package(pref)
+            with archive_cache.in_use(_summary_hash(package_folder)):
+                self._upload_package(pref, retry, retry_wait, integrity_check, policy, remote)
+            upload_recorder.add_package(pref, remote.name, remote.url)
+
+        _run_concurrently(_upload_recipe, refs, parallel)
+        packages = [(pref, index, len(prefs))
+                    for _, _, prefs in refs for index, pref in enumerate(prefs)]
+        _run_concurrently(_upload_package, packages, parallel)
+
+        for ref, _, _ in refs:
+            conanfile_path = self._cache.package_layout(ref).conanfile()
+            self._hook_manager.execute("post_upload", conanfile_path=conanfile_path,
+                                       reference=ref, remote=remote)
+
+    @contextmanager
+    def _update_metadata(self, ref):
+        with self._metadata_lock:
+            with self._cache.package_layout(ref).update_metadata() as metadata:
+                yield metadata
+
     def _upload_recipe(self, ref, conanfile, retry, retry_wait, policy, remote, remotes):
 
         current_remote_name = self._cache.package_layout(ref).load_metadata().recipe.remote
@@ -219,10 +284,11 @@ class CmdUpload(object):
                                    reference=ref, remote=remote)
 
         t1 = time.time()
-        the_files = self._compress_recipe_files(ref)
+        the_files = self._compress_recipe_files(ref, self._archive_codec(remote))
 
-        with self._cache.package_layout(ref).update_metadata() as metadata:
-            metadata.recipe.checksums = calc_files_checksum(the_files)
+        checksums = calc_files_checksum(the_files)
+        with self._update_metadata(ref) as metadata:
+            metadata.recipe.checksums = checksums
 
         local_manifest = FileTreeManifest.loads(load(the_files["conanmanifest.txt"]))
 
@@ -247,7 +313,7 @@ class CmdUpload(object):
 
         if files_to_upload or deleted:
             self._remote_manager.upload_recipe(ref, files_to_upload, deleted,
-                                               remote, retry, retry_wait)
+                                               remote, retry, retry_wait, checksums)
             self._upload_recipe_end_msg(ref, remote)
         else:
             self._output.info("Recipe is up to date, upload skipped")
@@ -258,7 +324,7 @@ class CmdUpload(object):
 
         # The recipe wasn't in the registry or it has changed the revision field only
         if not current_remote_name:
-            with self._cache.package_layout(ref).update_metadata() as metadata:
+            with self._update_metadata(ref) as metadata:
                 metadata.recipe.remote = remote.name
 
         return ref
@@ -276,10 +342,12 @@ class CmdUpload(object):
                                    remote=p_remote)
 
         t1 = time.time()
-        the_files = self._compress_package_files(pref, integrity_check)
+        the_files = self._compress_package_files(pref, integrity_check,
+                                                 self._archive_codec(p_remote))
 
-        with self._cache.package_layout(pref.ref).update_metadata() as metadata:
-            metadata.packages[pref.id].checksums = calc_files_checksum(the_files)
+        checksums = calc_files_checksum(the_files)
+        with self._update_metadata(pref.ref) as metadata:
+            metadata.packages[pref.id].checksums = checksums
 
         if policy == UPLOAD_POLICY_SKIP:
             return None
@@ -287,7 +355,7 @@ class CmdUpload(object):
 
         if files_to_upload or deleted:
             self._remote_manager.upload_package(pref, files_to_upload, deleted, p_remote, retry,
-                                                retry_wait)
+                                                retry_wait, checksums)
             logger.debug("UPLOAD: Time upload package: %f" % (time.time() - t1))
         else:
             self._output.info("Package is up to date, upload skipped")
@@ -299,18 +367,39 @@ class CmdUpload(object):
 
         logger.debug("UPLOAD: Time uploader upload_package: %f" % (time.time() - t1))
 
-        metadata = self._cache.package_layout(pref.ref).load_metadata()
-        cur_package_remote = metadata.packages[pref.id].remote
-        if not cur_package_remote and policy != UPLOAD_POLICY_SKIP:
-            with self._cache.package_layout(pref.ref).update_metadata() as metadata:
-                metadata.packages[pref.id].remote = p_remote.name
+        if policy != UPLOAD_POLICY_SKIP:
+            with self._update_metadata(pref.ref) as metadata:
+                if not metadata.packages[pref.id].remote:
+                    metadata.packages[pref.id].remote = p_remote.name
 
         return pref
 
-    def _compress_recipe_files(self, ref):
+    def _archive_codec(self, remote):
+        """ the codec of the archives uploaded to the remote. general.archive_codec can be a
+        codec for all the remotes, or per remote, like 'remote1=xz, remote2=gzip'. If the remote
+        doesn't declare the capability of the codec, gzip is used
+        """
+        codec_name = DEFAULT_ARCHIVE_CODEC
+        for item in (self._cache.config.archive_codec or "").split(","):
+            if "=" in item:
+                remote_name, name = [v.strip() for v in item.split("=", 1)]
+                if remote_name == remote.name:
+                    codec_name = name
+                    break
+            elif item.strip():
+                codec_name = item.strip()
+        codec = get_codec(codec_name)
+        if codec.capability and not self._remote_manager.server_capable(remote,
+                                                                        codec.capability):
+            self._output.warn("Remote '%s' doesn't support '%s' archives, using '%s'"
+                              % (remote.name, codec.name, DEFAULT_ARCHIVE_CODEC))
+            codec = get_codec(DEFAULT_ARCHIVE_CODEC)
+        return codec
+
+    def _compress_recipe_files(self, ref, codec):
         export_folder = self._cache.package_layout(ref).export()
 
-        for f in (EXPORT_TGZ_NAME, EXPORT_SOURCES_TGZ_NAME):
+        for f in archive_names(EXPORT_TGZ_NAME) + archive_names(EXPORT_SOURCES_TGZ_NAME):
             tgz_path = os.path.join(export_folder, f)
             if is_dirty(tgz_path):
                 self._output.warn("%s: Removing %s, marked as dirty" % (str(ref), f))
@@ -322,12 +411,14 @@ class CmdUpload(object):
             raise ConanException("Cannot upload corrupted recipe '%s'" % str(ref))
         export_src_folder = self._cache.package_layout(ref).export_sources()
         src_files, src_symlinks = gather_files(export_src_folder)
+        summary_hash = FileTreeManifest.loads(load(files[CONAN_MANIFEST])).summary_hash
         the_files = _compress_recipe_files(files, symlinks, src_files, src_symlinks, export_folder,
-                                           self._output)
+                                           self._output, codec, self._cache.archive_cache,
+                                           summary_hash)
 
         return the_files
 
-    def _compress_package_files(self, pref, integrity_check):
+    def _compress_package_files(self, pref, integrity_check, codec):
 
         t1 = time.time()
         # existing package, will use short paths if defined
@@ -337,12 +428,12 @@ class CmdUpload(object):
             raise ConanException("Package %s is corrupted, aborting upload.\n"
                                  "Remove it with 'conan remove %s -p=%s'"
                                  % (pref, pref.ref, pref.id))
-        tgz_path = os.path.join(package_folder, PACKAGE_TGZ_NAME)
-        if is_dirty(tgz_path):
-            self._output.warn("%s: Removing %s, marked as dirty"
-                                   % (str(pref), PACKAGE_TGZ_NAME))
-            os.remove(tgz_path)
-            clean_dirty(tgz_path)
+        for f in archive_names(PACKAGE_TGZ_NAME):
+            tgz_path = os.path.join(package_folder, f)
+            if is_dirty(tgz_path):
+                self._output.warn("%s: Removing %s, marked as dirty" % (str(pref), f))
+                os.remove(tgz_path)
+                clean_dirty(tgz_path)
         # Get all the files in that directory
         files, symlinks = gather_files(package_folder)
 
@@ -356,7 +447,9 @@ class CmdUpload(object):
             logger.debug("UPLOAD: Time remote_manager check package integrity : %f"
                          % (time.time() - t1))
 
-        the_files = _compress_package_files(files, symlinks, package_folder, self._output)
+        summary_hash = FileTreeManifest.loads(load(files[CONAN_MANIFEST])).summary_hash
+        the_files = _compress_package_files(files, symlinks, package_folder, self._output, codec,
+                                            self._cache.archive_cache, summary_hash)
         return the_files
 
     def _recipe_files_to_upload(self, ref, policy, the_files, remote, remote_manifest,
@@ -429,12 +522,12 @@ class CmdUpload(object):
                 self._output.warn("Mismatched checksum '%s' (manifest: %s, file: %s)"
                                        % (fname, h1, h2))
 
-            if PACKAGE_TGZ_NAME in files:
-                try:
-                    tgz_path = os.path.join(package_folder, PACKAGE_TGZ_NAME)
-                    os.unlink(tgz_path)
-                except Exception:
-                    pass
+            for f in archive_names(PACKAGE_TGZ_NAME):
+                if f in files:
+                    try:
+                        os.unlink(os.path.join(package_folder, f))
+                    except Exception:
+                        pass
             error_msg = os.linesep.join("Mismatched checksum '%s' (manifest: %s, file: %s)"
                                         % (fname, h1, h2) for fname, (h1, h2) in diff.items())
             logger.error("Manifests doesn't match!\n%s" % error_msg)
@@ -479,39 +572,104 @@ class CmdUpload(object):
             self._output.info("Error printing information about the diff: %s" % str(e))
 
 
-def _compress_recipe_files(files, symlinks, src_files, src_symlinks, dest_folder, output):
+def _run_concurrently(upload, items, parallel):
+    """ calls upload(item) for every item with at most 'parallel' threads, raising the first
+    error once all of them have finished
+    """
+    if not items:
+        return
+
+    def _upload(item):
+        try:
+            upload(item)
+        except BaseException as exc:
+            return exc
+
+    thread_pool = ThreadPool(min(parallel, len(items)))
+    try:
+        errors = [error for error in thread_pool.map(_upload, items) if error is not None]
+    finally:
+        thread_pool.close()
+        thread_pool.join()
+    if errors:
+        raise errors[0]
+
+
+def _summary_hash(folder):
+    """ the summary hash of the manifest of the folder, the key of its archives in the archive
+    cache, or None if there is no manifest (the upload will fail)
+    """
+    try:
+        return FileTreeManifest.load(folder).summary_hash
+    except (IOError, OSError):
+        return None
+
+
+def _pop_archive(tgz_name, files, codec):
+    """ removes the archives of all the codecs from the files, returning the path of the one of
+    the given codec, if already created
+    """
+    paths = {f: files.pop(f, None) for f in archive_names(tgz_name)}
+    return paths[archive_name(tgz_name, codec)]
+
+
+def _cached_archive(tgz_name, tgz_path, archive_cache, summary_hash):
+    """ the archive of the recipe or package with that manifest summary_hash, if it was already
+    created in the folder or stored in the archive cache
+    """
+    if tgz_path or archive_cache is None:
+        return tgz_path
+    return archive_cache.get(summary_hash, tgz_name)
+
+
+def _cache_archive(tgz_name, tgz_path, archive_cache, summary_hash):
+    """ moves a just created archive to the archive cache, if enabled, returning its path
+    """
+    if archive_cache is None:
+        return tgz_path
+    return archive_cache.store(summary_hash, tgz_name, tgz_path) or tgz_path
+
+
+def _compress_recipe_files(files, symlinks, src_files, src_symlinks, dest_folder, output,
+                           codec=GzipCodec, archive_cache=None, summary_hash=None):
     # This is the minimum recipe
     result = {CONANFILE: files.pop(CONANFILE),
               CONAN_MANIFEST: files.pop(CONAN_MANIFEST)}
 
-    export_tgz_path = files.pop(EXPORT_TGZ_NAME, None)
-    sources_tgz_path = files.pop(EXPORT_SOURCES_TGZ_NAME, None)
+    export_tgz_path = _pop_archive(EXPORT_TGZ_NAME, files, codec)
+    sources_tgz_path = _pop_archive(EXPORT_SOURCES_TGZ_NAME, files, codec)
 
     def add_tgz(tgz_name, tgz_path, tgz_files, tgz_symlinks, msg):
+        tgz_path = _cached_archive(tgz_name, tgz_path, archive_cache, summary_hash)
         if tgz_path:
             result[tgz_name] = tgz_path
         elif tgz_files:
             if output and not output.is_terminal:
                 output.writeln(msg)
             tgz_path = compress_files(tgz_files, tgz_symlinks, tgz_name, dest_folder, output)
-            result[tgz_name] = tgz_path
+            result[tgz_name] = _cache_archive(tgz_name, tgz_path, archive_cache, summary_hash)
 
-    add_tgz(EXPORT_TGZ_NAME, export_tgz_path, files, symlinks, "Compressing recipe...")
-    add_tgz(EXPORT_SOURCES_TGZ_NAME, sources_tgz_path, src_files, src_symlinks,
-            "Compressing recipe sources...")
+    add_tgz(archive_name(EXPORT_TGZ_NAME, codec), export_tgz_path, files, symlinks,
+            "Compressing recipe...")
+    add_tgz(archive_name(EXPORT_SOURCES_TGZ_NAME, codec), sources_tgz_path, src_files,
+            src_symlinks, "Compressing recipe sources...")
 
     return result
 
 
-def _compress_package_files(files, symlinks, dest_folder, output):
-    tgz_path = files.get(PACKAGE_TGZ_NAME)
+def _compress_package_files(files, symlinks, dest_folder, output, codec=GzipCodec,
+                            archive_cache=None, summary_hash=None):
+    tgz_name = archive_name(PACKAGE_TGZ_NAME, codec)
+    tgz_path = _pop_archive(PACKAGE_TGZ_NAME, files, codec)
+    tgz_path = _cached_archive(tgz_name, tgz_path, archive_cache, summary_hash)
     if not tgz_path:
         if output and not output.is_terminal:
             output.writeln("Compressing package...")
         tgz_files = {f: path for f, path in files.items() if f not in [CONANINFO, CONAN_MANIFEST]}
-        tgz_path = compress_files(tgz_files, symlinks, PACKAGE_TGZ_NAME, dest_folder, output)
+        tgz_path = compress_files(tgz_files, symlinks, tgz_name, dest_folder, output)
+        tgz_path = _cache_archive(tgz_name, tgz_path, archive_cache, summary_hash)
 
-    return {PACKAGE_TGZ_NAME: tgz_path,
+    return {tgz_name: tgz_path,
             CONANINFO: files[CONANINFO],
             CONAN_MANIFEST: files[CONAN_MANIFEST]}
 
@@ -521,7 +679,7 @@ def compress_files(files, symlinks, name, dest_dir, output=None):
     # FIXME, better write to disk sequentially and not keep tgz contents in memory
     tgz_path = os.path.join(dest_dir, name)
     with set_dirty_context_manager(tgz_path), open(tgz_path, "wb") as tgz_handle:
-        tgz = gzopen_without_timestamps(name, mode="w", fileobj=tgz_handle)
+        tgz = codec_for(name).open(name, fileobj=tgz_handle)
 
         for filename, dest in sorted(symlinks.items()):
             info = tarfile.TarInfo(name=filename)
@@ -325,6 +325,9 @@ class Command(object):
         parser.add_argument("--ignore-dirty", default=False, action='store_true',
                             help='When using the "scm" feature with "auto" values, capture the'
                                  ' revision and url even if there are uncommitted changes')
+        parser.add_argument("--no-digest-cache", default=False, action='store_true',
+                            help='Compute the md5 of all the exported files, even if the '
+                                 '"general.digest_cache" is enabled')
 
         _add_manifests_arguments(parser)
         _add_common_install_arguments(parser, build_help=_help_build_policies)
@@ -355,7 +358,8 @@ class Command(object):
                                       args.manifests, args.manifests_interactive,
                                       args.remote, args.update,
                                       test_build_folder=args.test_build_folder,
-                                      lockfile=args.lockfile, ignore_dirty=args.ignore_dirty)
+                                      lockfile=args.lockfile, ignore_dirty=args.ignore_dirty,
+                                      no_digest_cache=args.no_digest_cache)
         except ConanException as exc:
             info = exc.info
             raise
@@ -977,6 +981,9 @@ class Command(object):
         parser.add_argument("--ignore-dirty", default=False, action='store_true',
                             help='When using the "scm" feature with "auto" values, capture the'
                                  ' revision and url even if there are uncommitted changes')
+        parser.add_argument("--no-digest-cache", default=False, action='store_true',
+                            help='Compute the md5 of all the exported files, even if the '
+                                 '"general.digest_cache" is enabled')
 
         args = parser.parse_args(*args)
         self._warn_python_version()
@@ -991,7 +998,8 @@ class Command(object):
         return self._conan.export(path=args.path,
                                   name=name, version=version, user=user, channel=channel,
                                   keep_source=args.keep_source, lockfile=args.lockfile,
-                                  ignore_dirty=args.ignore_dirty)
+                                  ignore_dirty=args.ignore_dirty,
+                                  no_digest_cache=args.no_digest_cache)
 
     def remove(self, *args):
         """
@@ -1025,6 +1033,9 @@ class Command(object):
                             help='Remove source folders')
         parser.add_argument('-t', '--system-reqs', default=False, action="store_true",
                             help='Remove system_reqs folders')
+        parser.add_argument("--search-cache", default=False, action="store_true",
+                            help="Remove the cached results of the remote searches used to "
+                                 "resolve version ranges")
         args = parser.parse_args(*args)
 
         self._warn_python_version()
@@ -1044,6 +1055,13 @@ class Command(object):
             self._conan.remove_locks()
             self._out.info("Cache locks removed")
             return
+        elif args.search_cache:
+            if args.pattern_or_reference:
+                raise ConanException("Specifying a pattern is not supported when removing the "
+                                     "search cache")
+            self._conan.remove_search_cache()
+            self._out.info("Remote search cache removed")
+            return
         elif args.system_reqs:
             if args.packages:
                 raise ConanException("'-t' and '-p' parameters can't be used at the same time")
@@ -169,7 +169,8 @@ class ConanApp(object):
         artifacts_properties = self.cache.read_artifacts_properties()
         rest_client_factory = RestApiClientFactory(self.out, self.requester,
                                                    revisions_enabled=self.config.revisions_enabled,
-                                                   artifacts_properties=artifacts_properties)
+                                                   artifacts_properties=artifacts_properties,
+                                                   parallel_transfers=self.config.parallel_download)
         # To store user and token
         localdb = LocalDB.create(self.cache.localdb)
         # Wraps RestApiClient to add authentication support (same interface)
@@ -187,8 +188,10 @@ class ConanApp(object):
 
         self.proxy = ConanProxy(self.cache, self.out, self.remote_manager)
         self.range_resolver = RangeResolver(self.cache, self.remote_manager)
-        self.python_requires = ConanPythonRequire(self.proxy, self.range_resolver)
-        self.loader = ConanFileLoader(self.runner, self.out, self.python_requires)
+        self.python_requires = ConanPythonRequire(self.proxy, self.range_resolver,
+                                                  self.cache.bytecode_cache)
+        self.loader = ConanFileLoader(self.runner, self.out, self.python_requires,
+                                      self.cache.bytecode_cache)
 
         self.binaries_analyzer = GraphBinariesAnalyzer(self.cache, self.out, self.remote_manager)
         self.graph_manager = GraphManager(self.out, self.cache, self.remote_manager, self.loader,
@@ -313,7 +316,7 @@ class ConanAPIV1(object):
                keep_source=False, keep_build=False, verify=None,
                manifests=None, manifests_interactive=None,
                remote_name=None, update=False, cwd=None, test_build_folder=None,
-               lockfile=None, ignore_dirty=False):
+               lockfile=None, ignore_dirty=False, no_digest_cache=False):
         """
         API method to create a conan package
 
@@ -339,7 +342,7 @@ class ConanAPIV1(object):
             keep_source = keep_source or keep_build
             new_ref = cmd_export(self.app, conanfile_path, name, version, user, channel, keep_source,
                                  not not_export, graph_lock=graph_info.graph_lock,
-                                 ignore_dirty=ignore_dirty)
+                                 ignore_dirty=ignore_dirty, no_digest_cache=no_digest_cache)
 
             # The new_ref contains the revision
             # To not break existing things, that they used this ref without revision
@@ -739,7 +742,7 @@ class ConanAPIV1(object):
 
     @api_method
     def export(self, path, name, version, user, channel, keep_source=False, cwd=None,
-               lockfile=None, ignore_dirty=False):
+               lockfile=None, ignore_dirty=False, no_digest_cache=False):
         conanfile_path = _get_conanfile_path(path, cwd, py=True)
         graph_lock = None
         if lockfile:
@@ -750,7 +753,8 @@ class ConanAPIV1(object):
 
         self.app.load_remotes()
         cmd_export(self.app, conanfile_path, name, version, user, channel, keep_source,
-                   graph_lock=graph_lock, ignore_dirty=ignore_dirty)
+                   graph_lock=graph_lock, ignore_dirty=ignore_dirty,
+                   no_digest_cache=no_digest_cache)
 
         if lockfile:
             graph_lock_file.save(lockfile)
@@ -993,6 +997,10 @@ class ConanAPIV1(object):
     def remove_locks(self):
         self.app.cache.remove_locks()
 
+    @api_method
+    def remove_search_cache(self):
+        self.app.cache.remote_search_cache.clear()
+
     @api_method
     def profile_list(self):
         return cmd_profile_list(self.app.cache.profiles_path, self.app.out)
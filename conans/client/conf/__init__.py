@@ -119,6 +119,15 @@ request_timeout = 60                  # environment CONAN_REQUEST_TIMEOUT (secon
 default_package_id_mode = semver_direct_mode # environment CONAN_DEFAULT_PACKAGE_ID_MODE
 # retry = 2                             # environment CONAN_RETRY
 # retry_wait = 5                        # environment CONAN_RETRY_WAIT (seconds)
+# parallel_download = 8               # environment CONAN_PARALLEL_DOWNLOAD (also the files of a recipe or package)
+# parallel_upload = 8                 # environment CONAN_PARALLEL_UPLOAD (recipes, then their packages)
+# share_build_requires = False        # environment CONAN_SHARE_BUILD_REQUIRES (identical build-requires subgraphs expanded once)
+# remote_search_cache_ttl = 3600      # environment CONAN_REMOTE_SEARCH_CACHE_TTL (seconds)
+# streaming_package_extraction = False  # environment CONAN_STREAMING_PACKAGE_EXTRACTION
+# archive_codec = gzip                # environment CONAN_ARCHIVE_CODEC (gzip/xz, xz only to remotes supporting it)
+# digest_cache = False                # environment CONAN_DIGEST_CACHE (md5 of unchanged exported files are not computed again)
+# bytecode_cache = False              # environment CONAN_BYTECODE_CACHE (unchanged conanfiles are not compiled again)
+# archive_cache_size = 4096           # environment CONAN_ARCHIVE_CACHE_SIZE (MB, to reuse the archives of uploads and downloads)
 # sysrequires_mode = enabled          # environment CONAN_SYSREQUIRES_MODE (allowed modes enabled/verify/disabled)
 # vs_installation_preference = Enterprise, Professional, Community, BuildTools # environment CONAN_VS_INSTALLATION_PREFERENCE
 # verbose_traceback = False           # environment CONAN_VERBOSE_TRACEBACK
@@ -205,6 +214,9 @@ class ConanClientConfigParser(ConfigParser, object):
                "CONAN_TRACE_FILE": self._env_c("log.trace_file", "CONAN_TRACE_FILE", None),
                "CONAN_PRINT_RUN_COMMANDS": self._env_c("log.print_run_commands", "CONAN_PRINT_RUN_COMMANDS", "False"),
                "CONAN_COMPRESSION_LEVEL": self._env_c("general.compression_level", "CONAN_COMPRESSION_LEVEL", "9"),
+               "CONAN_ARCHIVE_CODEC": self._env_c("general.archive_codec", "CONAN_ARCHIVE_CODEC", None),
+               "CONAN_DIGEST_CACHE": self._env_c("general.digest_cache", "CONAN_DIGEST_CACHE", None),
+               "CONAN_ARCHIVE_CACHE_SIZE": self._env_c("general.archive_cache_size", "CONAN_ARCHIVE_CACHE_SIZE", None),
                "CONAN_NON_INTERACTIVE": self._env_c("general.non_interactive", "CONAN_NON_INTERACTIVE", "False"),
                "CONAN_SKIP_BROKEN_SYMLINKS_CHECK": self._env_c("general.skip_broken_symlinks_check", "CONAN_SKIP_BROKEN_SYMLINKS_CHECK", "False"),
                "CONAN_PYLINTRC": self._env_c("general.pylintrc", "CONAN_PYLINTRC", None),
@@ -215,6 +227,12 @@ class ConanClientConfigParser(ConfigParser, object):
                "CONAN_REQUEST_TIMEOUT": self._env_c("general.request_timeout", "CONAN_REQUEST_TIMEOUT", None),
                "CONAN_RETRY": self._env_c("general.retry", "CONAN_RETRY", None),
                "CONAN_RETRY_WAIT": self._env_c("general.retry_wait", "CONAN_RETRY_WAIT", None),
+               "CONAN_PARALLEL_DOWNLOAD": self._env_c("general.parallel_download", "CONAN_PARALLEL_DOWNLOAD", None),
+               "CONAN_PARALLEL_UPLOAD": self._env_c("general.parallel_upload", "CONAN_PARALLEL_UPLOAD", None),
+               "CONAN_SHARE_BUILD_REQUIRES": self._env_c("general.share_build_requires", "CONAN_SHARE_BUILD_REQUIRES", None),
+               "CONAN_BYTECODE_CACHE": self._env_c("general.bytecode_cache", "CONAN_BYTECODE_CACHE", None),
+               "CONAN_REMOTE_SEARCH_CACHE_TTL": self._env_c("general.remote_search_cache_ttl", "CONAN_REMOTE_SEARCH_CACHE_TTL", None),
+               "CONAN_STREAMING_PACKAGE_EXTRACTION": self._env_c("general.streaming_package_extraction", "CONAN_STREAMING_PACKAGE_EXTRACTION", None),
                "CONAN_VS_INSTALLATION_PREFERENCE": self._env_c("general.vs_installation_preference", "CONAN_VS_INSTALLATION_PREFERENCE", None),
                "CONAN_RECIPE_LINTER": self._env_c("general.recipe_linter", "CONAN_RECIPE_LINTER", "True"),
                "CONAN_CPU_COUNT": self._env_c("general.cpu_count", "CONAN_CPU_COUNT", None),
@@ -576,6 +594,112 @@ class ConanClientConfigParser(ConfigParser, object):
         except ValueError:
             raise ConanException("Specify a numeric parameter for 'retry_wait'")
 
+    @property
+    def parallel_download(self):
+        parallel_download = os.getenv("CONAN_PARALLEL_DOWNLOAD")
+        if not parallel_download:
+            try:
+                parallel_download = self.get_item("general.parallel_download")
+            except ConanException:
+                return None
+
+        try:
+            return int(parallel_download) if parallel_download is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'parallel_download'")
+
+    @property
+    def parallel_upload(self):
+        parallel_upload = os.getenv("CONAN_PARALLEL_UPLOAD")
+        if not parallel_upload:
+            try:
+                parallel_upload = self.get_item("general.parallel_upload")
+            except ConanException:
+                return None
+
+        try:
+            return int(parallel_upload) if parallel_upload is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'parallel_upload'")
+
+    @property
+    def remote_search_cache_ttl(self):
+        ttl = os.getenv("CONAN_REMOTE_SEARCH_CACHE_TTL")
+        if not ttl:
+            try:
+                ttl = self.get_item("general.remote_search_cache_ttl")
+            except ConanException:
+                return None
+
+        try:
+            return int(ttl) if ttl is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'remote_search_cache_ttl'")
+
+    @property
+    def digest_cache(self):
+        try:
+            digest_cache = get_env("CONAN_DIGEST_CACHE")
+            if digest_cache is None:
+                digest_cache = self.get_item("general.digest_cache")
+            return str(digest_cache).lower() in ("1", "true")
+        except ConanException:
+            return False
+
+    @property
+    def archive_cache_size(self):
+        size = os.getenv("CONAN_ARCHIVE_CACHE_SIZE")
+        if not size:
+            try:
+                size = self.get_item("general.archive_cache_size")
+            except ConanException:
+                return None
+
+        try:
+            return int(size) if size is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'archive_cache_size'")
+
+    @property
+    def share_build_requires(self):
+        try:
+            share_build_requires = get_env("CONAN_SHARE_BUILD_REQUIRES")
+            if share_build_requires is None:
+                share_build_requires = self.get_item("general.share_build_requires")
+            return str(share_build_requires).lower() in ("1", "true")
+        except ConanException:
+            return False
+
+    @property
+    def bytecode_cache(self):
+        try:
+            bytecode_cache = get_env("CONAN_BYTECODE_CACHE")
+            if bytecode_cache is None:
+                bytecode_cache = self.get_item("general.bytecode_cache")
+            return str(bytecode_cache).lower() in ("1", "true")
+        except ConanException:
+            return False
+
+    @property
+    def streaming_package_extraction(self):
+        try:
+            streaming = get_env("CONAN_STREAMING_PACKAGE_EXTRACTION")
+            if streaming is None:
+                streaming = self.get_item("general.streaming_package_extraction")
+            return streaming.lower() in ("1", "true")
+        except ConanException:
+            return False
+
+    @property
+    def archive_codec(self):
+        try:
+            archive_codec = get_env("CONAN_ARCHIVE_CODEC")
+            if archive_codec is None:
+                archive_codec = self.get_item("general.archive_codec")
+        except ConanException:
+            return None
+        return archive_codec
+
     @property
     def generate_run_log_file(self):
         try:
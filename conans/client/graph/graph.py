@@ -1,4 +1,4 @@
-import uuid
+from collections import OrderedDict
 
 from conans.model.ref import PackageReference
 
@@ -25,6 +25,14 @@ BINARY_UNKNOWN = "Unknown"
 
 
 class Node(object):
+    # Graphs can have thousands of nodes, slots reduce their memory and attribute access time
+    __slots__ = ("ref", "path", "_package_id", "prev", "conanfile", "dependencies", "dependants",
+                 "binary", "recipe", "remote", "binary_remote", "revision_pinned", "public_deps",
+                 "public_closure", "transitive_closure", "inverse_closure",
+                 "_public_closure_bits", "_transitive_closure_bits", "closure_bit", "ancestors",
+                 "id", "graph_lock_node",
+                 "binary_non_skip", "update_manifest")
+
     def __init__(self, ref, conanfile, recipe=None, path=None):
         self.ref = ref
         self.path = path  # path to the consumer conanfile.xx for consumer, None otherwise
@@ -48,19 +56,16 @@ class Node(object):
         # on this node. It includes regular (not private and not build requires) dependencies
         self.transitive_closure = None  # {ref.name: Node}
         self.inverse_closure = set()  # set of nodes that have this one in their public
+        # Bitset index of the nodes connected in the public_closure, to skip them fast
+        self._public_closure_bits = 0
+        self._transitive_closure_bits = 0  # Bitset index of the transitive_closure
+        self.closure_bit = 0  # Unique bit of this node in its DepsGraph bitsets
         self.ancestors = None  # set{ref.name}
-        self._id = None  # Unique ID (uuid at the moment) of a node in the graph
+        # Unique ID of a node in the graph, a sequential number as string, assigned when added
+        self.id = None
         self.graph_lock_node = None  # the locking information can be None
-
-    @property
-    def id(self):
-        if self._id is None:
-            self._id = str(uuid.uuid1())
-        return self._id
-
-    @id.setter
-    def id(self, id_):
-        self._id = id_
+        self.binary_non_skip = None  # The binary before being marked as BINARY_SKIP
+        self.update_manifest = None  # The remote manifest of a BINARY_UPDATE
 
     @property
     def package_id(self):
@@ -103,26 +108,75 @@ class Node(object):
     def private_neighbors(self):
         return [edge.dst for edge in self.dependencies if edge.private]
 
+    def init_closures(self):
+        """ the public and transitive closures of a node just added to the graph contain just
+        the node itself
+        """
+        name = self.name
+        self.public_closure = OrderedDict([(name, self)])
+        self.transitive_closure = OrderedDict([(name, self)])
+        self._public_closure_bits = self.closure_bit
+        self._transitive_closure_bits = self.closure_bit
+
+    def add_transitive(self, other_node):
+        name = other_node.name
+        previous = self.transitive_closure.get(name)
+        if previous is not None:
+            self._transitive_closure_bits &= ~previous.closure_bit
+        self.transitive_closure[name] = other_node
+        self._transitive_closure_bits |= other_node.closure_bit
+
+    def update_transitive_closure(self, other_node):
+        """ adds the transitive_closure of 'other_node' to this one. Returns False, without
+        iterating it, if all its nodes were already in this transitive_closure
+        """
+        missing = other_node._transitive_closure_bits & ~self._transitive_closure_bits
+        if not missing:
+            return False
+        size = len(self.transitive_closure)
+        self.transitive_closure.update(other_node.transitive_closure)
+        self._transitive_closure_bits |= missing
+        if len(self.transitive_closure) - size != bin(missing).count("1"):
+            # Some nodes replaced others with the same name, their bits are not valid anymore
+            self._transitive_closure_bits = 0
+            for node in self.transitive_closure.values():
+                self._transitive_closure_bits |= node.closure_bit
+        return True
+
     def connect_closure(self, other_node):
         # When 2 nodes of the graph become connected, their closures information has
         # has to remain consistent. This method manages this.
         name = other_node.name
+        previous = self.public_closure.get(name)
+        if previous is not None:
+            self._public_closure_bits &= ~previous.closure_bit
         self.public_closure[name] = other_node
         self.public_deps[name] = other_node
         other_node.inverse_closure.add(self)
+        self._public_closure_bits |= other_node.closure_bit
+
+    def connect_transitive_closure(self, other_node):
+        """ connect_closure() for all the nodes of the transitive_closure of 'other_node', only
+        for those not already connected. The bitsets allow to skip the already connected ones
+        without iterating them, so closing diamonds in wide graphs is not quadratic
+        """
+        missing = other_node._transitive_closure_bits & ~self._public_closure_bits
+        if missing:
+            for node in other_node.transitive_closure.values():
+                if missing & node.closure_bit:
+                    self.connect_closure(node)
 
     def inverse_neighbors(self):
         return [edge.src for edge in self.dependants]
 
+    # Nodes are unique in the graph, identity is faster than hashing (ref, conanfile)
     def __eq__(self, other):
-        return (self.ref == other.ref and
-                self.conanfile == other.conanfile)
+        return self is other
 
     def __ne__(self, other):
-        return not self.__eq__(other)
+        return self is not other
 
-    def __hash__(self):
-        return hash((self.ref, self.conanfile))
+    __hash__ = object.__hash__
 
     def __repr__(self):
         return repr(self.conanfile)
@@ -168,6 +222,8 @@ class Node(object):
 
 
 class Edge(object):
+    __slots__ = ("src", "dst", "require")
+
     def __init__(self, src, dst, require):
         self.src = src
         self.dst = dst
@@ -182,7 +238,7 @@ class Edge(object):
         return self.require.build_require
 
     def __eq__(self, other):
-        return self.src == self.src and self.dst == other.dst
+        return self.src is other.src and self.dst is other.dst
 
     def __ne__(self, other):
         return not self.__eq__(other)
@@ -192,21 +248,32 @@ class Edge(object):
 
 
 class DepsGraph(object):
-    def __init__(self):
+    def __init__(self, initial_node_id=0):
         self.nodes = set()
         self.root = None
         self.aliased = {}
+        self._nodes_count = 0
+        self._node_counter = initial_node_id
+        # {(direct, nodes_subset): levels} computed levels, reset when the graph is modified
+        self._levels = {}
 
     def add_node(self, node):
         if not self.nodes:
             self.root = node
         self.nodes.add(node)
+        if node.id is None:
+            node.id = str(self._node_counter)
+            self._node_counter += 1
+        node.closure_bit = 1 << self._nodes_count
+        self._nodes_count += 1
+        self._levels.clear()
 
     def add_edge(self, src, dst, require):
         assert src in self.nodes and dst in self.nodes
         edge = Edge(src, dst, require)
         src.add_edge(edge)
         dst.add_edge(edge)
+        self._levels.clear()
 
     def ordered_iterate(self, nodes_subset=None):
         ordered = self.by_levels(nodes_subset)
@@ -314,20 +381,47 @@ class DepsGraph(object):
         dependencies. Second level will be with nodes that only have dependencies to
         first level nodes, and so on
         return [[node1, node34], [node3], [node23, node8],...]
+        The levels are computed only once, until the graph is modified, and a copy is returned
         """
-        result = []
-        opened = nodes_subset if nodes_subset is not None else self.nodes
-        while opened:
-            current_level = []
-            for o in opened:
-                o_neighs = o.neighbors() if direct else o.inverse_neighbors()
-                if not any(n in opened for n in o_neighs):
-                    current_level.append(o)
+        nodes_subset = frozenset(nodes_subset) if nodes_subset is not None else None
+        key = direct, nodes_subset
+        levels = self._levels.get(key)
+        if levels is None:
+            nodes = nodes_subset if nodes_subset is not None else self.nodes
+            levels = self._levels[key] = self._compute_levels(direct, nodes)
+        return [list(level) for level in levels]
+
+    @staticmethod
+    def _compute_levels(direct, nodes):
+        """ Kahn's topological sort, computing all the levels in O(nodes + edges)
+        """
+        pending = {}  # {node: number of neighbors (in nodes) not in a level yet}
+        waiting = {}  # {node: [nodes that have it as a neighbor]}
+        current_level = []
+        for node in nodes:
+            neighbors = node.neighbors() if direct else node.inverse_neighbors()
+            count = 0
+            for neighbor in neighbors:
+                if neighbor in nodes:
+                    waiting.setdefault(neighbor, []).append(node)
+                    count += 1
+            if count:
+                pending[node] = count
+            else:
+                current_level.append(node)
 
+        result = []
+        while current_level:
             current_level.sort()
             result.append(current_level)
             # now initialize new level
-            opened = opened.difference(current_level)
+            new_level = []
+            for node in current_level:
+                for waiting_node in waiting.get(node, []):
+                    pending[waiting_node] -= 1
+                    if not pending[waiting_node]:
+                        new_level.append(waiting_node)
+            current_level = new_level
 
         return result
 
@@ -1,4 +1,5 @@
 import os
+from multiprocessing.pool import ThreadPool
 
 from conans.client.graph.build_mode import BuildMode
 from conans.client.graph.graph import (BINARY_BUILD, BINARY_CACHE, BINARY_DOWNLOAD, BINARY_MISSING,
@@ -20,6 +21,8 @@ class GraphBinariesAnalyzer(object):
         self._remote_manager = remote_manager
         # These are the nodes with pref (not including PREV) that have been evaluated
         self._evaluated = {}  # {pref: [nodes]}
+        # Results of the concurrent checks of the binaries in the remotes, not yet used
+        self._prefetched = {}  # {(pref, remote_name): (remote_info, pref) or exception}
 
     @staticmethod
     def _check_update(upstream_manifest, package_folder, output, node):
@@ -96,11 +99,19 @@ class GraphBinariesAnalyzer(object):
             node.prev = metadata.packages[pref.id].revision
             assert node.prev, "PREV for %s is None: %s" % (str(pref), metadata.dumps())
 
+    def _get_package_info(self, pref, remote):
+        result = self._prefetched.pop((pref, remote.name), None)
+        if result is None:
+            return self._remote_manager.get_package_info(pref, remote)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
     def _evaluate_remote_pkg(self, node, pref, remote, remotes, build_mode):
         remote_info = None
         if remote:
             try:
-                remote_info, pref = self._remote_manager.get_package_info(pref, remote)
+                remote_info, pref = self._get_package_info(pref, remote)
             except NotFoundException:
                 pass
             except Exception:
@@ -112,7 +123,7 @@ class GraphBinariesAnalyzer(object):
         if not remote or (not remote_info and self._cache.config.revisions_enabled):
             for r in remotes.values():
                 try:
-                    remote_info, pref = self._remote_manager.get_package_info(pref, r)
+                    remote_info, pref = self._get_package_info(pref, r)
                 except NotFoundException:
                     pass
                 else:
@@ -151,6 +162,65 @@ class GraphBinariesAnalyzer(object):
             return True
         self._evaluated[pref] = [node]
 
+    @staticmethod
+    def _package_remote(package_layout, pref, remotes, metadata=None):
+        remote = remotes.selected
+        if not remote:
+            # If the remote_name is not given, follow the binary remote, or the recipe remote
+            # If it is defined it won't iterate (might change in conan2.0)
+            metadata = metadata or package_layout.load_metadata()
+            remote_name = metadata.packages[pref.id].remote or metadata.recipe.remote
+            remote = remotes.get(remote_name)
+        return remote
+
+    def _prefetch_remote_pkgs(self, nodes, build_mode, remotes, parallel):
+        """ checks concurrently, with at most 'parallel' threads, the existence in the remotes of
+        the binaries of the nodes (of the same level) that are not in the cache. The nodes are
+        evaluated later, sequentially, using these results
+        """
+        if build_mode.all or not remotes:
+            return
+        pending = []
+        for node in nodes:
+            if (node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL, RECIPE_EDITABLE) or
+                    node.package_id == PACKAGE_ID_UNKNOWN or node.conanfile.build_policy_always):
+                continue
+            if build_mode.forced(node.conanfile, node.ref):  # It will be built anyway
+                continue
+            locked = node.graph_lock_node
+            if locked and locked.pref.id == node.package_id:
+                pref = locked.pref
+            else:
+                pref = PackageReference(node.ref, node.package_id)
+            if pref in self._evaluated:
+                continue
+            package_layout = self._cache.package_layout(pref.ref,
+                                                        short_paths=node.conanfile.short_paths)
+            if os.path.exists(package_layout.package(pref)):
+                continue
+            remote = (self._package_remote(package_layout, pref, remotes) or
+                      next(iter(remotes.values())))
+            if (pref, remote.name) not in self._prefetched and (pref, remote) not in pending:
+                pending.append((pref, remote))
+        if len(pending) < 2:  # Nothing to gain from concurrency
+            return
+
+        def _get_package_info(item):
+            pref_, remote_ = item
+            try:
+                return self._remote_manager.get_package_info(pref_, remote_)
+            except Exception as exc:
+                return exc
+
+        thread_pool = ThreadPool(min(parallel, len(pending)))
+        try:
+            result = thread_pool.map(_get_package_info, pending)
+        finally:
+            thread_pool.close()
+            thread_pool.join()
+        for (pref, remote), remote_result in zip(pending, result):
+            self._prefetched[(pref, remote.name)] = remote_result
+
     def _evaluate_node(self, node, build_mode, update, remotes):
         assert node.binary is None, "Node.binary should be None"
         assert node.package_id is not None, "Node.package_id shouldn't be None"
@@ -207,13 +277,7 @@ class GraphBinariesAnalyzer(object):
         package_folder = package_layout.package(pref)
         metadata = self._evaluate_clean_pkg_folder_dirty(node, package_layout, package_folder, pref)
 
-        remote = remotes.selected
-        if not remote:
-            # If the remote_name is not given, follow the binary remote, or the recipe remote
-            # If it is defined it won't iterate (might change in conan2.0)
-            metadata = metadata or package_layout.load_metadata()
-            remote_name = metadata.packages[pref.id].remote or metadata.recipe.remote
-            remote = remotes.get(remote_name)
+        remote = self._package_remote(package_layout, pref, remotes, metadata)
 
         if os.path.exists(package_folder):  # Binary already in cache, check for updates
             self._evaluate_cache_pkg(node, package_layout, pref, metadata,  remote, remotes, update,
@@ -297,17 +361,25 @@ class GraphBinariesAnalyzer(object):
 
     def evaluate_graph(self, deps_graph, build_mode, update, remotes, nodes_subset=None, root=None):
         default_package_id_mode = self._cache.config.default_package_id_mode
-        for node in deps_graph.ordered_iterate(nodes_subset=nodes_subset):
-            self._propagate_options(node)
-
-            self._compute_package_id(node, default_package_id_mode)
-            if node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL):
-                continue
-            if node.package_id == PACKAGE_ID_UNKNOWN:
-                assert node.binary is None, "Node.binary should be None"
-                node.binary = BINARY_UNKNOWN
-                continue
-            self._evaluate_node(node, build_mode, update, remotes)
+        parallel = self._cache.config.parallel_download
+        # The nodes of a level only depend on the nodes of the previous levels, so all their
+        # package IDs can be computed before checking their binaries, which can be done
+        # concurrently in the remotes
+        for level in deps_graph.by_levels(nodes_subset):
+            for node in level:
+                self._propagate_options(node)
+                self._compute_package_id(node, default_package_id_mode)
+            if parallel:
+                self._prefetch_remote_pkgs(level, build_mode, remotes, parallel)
+            for node in level:
+                if node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL):
+                    continue
+                if node.package_id == PACKAGE_ID_UNKNOWN:
+                    assert node.binary is None, "Node.binary should be None"
+                    node.binary = BINARY_UNKNOWN
+                    continue
+                self._evaluate_node(node, build_mode, update, remotes)
+        self._prefetched.clear()
         deps_graph.mark_private_skippable(nodes_subset=nodes_subset, root=root)
 
     def reevaluate_node(self, node, remotes, build_mode, update):
@@ -1,3 +1,4 @@
+import fnmatch
 import time
 from collections import OrderedDict
 
@@ -13,30 +14,44 @@ from conans.util.log import logger
 class DepsGraphBuilder(object):
     """ Responsible for computing the dependencies graph DepsGraph
     """
-    def __init__(self, proxy, output, loader, resolver, recorder):
+    def __init__(self, proxy, output, loader, resolver, recorder, parallel_download=None,
+                 share_build_requires=False):
         self._proxy = proxy
         self._output = output
         self._loader = loader
         self._resolver = resolver
         self._recorder = recorder
+        self._parallel_download = parallel_download
+        # Results of recipes retrieved concurrently, not consumed by the graph expansion yet
+        self._prefetched = {}
+        self.prefetched_count = 0
+        # {(build_requires refs, locked ids): [_BuildRequiresExpansion]} already expanded, to be
+        # shared with other consumers, if share_build_requires
+        self._share_build_requires = share_build_requires
+        self._build_requires_expansions = {}
+        self.reused_build_requires = 0
 
     def load_graph(self, root_node, check_updates, update, remotes, profile_host,
                    graph_lock=None):
         check_updates = check_updates or update
-        dep_graph = DepsGraph()
+        initial = graph_lock.initial_counter if graph_lock else 0
+        dep_graph = DepsGraph(initial_node_id=initial)
         # compute the conanfile entry point for this dependency graph
         name = root_node.name
-        root_node.public_closure = OrderedDict([(name, root_node)])
-        root_node.transitive_closure = OrderedDict([(name, root_node)])
         root_node.public_deps = {name: root_node}
         root_node.ancestors = set()
         dep_graph.add_node(root_node)
+        root_node.init_closures()
 
         # enter recursive computation
         t1 = time.time()
-        self._load_deps(dep_graph, root_node, Requirements(), None, None,
-                        check_updates, update, remotes,
-                        profile_host, graph_lock)
+        try:
+            self._load_deps(dep_graph, root_node, Requirements(), None, None,
+                            check_updates, update, remotes,
+                            profile_host, graph_lock)
+        finally:
+            # Prefetched recipes not required in the end, as overridden ones, are not kept
+            self._prefetched.clear()
         logger.debug("GRAPH: Time to load deps %s" % (time.time() - t1))
         return dep_graph
 
@@ -58,23 +73,65 @@ class DepsGraphBuilder(object):
             graph_lock.lock_node(node, requires, build_requires=True)
 
         self._resolve_ranges(graph, requires, scope, update, remotes)
-
         for require in requires:
-            name = require.ref.name
             require.build_require = True
-            self._handle_require(name, node, require, graph, check_updates, update,
-                                 remotes, profile_host, new_reqs, new_options, graph_lock)
+
+        key = tuple((repr(r.ref), r.locked_id) for r in requires)
+        for expansion in self._build_requires_expansions.get(key, []):
+            if expansion.reuse(graph, node, requires, new_options):
+                self.reused_build_requires += 1
+                self._sort_build_requires_closure(node, expansion.nodes)
+                # Already evaluated, and its build-requires expanded, nothing new to process
+                return set()
+
+        self._prefetch_recipes(node, requires, check_updates, update, remotes)
+
+        try:
+            for require in requires:
+                name = require.ref.name
+                self._handle_require(name, node, require, graph, check_updates, update,
+                                     remotes, profile_host, new_reqs, new_options, graph_lock)
+        finally:
+            self._prefetched.clear()
 
         new_nodes = set(n for n in graph.nodes if n.package_id is None)
+        if self._share_build_requires:
+            expansion = _BuildRequiresExpansion.create(node, requires, new_options, new_nodes)
+            if expansion:
+                self._build_requires_expansions.setdefault(key, []).append(expansion)
+        self._sort_build_requires_closure(node, new_nodes)
+        return new_nodes
+
+    def shared_build_requires_levels(self, inverse_levels):
+        """ {consumer node: {node: level}} for the build-requires subgraphs shared by several
+        consumers, the levels they would have if each consumer had its own copy of the subgraph,
+        so the closures keep the same order as if they were not shared
+        """
+        result = {}
+        for expansions in self._build_requires_expansions.values():
+            for expansion in expansions:
+                if len(expansion.consumers) < 2:
+                    continue
+                depths = expansion.depths()
+                for consumer in expansion.consumers:
+                    levels = result.setdefault(consumer, {})
+                    consumer_level = inverse_levels[consumer]
+                    for n, depth in depths.items():
+                        levels[n] = consumer_level + depth
+        return result
+
+    @staticmethod
+    def _sort_build_requires_closure(node, build_requires_nodes):
         # This is to make sure that build_requires have precedence over the normal requires
         ordered_closure = list(node.public_closure.items())
-        ordered_closure.sort(key=lambda x: x[1] not in new_nodes)
+        ordered_closure.sort(key=lambda x: x[1] not in build_requires_nodes)
         node.public_closure = OrderedDict(ordered_closure)
-        return new_nodes
 
     def _resolve_ranges(self, graph, requires, consumer, update, remotes):
+        requires = list(requires)
+        self._resolver.resolve_ranges(requires, consumer, update, remotes,
+                                      self._parallel_download)
         for require in requires:
-            self._resolver.resolve(require, consumer, update, remotes)
             # if the range is resolved, check if it is an alias
             alias = graph.aliased.get(require.ref)
             if alias:
@@ -119,6 +176,9 @@ class DepsGraphBuilder(object):
             # if there are version-ranges, resolve them before expanding each of the requirements
             self._resolve_deps(dep_graph, node, update, remotes)
 
+        self._prefetch_recipes(node, node.conanfile.requires.values(), check_updates, update,
+                               remotes)
+
         # Expand each one of the current requirements
         for name, require in node.conanfile.requires.items():
             if require.override:
@@ -126,6 +186,30 @@ class DepsGraphBuilder(object):
             self._handle_require(name, node, require, dep_graph, check_updates, update,
                                  remotes, profile_host, new_reqs, new_options, graph_lock)
 
+    def _prefetch_recipes(self, node, requires, check_updates, update, remotes):
+        """ retrieves concurrently all the recipes, not yet in the cache, of the requirements
+        that will create new nodes when expanding this node. The graph is still expanded
+        sequentially, in the same order, so the resulting graph is identical
+        """
+        if not self._parallel_download:
+            return
+        refs = []
+        for require in requires:
+            if require.override or require.ref in self._prefetched:
+                continue
+            name = require.ref.name
+            previous = node.public_deps.get(name)
+            previous_closure = node.public_closure.get(name)
+            if previous and not ((require.build_require or require.private)
+                                 and not previous_closure):
+                continue  # It will close a diamond, no new node
+            refs.append(require.ref)
+
+        result = self._proxy.prefetch_recipes(refs, check_updates, update, remotes,
+                                              self._recorder, self._parallel_download)
+        self._prefetched.update(result)
+        self.prefetched_count += len([r for r in result.values() if not isinstance(r, Exception)])
+
     def _handle_require(self, name, node, require, dep_graph, check_updates, update,
                         remotes, profile_host, new_reqs, new_options, graph_lock):
         # Handle a requirement of a node. There are 2 possibilities
@@ -148,8 +232,7 @@ class DepsGraphBuilder(object):
                                              remotes, profile_host, graph_lock)
 
             # The closure of a new node starts with just itself
-            new_node.public_closure = OrderedDict([(name, new_node)])
-            new_node.transitive_closure = OrderedDict([(name, new_node)])
+            new_node.init_closures()
             # The new created node is connected to the parent one
             node.connect_closure(new_node)
 
@@ -161,7 +244,7 @@ class DepsGraphBuilder(object):
                 new_node.public_deps = node.public_closure.copy()
                 new_node.public_deps[name] = new_node
             else:
-                node.transitive_closure[name] = new_node
+                node.add_transitive(new_node)
                 # Normal requires propagate and can conflict with the parent "node.public_deps" too
                 new_node.public_deps = node.public_deps.copy()
                 new_node.public_deps[name] = new_node
@@ -174,7 +257,7 @@ class DepsGraphBuilder(object):
             self._load_deps(dep_graph, new_node, new_reqs, node.ref, new_options, check_updates,
                             update, remotes, profile_host, graph_lock)
             if not require.private and not require.build_require:
-                node.transitive_closure.update(new_node.transitive_closure)
+                node.update_transitive_closure(new_node)
 
         else:  # a public node already exist with this name
             # This is closing a diamond, the node already exists and is reachable
@@ -185,22 +268,23 @@ class DepsGraphBuilder(object):
             # As we are closing a diamond, there can be conflicts. This will raise if conflicts
             self._conflicting_references(previous.ref, require.ref, node.ref)
 
-            # Add current ancestors to the previous node and upstream deps
-            union = node.ancestors.union([node.name])
-            for n in previous.public_closure.values():
-                n.ancestors.update(union)
+            # Add current ancestors to the previous node and upstream deps. The ones that the
+            # previous node already has were propagated to its closure when it got them
+            new_ancestors = node.ancestors.union([node.name]).difference(previous.ancestors)
+            if new_ancestors:
+                for n in previous.public_closure.values():
+                    n.ancestors.update(new_ancestors)
 
             node.connect_closure(previous)
             dep_graph.add_edge(node, previous, require)
-            if not require.private and not require.build_require:
-                node.transitive_closure.update(previous.transitive_closure)
-
-                # All the upstream dependencies (public_closure) of the previously existing node
-                # now will be also connected to the node and to all its dependants
-                for name, n in previous.transitive_closure.items():
-                    node.connect_closure(n)
-                    for dep_node in node.inverse_closure:
-                        dep_node.connect_closure(n)
+            # All the upstream dependencies (public_closure) of the previously existing node
+            # now will be also connected to the node and to all its dependants. If they already
+            # were in the node transitive_closure, they are already connected
+            if (not require.private and not require.build_require and
+                    node.update_transitive_closure(previous)):
+                node.connect_transitive_closure(previous)
+                for dep_node in node.inverse_closure:
+                    dep_node.connect_transitive_closure(previous)
 
             # Recursion is only necessary if the inputs conflict with the current "previous"
             # configuration of upstream versions and options
@@ -311,8 +395,12 @@ class DepsGraphBuilder(object):
         """
 
         try:
-            result = self._proxy.get_recipe(requirement.ref, check_updates, update,
-                                            remotes, self._recorder)
+            result = self._prefetched.pop(requirement.ref, None)
+            if isinstance(result, Exception):
+                raise result
+            if result is None:
+                result = self._proxy.get_recipe(requirement.ref, check_updates, update,
+                                                remotes, self._recorder)
         except ConanException as e:
             if current_node.ref:
                 self._output.error("Failed requirement '%s' from '%s'"
@@ -354,3 +442,78 @@ class DepsGraphBuilder(object):
         dep_graph.add_node(new_node)
         dep_graph.add_edge(current_node, new_node, requirement)
         return new_node
+
+
+class _BuildRequiresExpansion(object):
+    """ The subgraph created by expanding the build-requires of one node. Other nodes with the
+    same build-requires and options can be connected to it instead of creating and evaluating
+    identical subgraphs again, as far as the subgraph is isolated from both consumers closures
+    """
+
+    def __init__(self, consumer, edges, connected, nodes, options):
+        self.consumers = [consumer]
+        self._edges = edges  # [(require ref, node)] the direct build-requires
+        self._connected = connected  # The subgraph nodes that entered the consumer closure
+        self.nodes = nodes
+        self._names = set(n.name for n in nodes)
+        self._options = options
+
+    def depths(self):
+        """ {node: distance} the longest distance from the consumer to each node
+        """
+        levels = DepsGraph._compute_levels(False, self.nodes)
+        return {n: i + 1 for i, level in enumerate(levels) for n in level}
+
+    @staticmethod
+    def _filter_options(options, names):
+        """ the subset of the down options (can be patterns) that apply to the 'names' packages
+        """
+        return {pattern: [(k, str(v)) for k, v in values.items()]
+                for pattern, values in options.items()
+                if any(pattern == name or fnmatch.fnmatch(name, pattern) for name in names)}
+
+    @staticmethod
+    def create(node, requires, options, new_nodes):
+        """ returns the expansion of the build-requires of 'node', or None if the expansion
+        closed some diamond with the existing nodes of the graph, so it cannot be reused
+        """
+        edges = []
+        for require in requires:
+            edge = next((e for e in node.dependencies if e.require is require), None)
+            if edge is None or edge.dst not in new_nodes:
+                return None
+            edges.append((require.ref, edge.dst))
+
+        nodes = set()
+        current = [dst for _, dst in edges]
+        while current:
+            nodes.update(current)
+            current = set(d for n in current for d in n.neighbors()).difference(nodes)
+        if not nodes.issubset(new_nodes):
+            return None
+
+        connected = [n for n in node.public_closure.values() if n in nodes]
+        names = set(n.name for n in nodes)
+        return _BuildRequiresExpansion(node, edges, connected, nodes,
+                                       _BuildRequiresExpansion._filter_options(options, names))
+
+    def reuse(self, graph, node, requires, options):
+        """ connects 'node' to this subgraph, for the given build 'requires', if that results in
+        the same graph than expanding them again
+        """
+        if self._names.intersection(node.public_closure) or \
+                self._names.intersection(node.ancestors) or node.name in self._names:
+            return False
+        if self._filter_options(options, self._names) != self._options:
+            return False
+
+        union = node.ancestors.union([node.name])
+        for n in self.nodes:
+            n.ancestors.update(union)
+        for require, (ref, dst) in zip(requires, self._edges):
+            assert require.ref == ref
+            graph.add_edge(node, dst, require)
+        for n in self._connected:
+            node.connect_closure(n)
+        self.consumers.append(node)
+        return True
@@ -331,23 +331,34 @@ class GraphManager(object):
                     graph_lock):
 
         assert isinstance(build_mode, BuildMode)
+        config = self._cache.config
         builder = DepsGraphBuilder(self._proxy, self._output, self._loader, self._resolver,
-                                   recorder)
+                                   recorder, config.parallel_download, config.share_build_requires)
         graph = builder.load_graph(root_node, check_updates, update, remotes, profile_host,
                                    graph_lock)
 
         self._recurse_build_requires(graph, builder, check_updates, update, build_mode,
                                      remotes, profile_host_build_requires, recorder, profile_host,
                                      graph_lock, apply_build_requires=apply_build_requires)
+        if builder.prefetched_count:
+            self._output.info("Retrieved %d recipes concurrently" % builder.prefetched_count)
+        if builder.reused_build_requires:
+            self._output.info("Reused %d build-requires expansions"
+                              % builder.reused_build_requires)
 
         # Sort of closures, for linking order
         inverse_levels = {n: i for i, level in enumerate(graph.inverse_levels()) for n in level}
+        shared_levels = builder.shared_build_requires_levels(inverse_levels)
         for node in graph.nodes:
             closure = node.public_closure
             closure.pop(node.name)
             node_order = list(closure.values())
             # List sort is stable, will keep the original order of closure, but prioritize levels
-            node_order.sort(key=lambda n: inverse_levels[n])
+            levels = shared_levels.get(node)
+            if levels:
+                node_order.sort(key=lambda n: levels.get(n, inverse_levels[n]))
+            else:
+                node_order.sort(key=lambda n: inverse_levels[n])
             node.public_closure = node_order
 
         return graph
@@ -1,4 +1,5 @@
 import os
+from multiprocessing.pool import ThreadPool
 
 from requests.exceptions import RequestException
 
@@ -39,6 +40,36 @@ class ConanProxy(object):
 
         return conanfile_path, status, remote, new_ref
 
+    def prefetch_recipes(self, refs, check_updates, update, remotes, recorder, parallel):
+        """ retrieves concurrently, with at most 'parallel' threads, the recipes of the given
+        references that are not in the local cache yet
+        :return: dict {ref: get_recipe() result or the exception it raised}
+        """
+        missing = []
+        for ref in refs:
+            layout = self._cache.package_layout(ref)
+            if isinstance(layout, PackageEditableLayout) or os.path.exists(layout.conanfile()):
+                continue
+            if ref not in missing:
+                missing.append(ref)
+        if len(missing) < 2:  # Nothing to gain from concurrency
+            return {}
+
+        def _get_recipe(ref_):
+            try:
+                return ref_, self.get_recipe(ref_, check_updates, update, remotes, recorder)
+            except Exception as exc:
+                return ref_, exc
+
+        self._remote_manager.initialize_hooks()
+        thread_pool = ThreadPool(min(parallel, len(missing)))
+        try:
+            result = thread_pool.map(_get_recipe, missing)
+        finally:
+            thread_pool.close()
+            thread_pool.join()
+        return dict(result)
+
     def _get_recipe(self, layout, ref, check_updates, update, remotes, recorder):
         output = ScopedOutput(str(ref), self._out)
         # check if it is in disk
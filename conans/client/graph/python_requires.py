@@ -12,10 +12,11 @@ PythonRequire = namedtuple("PythonRequire", ["ref", "module", "conanfile",
 
 
 class ConanPythonRequire(object):
-    def __init__(self, proxy, range_resolver):
+    def __init__(self, proxy, range_resolver, bytecode_cache=None):
         self._cached_requires = {}  # {reference: PythonRequire}
         self._proxy = proxy
         self._range_resolver = range_resolver
+        self._bytecode_cache = bytecode_cache
         self._requires = None
         self.valid = True
         self._check_updates = False
@@ -49,7 +50,8 @@ class ConanPythonRequire(object):
                                             remotes=self._remotes,
                                             recorder=ActionRecorder())
             path, _, _, new_ref = result
-            module, conanfile = parse_conanfile(conanfile_path=path, python_requires=self)
+            module, conanfile = parse_conanfile(conanfile_path=path, python_requires=self,
+                                                bytecode_cache=self._bytecode_cache)
 
             # Check for alias
             if getattr(conanfile, "alias", None):
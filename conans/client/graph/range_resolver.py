@@ -1,4 +1,5 @@
 import re
+from multiprocessing.pool import ThreadPool
 
 from conans.errors import ConanException
 from conans.model.ref import ConanFileReference
@@ -51,27 +52,61 @@ def _parse_versionexpr(versionexpr, result):
     return version_range, loose, include_prerelease
 
 
-def satisfying(list_versions, versionexpr, result):
+def _parse_range(version_range, loose, parsed_ranges):
+    from semver import Range
+    key = version_range, loose
+    try:
+        act_range = parsed_ranges[key]
+    except KeyError:
+        try:
+            act_range = Range(version_range, loose)
+        except ValueError:
+            act_range = None
+        parsed_ranges[key] = act_range
+    if act_range is None:
+        raise ConanException("version range expression '%s' is not valid" % version_range)
+    return act_range
+
+
+def _parse_version(version, loose, parsed_versions):
+    """ the SemVer of the version, or None if it is not semver
+    """
+    from semver import SemVer
+    key = version, loose
+    try:
+        return parsed_versions[key]
+    except KeyError:
+        try:
+            ver = SemVer(version, loose=loose)
+        except (ValueError, AttributeError):
+            ver = None
+        parsed_versions[key] = ver
+        return ver
+
+
+def satisfying(list_versions, versionexpr, result, parsed_ranges=None, parsed_versions=None):
     """ returns the maximum version that satisfies the expression
     if some version cannot be converted to loose SemVer, it is discarded with a msg
     This provides some workaround for failing comparisons like "2.1" not matching "<=2.1"
+    parsed_ranges and parsed_versions are optional dicts to reuse the parsed objects between
+    calls
     """
-    from semver import SemVer, Range, max_satisfying
+    from semver import max_satisfying
     version_range, loose, include_prerelease = _parse_versionexpr(versionexpr, result)
 
     # Check version range expression
-    try:
-        act_range = Range(version_range, loose)
-    except ValueError:
-        raise ConanException("version range expression '%s' is not valid" % version_range)
+    act_range = _parse_range(version_range, loose,
+                             {} if parsed_ranges is None else parsed_ranges)
 
     # Validate all versions
+    if parsed_versions is None:
+        parsed_versions = {}
     candidates = {}
     for v in list_versions:
-        try:
-            ver = SemVer(v, loose=loose)
+        ver = _parse_version(v, loose, parsed_versions)
+        if ver is not None:
             candidates[ver] = v
-        except (ValueError, AttributeError):
+        else:
             result.append("WARN: Version '%s' is not semver, cannot be compared with a range"
                           % str(v))
 
@@ -87,7 +122,13 @@ class RangeResolver(object):
         self._cache = cache
         self._remote_manager = remote_manager
         self._cached_remote_found = {}
+        self._remote_searches = {}
         self._result = []
+        # Parsing ranges and versions is the most expensive part of resolving a version range,
+        # and the same ones are evaluated again and again while expanding a graph. Parsed
+        # objects are not modified by the semver comparisons, so they can be shared
+        self._parsed_ranges = {}
+        self._parsed_versions = {}
 
     @property
     def output(self):
@@ -95,7 +136,35 @@ class RangeResolver(object):
         self._result = []
         return result
 
-    def resolve(self, require, base_conanref, update, remotes):
+    @staticmethod
+    def _search_ref(require):
+        ref = require.ref
+        # The search pattern must be a string
+        return ConanFileReference(ref.name, "*", ref.user, ref.channel)
+
+    def resolve_ranges(self, requires, base_conanref, update, remotes, parallel=None):
+        """ resolves the version ranges of all the requirements of a node together: the local
+        cache is scanned just once for all of them, and the remotes are searched just once per
+        distinct name, concurrently with 'parallel' threads if defined. The requirements are
+        resolved in order, with the same result as resolving them one by one
+        """
+        pending = [r for r in requires if r.version_range is not None and not r.is_resolved]
+        local_refs = self._local_refs() if pending else None
+        if pending and parallel:
+            names = []
+            for require in pending:
+                search_ref = self._search_ref(require)
+                if search_ref in self._cached_remote_found or search_ref.name in names:
+                    continue
+                if update or not self._resolve_local(search_ref, require.version_range,
+                                                     local_refs, result=[]):
+                    names.append(search_ref.name)
+            self._prefetch_remote_searches(names, remotes, update, parallel)
+
+        for require in requires:
+            self.resolve(require, base_conanref, update, remotes, local_refs)
+
+    def resolve(self, require, base_conanref, update, remotes, local_refs=None):
         version_range = require.version_range
         if version_range is None:
             return
@@ -113,20 +182,20 @@ class RangeResolver(object):
                                     % (version_range, base_conanref, str(ref)))
             return
 
-        ref = require.ref
-        # The search pattern must be a string
-        search_ref = ConanFileReference(ref.name, "*", ref.user, ref.channel)
+        search_ref = self._search_ref(require)
 
         if update:
-            resolved_ref, remote_name = self._resolve_remote(search_ref, version_range, remotes)
+            resolved_ref, remote_name = self._resolve_remote(search_ref, version_range, remotes,
+                                                             update)
             if not resolved_ref:
                 remote_name = None
-                resolved_ref = self._resolve_local(search_ref, version_range)
+                resolved_ref = self._resolve_local(search_ref, version_range, local_refs)
         else:
             remote_name = None
-            resolved_ref = self._resolve_local(search_ref, version_range)
+            resolved_ref = self._resolve_local(search_ref, version_range, local_refs)
             if not resolved_ref:
-                resolved_ref, remote_name = self._resolve_remote(search_ref, version_range, remotes)
+                resolved_ref, remote_name = self._resolve_remote(search_ref, version_range, remotes,
+                                                                 update)
 
         origin = ("remote '%s'" % remote_name) if remote_name else "local cache"
         if resolved_ref:
@@ -138,19 +207,65 @@ class RangeResolver(object):
                                  "could not be resolved in %s"
                                  % (version_range, require, base_conanref, origin))
 
-    def _resolve_local(self, search_ref, version_range):
-        local_found = search_recipes(self._cache, search_ref)
-        local_found = [ref for ref in local_found
-                       if ref.user == search_ref.user and
-                       ref.channel == search_ref.channel]
+    def _local_refs(self):
+        """ all the references in the local cache, grouped by name (case insensitive, as the
+        local search), user and channel
+        """
+        result = {}
+        for ref in search_recipes(self._cache):
+            result.setdefault((ref.name.lower(), ref.user, ref.channel), []).append(ref)
+        return result
+
+    def _resolve_local(self, search_ref, version_range, local_refs=None, result=None):
+        if local_refs is None:
+            local_refs = self._local_refs()
+        local_found = local_refs.get((search_ref.name.lower(), search_ref.user,
+                                      search_ref.channel))
         if local_found:
-            return self._resolve_version(version_range, local_found)
+            return self._resolve_version(version_range, local_found, result)
 
-    def _search_remotes(self, search_ref, remotes):
+    def _search_remote(self, remote, name, update):
+        """ all the references with that name in the remote, from previous searches if possible
+        """
+        search_result = self._remote_searches.get((remote.name, name))
+        if search_result is None:
+            search_cache = self._cache.remote_search_cache
+            search_result = search_cache.get(remote, name) if not update else None
+            if search_result is None:
+                search_result = self._remote_manager.search_recipes(remote, name,
+                                                                    ignorecase=False)
+                search_cache.set(remote, name, search_result)
+            self._remote_searches[(remote.name, name)] = search_result
+        return search_result
+
+    def _prefetch_remote_searches(self, names, remotes, update, parallel):
+        """ searches concurrently the given names in the first remote that will be searched.
+        Errors are ignored here, the search will be repeated and fail when resolving
+        """
+        if len(names) < 2:  # Nothing to gain from concurrency
+            return
+        remote = remotes.selected or next(iter(remotes.values()), None)
+        if remote is None:
+            return
+
+        def _search(name_):
+            try:
+                self._search_remote(remote, name_, update)
+            except Exception:
+                pass
+
+        thread_pool = ThreadPool(min(parallel, len(names)))
+        try:
+            thread_pool.map(_search, names)
+        finally:
+            thread_pool.close()
+            thread_pool.join()
+
+    def _search_remotes(self, search_ref, remotes, update):
+        # The results of previous searches are reused, unless they expired or updating
         for remote in remotes.values():
             if not remotes.selected or remote == remotes.selected:
-                search_result = self._remote_manager.search_recipes(remote, search_ref.name,
-                                                                    ignorecase=False)
+                search_result = self._search_remote(remote, search_ref.name, update)
                 search_result = [ref for ref in search_result
                                  if ref.user == search_ref.user and
                                  ref.channel == search_ref.channel]
@@ -158,12 +273,12 @@ class RangeResolver(object):
                     return search_result, remote.name
         return None, None
 
-    def _resolve_remote(self, search_ref, version_range, remotes):
+    def _resolve_remote(self, search_ref, version_range, remotes, update):
         # We should use ignorecase=False, we want the exact case!
         found_refs, remote_name = self._cached_remote_found.get(search_ref, (None, None))
         if found_refs is None:
             # Searching for just the name is much faster in remotes like Artifactory
-            found_refs, remote_name = self._search_remotes(search_ref, remotes)
+            found_refs, remote_name = self._search_remotes(search_ref, remotes, update)
             if found_refs:
                 self._result.append("%s versions found in '%s' remote" % (search_ref, remote_name))
             else:
@@ -177,7 +292,9 @@ class RangeResolver(object):
             return self._resolve_version(version_range, found_refs), remote_name
         return None, None
 
-    def _resolve_version(self, version_range, refs_found):
+    def _resolve_version(self, version_range, refs_found, result=None):
         versions = {ref.version: ref for ref in refs_found}
-        result = satisfying(versions, version_range, self._result)
+        result = satisfying(versions, version_range,
+                            self._result if result is None else result,
+                            self._parsed_ranges, self._parsed_versions)
         return versions.get(result)
@@ -1,5 +1,6 @@
 import os
 import sys
+import threading
 import traceback
 import uuid
 from collections import defaultdict
@@ -40,15 +41,27 @@ class HookManager(object):
         self.hooks = defaultdict(list)
         self.output = output
         self._attribute_checker_path = os.path.join(self._hooks_folder, "attribute_checker.py")
+        self._loaded = False
+        self._lock = threading.Lock()
 
     def create_default_hooks(self):
         save(self._attribute_checker_path, attribute_checker_hook)
 
+    def initialize(self):
+        """ creates the default hooks and loads the hooks, just once. Loading them changes the
+        current directory and sys.path, so it has to be done before running them from several
+        threads
+        """
+        with self._lock:
+            if not os.path.exists(self._attribute_checker_path):
+                self.create_default_hooks()
+            if not self._loaded:
+                if not self.hooks:
+                    self.load_hooks()
+                self._loaded = True
+
     def execute(self, method_name, **kwargs):
-        if not os.path.exists(self._attribute_checker_path):
-            self.create_default_hooks()
-        if not self.hooks:
-            self.load_hooks()
+        self.initialize()
 
         assert method_name in valid_hook_methods, \
             "Method '{}' not in valid hooks methods".format(method_name)
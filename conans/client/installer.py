@@ -1,6 +1,8 @@
 import os
 import shutil
+import threading
 import time
+from multiprocessing.pool import ThreadPool
 
 from conans.client import tools
 from conans.client.file_copier import report_copied_files
@@ -309,6 +311,7 @@ class BinaryInstaller(object):
 
     def _build(self, nodes_by_level, keep_build, root_node, graph_info, remotes, build_mode, update):
         processed_package_refs = set()
+        parallel = self._cache.config.parallel_download
         for level in nodes_by_level:
             for node in level:
                 ref, conan_file = node.ref, node.conanfile
@@ -329,11 +332,67 @@ class BinaryInstaller(object):
                     _handle_system_requirements(conan_file, node.pref, self._cache, output)
                     if node.binary == BINARY_UNKNOWN:
                         self._binaries_analyzer.reevaluate_node(node, remotes, build_mode, update)
-                    self._handle_node_cache(node, keep_build, processed_package_refs, remotes)
+                    if not parallel:
+                        self._handle_node_cache(node, keep_build, processed_package_refs, remotes)
+
+            if parallel:
+                self._download_level(level, processed_package_refs, parallel)
+                # The nodes of the level are independent, they are installed (built, or just
+                # their package_info() called) in order, once the level has been downloaded.
+                # Builds are not concurrent: they share the output and the environment
+                # (tools.environment_append, os.chdir) and every build already uses all the cores
+                for node in level:
+                    if node.binary not in (BINARY_EDITABLE, BINARY_SKIP):
+                        self._handle_node_cache(node, keep_build, processed_package_refs, remotes)
 
         # Finally, propagate information to root node (ref=None)
         self._propagate_info(root_node)
 
+    def _download_level(self, level, processed_package_refs, parallel):
+        """ downloads concurrently, with at most 'parallel' threads, the binaries of the nodes
+        of a level that have to be retrieved from the remotes. If one of them fails, the
+        downloads not started yet are cancelled, and the error raised once the running ones
+        have finished
+        """
+        nodes = []
+        prefs = set(processed_package_refs)
+        for node in level:
+            if node.binary in (BINARY_DOWNLOAD, BINARY_UPDATE) and node.pref not in prefs:
+                prefs.add(node.pref)
+                nodes.append(node)
+        if len(nodes) < 2:  # Nothing to gain from concurrency
+            return
+
+        cancelled = threading.Event()
+
+        def _download(node_):
+            if cancelled.is_set():
+                return None
+            try:
+                pref = node_.pref
+                layout = self._cache.package_layout(pref.ref, node_.conanfile.short_paths)
+                with layout.package_lock(pref):
+                    self._download_package(node_, layout)
+                return pref
+            except BaseException as exc:
+                cancelled.set()
+                return exc
+
+        self._hook_manager.initialize()  # The download hooks, before the threads run them
+        thread_pool = ThreadPool(min(parallel, len(nodes)))
+        try:
+            result = thread_pool.map(_download, nodes)
+        finally:
+            cancelled.set()
+            thread_pool.close()
+            thread_pool.join()
+
+        downloaded = [r for r in result if isinstance(r, PackageReference)]
+        processed_package_refs.update(downloaded)
+        errors = [r for r in result if isinstance(r, BaseException)]
+        if errors:
+            raise errors[0]
+
     @staticmethod
     def _node_concurrently_installed(node, package_folder):
         if node.binary == BINARY_DOWNLOAD and os.path.exists(package_folder):
@@ -400,22 +459,7 @@ class BinaryInstaller(object):
                     assert node.pref.revision, "Node PREF revision shouldn't be empty"
                     assert pref.revision is not None, "PREV for %s to be built is None" % str(pref)
                 elif node.binary in (BINARY_UPDATE, BINARY_DOWNLOAD):
-                    assert node.prev, "PREV for %s is None" % str(pref)
-                    # not really concurrently, but a different node with same pref
-                    if not self._node_concurrently_installed(node, package_folder):
-                        with set_dirty_context_manager(package_folder):
-                            assert pref.revision is not None, \
-                                "Installer should receive #PREV always"
-                            self._remote_manager.get_package(pref, package_folder,
-                                                             node.binary_remote, output,
-                                                             self._recorder)
-                            output.info("Downloaded package revision %s" % pref.revision)
-                            with layout.update_metadata() as metadata:
-                                metadata.packages[pref.id].remote = node.binary_remote.name
-                    else:
-                        output.success('Download skipped. Probable concurrent download')
-                        log_package_got_from_local_cache(pref)
-                        self._recorder.package_fetched_from_cache(pref)
+                    self._download_package(node, layout)
                 elif node.binary == BINARY_CACHE:
                     assert node.prev, "PREV for %s is None" % str(pref)
                     output.success('Already installed!')
@@ -426,6 +470,25 @@ class BinaryInstaller(object):
             self._call_package_info(conanfile, package_folder, ref=pref.ref)
             self._recorder.package_cpp_info(pref, conanfile.cpp_info)
 
+    def _download_package(self, node, layout):
+        pref = node.pref
+        assert node.prev, "PREV for %s is None" % str(pref)
+        output = node.conanfile.output
+        package_folder = layout.package(pref)
+        # not really concurrently, but a different node with same pref
+        if not self._node_concurrently_installed(node, package_folder):
+            with set_dirty_context_manager(package_folder):
+                assert pref.revision is not None, "Installer should receive #PREV always"
+                self._remote_manager.get_package(pref, package_folder, node.binary_remote,
+                                                 output, self._recorder)
+                output.info("Downloaded package revision %s" % pref.revision)
+                with layout.update_metadata() as metadata:
+                    metadata.packages[pref.id].remote = node.binary_remote.name
+        else:
+            output.success('Download skipped. Probable concurrent download')
+            log_package_got_from_local_cache(pref)
+            self._recorder.package_fetched_from_cache(pref)
+
     def _build_package(self, node, output, keep_build, remotes):
         conanfile = node.conanfile
         # It is necessary to complete the sources of python requires, which might be used
@@ -5,6 +5,7 @@ import os
 import sys
 import uuid
 
+import six
 import yaml
 
 from conans.client.generators import registered_generators
@@ -23,10 +24,11 @@ from conans.util.files import load
 
 
 class ConanFileLoader(object):
-    def __init__(self, runner, output, python_requires):
+    def __init__(self, runner, output, python_requires, bytecode_cache=None):
         self._runner = runner
         self._output = output
         self._python_requires = python_requires
+        self._bytecode_cache = bytecode_cache
         sys.modules["conans"].python_requires = python_requires
         self._cached_conanfile_classes = {}
 
@@ -42,7 +44,8 @@ class ConanFileLoader(object):
             self._python_requires.locked_versions = {r.name: r for r in lock_python_requires}
         try:
             self._python_requires.valid = True
-            _, conanfile = parse_conanfile(conanfile_path, self._python_requires)
+            _, conanfile = parse_conanfile(conanfile_path, self._python_requires,
+                                           self._bytecode_cache)
             self._python_requires.valid = False
 
             self._python_requires.locked_versions = None
@@ -274,9 +277,9 @@ def _parse_module(conanfile_module, module_id):
     return result
 
 
-def parse_conanfile(conanfile_path, python_requires):
+def parse_conanfile(conanfile_path, python_requires, bytecode_cache=None):
     with python_requires.capture_requires() as py_requires:
-        module, filename = _parse_conanfile(conanfile_path)
+        module, filename = _parse_conanfile(conanfile_path, bytecode_cache)
         try:
             conanfile = _parse_module(module, filename)
 
@@ -297,8 +300,24 @@ def parse_conanfile(conanfile_path, python_requires):
             raise ConanException("%s: %s" % (conanfile_path, str(e)))
 
 
-def _parse_conanfile(conan_file_path):
-    """ From a given path, obtain the in memory python import module
+def _load_module(module_id, conan_file_path, bytecode_cache):
+    """ equivalent to imp.load_source(), but executing the code object from the cache
+    """
+    code = bytecode_cache.code(conan_file_path)
+    module = imp.new_module(module_id)
+    module.__file__ = conan_file_path
+    sys.modules[module_id] = module
+    try:
+        six.exec_(code, module.__dict__)
+    except BaseException:
+        del sys.modules[module_id]
+        raise
+    return module
+
+
+def _parse_conanfile(conan_file_path, bytecode_cache=None):
+    """ From a given path, obtain the in memory python import module. If a BytecodeCache is
+    given, the code is loaded from it instead of compiling the source again
     """
 
     if not os.path.exists(conan_file_path):
@@ -311,7 +330,10 @@ def _parse_conanfile(conan_file_path):
         old_modules = list(sys.modules.keys())
         with chdir(current_dir):
             sys.dont_write_bytecode = True
-            loaded = imp.load_source(module_id, conan_file_path)
+            if bytecode_cache is None:
+                loaded = imp.load_source(module_id, conan_file_path)
+            else:
+                loaded = _load_module(module_id, conan_file_path, bytecode_cache)
             sys.dont_write_bytecode = False
 
         # These lines are necessary, otherwise local conanfile imports with same name
@@ -150,7 +150,11 @@ class ScopedOutput(ConanOutput):
 
     def write(self, data, front=None, back=None, newline=False, error=False):
         assert self.scope != "virtual", "printing with scope==virtual"
-        super(ScopedOutput, self).write("%s: " % self.scope, front=front, back=back,
-                                        newline=False, error=error)
-        super(ScopedOutput, self).write("%s" % data, front=Color.BRIGHT_WHITE, back=back,
-                                        newline=newline, error=error)
+        # The scope and the message are written at once, so the lines of different packages
+        # written concurrently are not mixed
+        scope = "%s: " % self.scope
+        if self._color:
+            if front or back:
+                scope = "%s%s%s%s" % (front or '', back or '', scope, Style.RESET_ALL)
+            data = "%s%s%s%s" % (Color.BRIGHT_WHITE, back or '', data, Style.RESET_ALL)
+        super(ScopedOutput, self).write("%s%s" % (scope, data), newline=newline, error=error)
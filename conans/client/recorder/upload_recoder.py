@@ -1,3 +1,4 @@
+import threading
 from collections import OrderedDict, namedtuple
 from datetime import datetime
 
@@ -31,25 +32,32 @@ def _id_dict(ref):
 
 
 class UploadRecorder(object):
+    """ The recipes and packages are added by the threads of a concurrent upload, in the order
+    they finish
+    """
 
     def __init__(self):
         self.error = False
         self._info = OrderedDict()
+        self._lock = threading.Lock()
 
     def add_recipe(self, ref, remote_name, remote_url):
-
-        self._info[repr(ref.copy_clear_rev())] = {"recipe": _UploadElement(ref, remote_name, remote_url),
-                                "packages": []}
+        with self._lock:
+            element = _UploadElement(ref, remote_name, remote_url)
+            self._info[repr(ref.copy_clear_rev())] = {"recipe": element, "packages": []}
 
     def add_package(self, pref, remote_name, remote_url):
-        self._info[repr(pref.ref.copy_clear_rev())]["packages"].append(_UploadElement(pref, remote_name, remote_url))
+        with self._lock:
+            element = _UploadElement(pref, remote_name, remote_url)
+            self._info[repr(pref.ref.copy_clear_rev())]["packages"].append(element)
 
     def get_info(self):
         info = {"error": self.error, "uploaded": []}
 
-        for item in self._info.values():
-            recipe_info = item["recipe"].to_dict()
-            packages_info = [package.to_dict() for package in item["packages"]]
-            info["uploaded"].append({"recipe": recipe_info, "packages": packages_info})
+        with self._lock:
+            for item in self._info.values():
+                recipe_info = item["recipe"].to_dict()
+                packages_info = [package.to_dict() for package in item["packages"]]
+                info["uploaded"].append({"recipe": recipe_info, "packages": packages_info})
 
         return info
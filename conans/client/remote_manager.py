@@ -6,16 +6,18 @@ import traceback
 from requests.exceptions import ConnectionError
 
 from conans import DEFAULT_REVISION_V1
+from conans.client.archive_codecs import filter_archives
 from conans.client.cache.remote_registry import Remote
 from conans.errors import ConanConnectionError, ConanException, NotFoundException, \
     NoRestV2Available, PackageNotFoundException
+from conans.model.manifest import FileTreeManifest
 from conans.paths import EXPORT_SOURCES_DIR_OLD, \
-    EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, rm_conandir
+    EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, archive_names, rm_conandir
 from conans.search.search import filter_packages
 from conans.util import progress_bar
 from conans.util.env_reader import get_env
 from conans.util.files import make_read_only, mkdir, rmdir, tar_extract, touch_folder, \
-    merge_directories, md5sum, sha1sum
+    merge_directories, file_checksums
 from conans.util.log import logger
 # FIXME: Eventually, when all output is done, tracer functions should be moved to the recorder class
 from conans.util.tracer import (log_package_download,
@@ -32,9 +34,17 @@ class RemoteManager(object):
         self._auth_manager = auth_manager
         self._hook_manager = hook_manager
 
+    def initialize_hooks(self):
+        """ the download hooks are loaded before downloading from several threads
+        """
+        self._hook_manager.initialize()
+
     def check_credentials(self, remote):
         self._call_remote(remote, "check_credentials")
 
+    def server_capable(self, remote, capability):
+        return self._call_remote(remote, "server_capable", capability)
+
     def get_recipe_snapshot(self, ref, remote):
         assert ref.revision, "get_recipe_snapshot requires revision"
         return self._call_remote(remote, "get_recipe_snapshot", ref)
@@ -44,16 +54,18 @@ class RemoteManager(object):
         assert pref.revision, "get_package_snapshot requires PREV"
         return self._call_remote(remote, "get_package_snapshot", pref)
 
-    def upload_recipe(self, ref, files_to_upload, deleted, remote, retry, retry_wait):
+    def upload_recipe(self, ref, files_to_upload, deleted, remote, retry, retry_wait,
+                      checksums=None):
         assert ref.revision, "upload_recipe requires RREV"
         self._call_remote(remote, "upload_recipe", ref, files_to_upload, deleted,
-                          retry, retry_wait)
+                          retry, retry_wait, checksums)
 
-    def upload_package(self, pref, files_to_upload, deleted, remote, retry, retry_wait):
+    def upload_package(self, pref, files_to_upload, deleted, remote, retry, retry_wait,
+                       checksums=None):
         assert pref.ref.revision, "upload_package requires RREV"
         assert pref.revision, "upload_package requires PREV"
         self._call_remote(remote, "upload_package", pref,
-                          files_to_upload, deleted, retry, retry_wait)
+                          files_to_upload, deleted, retry, retry_wait, checksums)
 
     def get_recipe_manifest(self, ref, remote):
         ref = self._resolve_latest_ref(ref, remote)
@@ -89,7 +101,8 @@ class RemoteManager(object):
 
         recipe_checksums = calc_files_checksum(zipped_files)
 
-        unzip_and_get_files(zipped_files, dest_folder, EXPORT_TGZ_NAME, output=self._output)
+        unzip_and_get_files(zipped_files, dest_folder, EXPORT_TGZ_NAME, output=self._output,
+                            archive_cache=self._cache.archive_cache, manifest_folder=dest_folder)
         # Make sure that the source dir is deleted
         package_layout = self._cache.package_layout(ref)
         rm_conandir(package_layout.source())
@@ -118,7 +131,8 @@ class RemoteManager(object):
         log_recipe_sources_download(ref, duration, remote.name, zipped_files)
 
         unzip_and_get_files(zipped_files, export_sources_folder, EXPORT_SOURCES_TGZ_NAME,
-                            output=self._output)
+                            output=self._output, archive_cache=self._cache.archive_cache,
+                            manifest_folder=export_folder)
         # REMOVE in Conan 2.0
         c_src_path = os.path.join(export_sources_folder, EXPORT_SOURCES_DIR_OLD)
         if os.path.exists(c_src_path):
@@ -139,9 +153,16 @@ class RemoteManager(object):
             snapshot = self._call_remote(remote, "get_package_snapshot", pref)
             if not is_package_snapshot_complete(snapshot):
                 raise PackageNotFoundException(pref)
-            zipped_files = self._call_remote(remote, "get_package", pref, dest_folder)
+            if self._cache.config.streaming_package_extraction:
+                zipped_files, extracted_checksums = self._call_remote(remote,
+                                                                      "get_package_extracted",
+                                                                      pref, dest_folder)
+            else:
+                zipped_files = self._call_remote(remote, "get_package", pref, dest_folder)
+                extracted_checksums = {}
 
             package_checksums = calc_files_checksum(zipped_files)
+            package_checksums.update(extracted_checksums)
 
             with self._cache.package_layout(pref.ref).update_metadata() as metadata:
                 metadata.packages[pref.id].revision = pref.revision
@@ -150,7 +171,9 @@ class RemoteManager(object):
 
             duration = time.time() - t1
             log_package_download(pref, duration, remote, zipped_files)
-            unzip_and_get_files(zipped_files, dest_folder, PACKAGE_TGZ_NAME, output=self._output)
+            unzip_and_get_files(zipped_files, dest_folder, PACKAGE_TGZ_NAME, output=self._output,
+                                archive_cache=self._cache.archive_cache,
+                                manifest_folder=dest_folder)
             # Issue #214 https://github.com/conan-io/conan/issues/214
             touch_folder(dest_folder)
             if get_env("CONAN_READ_ONLY_CACHE", False):
@@ -257,8 +280,7 @@ class RemoteManager(object):
 
 
 def calc_files_checksum(files):
-    return {file_name: {"md5": md5sum(path), "sha1": sha1sum(path)}
-            for file_name, path in files.items()}
+    return {file_name: file_checksums(path, ("md5", "sha1")) for file_name, path in files.items()}
 
 
 def is_package_snapshot_complete(snapshot):
@@ -270,25 +292,24 @@ def is_package_snapshot_complete(snapshot):
     return integrity
 
 
-def check_compressed_files(tgz_name, files):
-    bare_name = os.path.splitext(tgz_name)[0]
-    for f in files:
-        if f == tgz_name:
-            continue
-        if bare_name == os.path.splitext(f)[0]:
-            raise ConanException("This Conan version is not prepared to handle '%s' file format. "
-                                 "Please upgrade conan client." % f)
-
-
-def unzip_and_get_files(files, destination_dir, tgz_name, output):
+def unzip_and_get_files(files, destination_dir, tgz_name, output, archive_cache=None,
+                        manifest_folder=None):
     """Moves all files from package_files, {relative_name: tmp_abs_path}
-    to destination_dir, unzipping the "tgz_name" if found"""
-
-    tgz_file = files.pop(tgz_name, None)
-    check_compressed_files(tgz_name, files)
-    if tgz_file:
-        uncompress_file(tgz_file, destination_dir, output=output)
-        os.remove(tgz_file)
+    to destination_dir, unzipping the "tgz_name" archive if found, of any of the codecs.
+    The unzipped archive is kept in the archive_cache, by the summary hash of the manifest in
+    manifest_folder"""
+
+    selected = filter_archives(tgz_name, files)
+    for name in archive_names(tgz_name):
+        tgz_file = files.pop(name, None)
+        if tgz_file:
+            if name in selected:
+                uncompress_file(tgz_file, destination_dir, output=output)
+                if archive_cache is not None and archive_cache.enabled:
+                    summary_hash = FileTreeManifest.load(manifest_folder).summary_hash
+                    if archive_cache.store(summary_hash, name, tgz_file):
+                        continue
+            os.remove(tgz_file)
 
 
 def uncompress_file(src_path, dest_folder, output):
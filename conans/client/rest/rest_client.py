@@ -8,18 +8,20 @@ from conans.util.log import logger
 
 class RestApiClientFactory(object):
 
-    def __init__(self, output, requester, revisions_enabled, artifacts_properties=None):
+    def __init__(self, output, requester, revisions_enabled, artifacts_properties=None,
+                 parallel_transfers=None):
         self._output = output
         self._requester = requester
         self._revisions_enabled = revisions_enabled
         self._artifacts_properties = artifacts_properties
+        self._parallel_transfers = parallel_transfers
         self._cached_capabilities = {}
 
     def new(self, remote, token, refresh_token, custom_headers):
         tmp = RestApiClient(remote, token, refresh_token, custom_headers,
                             self._output, self._requester,
                             self._revisions_enabled, self._cached_capabilities,
-                            self._artifacts_properties)
+                            self._artifacts_properties, self._parallel_transfers)
         return tmp
 
 
@@ -29,7 +31,8 @@ class RestApiClient(object):
     """
 
     def __init__(self, remote, token, refresh_token, custom_headers, output, requester,
-                 revisions_enabled, cached_capabilities, artifacts_properties=None):
+                 revisions_enabled, cached_capabilities, artifacts_properties=None,
+                 parallel_transfers=None):
 
         # Set to instance
         self._token = token
@@ -42,6 +45,7 @@ class RestApiClient(object):
         self._verify_ssl = remote.verify_ssl
         self._artifacts_properties = artifacts_properties
         self._revisions_enabled = revisions_enabled
+        self._parallel_transfers = parallel_transfers
 
         # This dict is shared for all the instances of RestApiClient
         self._cached_capabilities = cached_capabilities
@@ -64,7 +68,7 @@ class RestApiClient(object):
             checksum_deploy = self._capable(CHECKSUM_DEPLOY)
             return RestV2Methods(self._remote_url, self._token, self._custom_headers, self._output,
                                  self._requester, self._verify_ssl, self._artifacts_properties,
-                                 checksum_deploy)
+                                 checksum_deploy, self._parallel_transfers)
         else:
             return RestV1Methods(self._remote_url, self._token, self._custom_headers, self._output,
                                  self._requester, self._verify_ssl, self._artifacts_properties)
@@ -90,6 +94,9 @@ class RestApiClient(object):
     def get_package(self, pref, dest_folder):
         return self._get_api().get_package(pref, dest_folder)
 
+    def get_package_extracted(self, pref, dest_folder):
+        return self._get_api().get_package_extracted(pref, dest_folder)
+
     def get_package_snapshot(self, ref):
         return self._get_api().get_package_snapshot(ref)
 
@@ -99,12 +106,13 @@ class RestApiClient(object):
     def get_package_path(self, pref, path):
         return self._get_api().get_package_path(pref, path)
 
-    def upload_recipe(self, ref, files_to_upload, deleted, retry, retry_wait):
+    def upload_recipe(self, ref, files_to_upload, deleted, retry, retry_wait, checksums=None):
         return self._get_api().upload_recipe(ref, files_to_upload, deleted, retry,
-                                             retry_wait)
+                                             retry_wait, checksums)
 
-    def upload_package(self, pref, files_to_upload, deleted, retry, retry_wait):
-        return self._get_api().upload_package(pref, files_to_upload, deleted, retry, retry_wait)
+    def upload_package(self, pref, files_to_upload, deleted, retry, retry_wait, checksums=None):
+        return self._get_api().upload_package(pref, files_to_upload, deleted, retry, retry_wait,
+                                              checksums)
 
     def authenticate(self, user, password):
         api_v1 = RestV1Methods(self._remote_url, self._token, self._custom_headers, self._output,
@@ -149,6 +157,9 @@ class RestApiClient(object):
     def server_capabilities(self):
         return self._get_api().server_capabilities()
 
+    def server_capable(self, capability):
+        return self._capable(capability)
+
     def get_recipe_revisions(self, ref):
         return self._get_api().get_recipe_revisions(ref)
 
@@ -7,6 +7,7 @@ from conans.errors import (EXCEPTION_CODE_MAPPING, ConanException,
                            AuthenticationException, RecipeNotFoundException,
                            PackageNotFoundException)
 from conans.model.ref import ConanFileReference
+from conans.paths import PACKAGE_TGZ_NAME, archive_names
 from conans.util.files import decode_text
 from conans.util.log import logger
 
@@ -205,9 +206,12 @@ class RestCommonMethods(object):
             raise ConanException("Unexpected server response %s" % result)
         return result
 
-    def upload_recipe(self, ref, files_to_upload, deleted, retry, retry_wait):
+    def upload_recipe(self, ref, files_to_upload, deleted, retry, retry_wait, checksums=None):
+        """ checksums: {filename: {"sha1": ...}} of the files, if already known, not to
+        read them again to send their checksum
+        """
         if files_to_upload:
-            self._upload_recipe(ref, files_to_upload, retry, retry_wait)
+            self._upload_recipe(ref, files_to_upload, retry, retry_wait, checksums)
         if deleted:
             self._remove_conanfile_files(ref, deleted)
 
@@ -225,13 +229,17 @@ class RestCommonMethods(object):
         snap = self._get_snapshot(url)
         return snap
 
-    def upload_package(self, pref, files_to_upload, deleted, retry, retry_wait):
-        if files_to_upload:
-            self._upload_package(pref, files_to_upload, retry, retry_wait)
+    def upload_package(self, pref, files_to_upload, deleted, retry, retry_wait, checksums=None):
         if deleted:
-            raise Exception("This shouldn't be happening, deleted files "
-                            "in local package present in remote: %s.\n Please, report it at "
-                            "https://github.com/conan-io/conan/issues " % str(deleted))
+            # Only the archives of other codecs (general.archive_codec changed) are replaced. The
+            # files of a package can't be removed, the package is removed and uploaded again
+            if not files_to_upload or not set(deleted).issubset(archive_names(PACKAGE_TGZ_NAME)):
+                raise Exception("This shouldn't be happening, deleted files "
+                                "in local package present in remote: %s.\n Please, report it at "
+                                "https://github.com/conan-io/conan/issues " % str(deleted))
+            self._remove_package(pref)
+        if files_to_upload:
+            self._upload_package(pref, files_to_upload, retry, retry_wait, checksums)
 
     def search(self, pattern=None, ignorecase=True):
         """
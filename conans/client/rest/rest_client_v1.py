@@ -4,7 +4,7 @@ import traceback
 
 from six.moves.urllib.parse import parse_qs, urljoin, urlparse, urlsplit
 
-from conans.client.remote_manager import check_compressed_files
+from conans.client.archive_codecs import filter_archives
 from conans.client.rest.client_routes import ClientV1Router
 from conans.client.rest.rest_client_common import RestCommonMethods, handle_return_deserializer
 from conans.client.rest.uploader_downloader import FileDownloader, FileUploader
@@ -13,7 +13,7 @@ from conans.errors import ConanException, NotFoundException, NoRestV2Available,
 from conans.model.info import ConanInfo
 from conans.model.manifest import FileTreeManifest
 from conans.paths import CONANINFO, CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, \
-    PACKAGE_TGZ_NAME
+    PACKAGE_TGZ_NAME, archive_names
 from conans.util.files import decode_text
 from conans.util.log import logger
 
@@ -117,15 +117,15 @@ class RestV1Methods(RestCommonMethods):
         urls = self.get_json(url, data=data)
         return {filepath: complete_url(self.remote_url, url) for filepath, url in urls.items()}
 
-    def _upload_recipe(self, ref, files_to_upload, retry, retry_wait):
+    def _upload_recipe(self, ref, files_to_upload, retry, retry_wait, checksums=None):
         # Get the upload urls and then upload files
         url = self.router.recipe_upload_urls(ref)
         file_sizes = {filename.replace("\\", "/"): os.stat(abs_path).st_size
                       for filename, abs_path in files_to_upload.items()}
         urls = self._get_file_to_url_dict(url, data=file_sizes)
-        self._upload_files(urls, files_to_upload, self._output, retry, retry_wait)
+        self._upload_files(urls, files_to_upload, self._output, retry, retry_wait, checksums)
 
-    def _upload_package(self, pref, files_to_upload, retry, retry_wait):
+    def _upload_package(self, pref, files_to_upload, retry, retry_wait, checksums=None):
         # Get the upload urls and then upload files
         url = self.router.package_upload_urls(pref)
         file_sizes = {filename: os.stat(abs_path).st_size for filename,
@@ -134,9 +134,9 @@ class RestV1Methods(RestCommonMethods):
         urls = self._get_file_to_url_dict(url, data=file_sizes)
         self._output.rewrite_line("Requesting upload urls...Done!")
         self._output.writeln("")
-        self._upload_files(urls, files_to_upload, self._output, retry, retry_wait)
+        self._upload_files(urls, files_to_upload, self._output, retry, retry_wait, checksums)
 
-    def _upload_files(self, file_urls, files, output, retry, retry_wait):
+    def _upload_files(self, file_urls, files, output, retry, retry_wait, checksums=None):
         t1 = time.time()
         failed = []
         uploader = FileUploader(self.requester, output, self.verify_ssl)
@@ -149,7 +149,8 @@ class RestV1Methods(RestCommonMethods):
             try:
                 uploader.upload(resource_url, files[filename], auth=auth, dedup=dedup,
                                 retry=retry, retry_wait=retry_wait,
-                                headers=self._artifacts_properties)
+                                headers=self._artifacts_properties,
+                                sha1=(checksums or {}).get(filename, {}).get("sha1"))
             except Exception as exc:
                 output.error("\nError uploading file: %s, '%s'" % (filename, exc))
                 failed.append(filename)
@@ -181,17 +182,19 @@ class RestV1Methods(RestCommonMethods):
 
     def get_recipe(self, ref, dest_folder):
         urls = self._get_recipe_urls(ref)
-        urls.pop(EXPORT_SOURCES_TGZ_NAME, None)
-        check_compressed_files(EXPORT_TGZ_NAME, urls)
+        for name in archive_names(EXPORT_SOURCES_TGZ_NAME):
+            urls.pop(name, None)
+        urls = {fn: urls[fn] for fn in filter_archives(EXPORT_TGZ_NAME, urls)}
         zipped_files = self._download_files_to_folder(urls, dest_folder)
         return zipped_files
 
     def get_recipe_sources(self, ref, dest_folder):
         urls = self._get_recipe_urls(ref)
-        check_compressed_files(EXPORT_SOURCES_TGZ_NAME, urls)
-        if EXPORT_SOURCES_TGZ_NAME not in urls:
+        sources_archives = archive_names(EXPORT_SOURCES_TGZ_NAME)
+        urls = {fn: urls[fn] for fn in filter_archives(EXPORT_SOURCES_TGZ_NAME, urls)
+                if fn in sources_archives}
+        if not urls:
             return None
-        urls = {EXPORT_SOURCES_TGZ_NAME: urls[EXPORT_SOURCES_TGZ_NAME]}
         zipped_files = self._download_files_to_folder(urls, dest_folder)
         return zipped_files
 
@@ -204,10 +207,14 @@ class RestV1Methods(RestCommonMethods):
 
     def get_package(self, pref, dest_folder):
         urls = self._get_package_urls(pref)
-        check_compressed_files(PACKAGE_TGZ_NAME, urls)
+        urls = {fn: urls[fn] for fn in filter_archives(PACKAGE_TGZ_NAME, urls)}
         zipped_files = self._download_files_to_folder(urls, dest_folder)
         return zipped_files
 
+    def get_package_extracted(self, pref, dest_folder):
+        # Not implemented for the V1 protocol, the conan_package.tgz will be extracted later
+        return self.get_package(pref, dest_folder), {}
+
     def _get_package_urls(self, pref):
         """Gets a dict of filename:contents from package"""
         url = self.router.package_download_urls(pref)
@@ -263,6 +270,9 @@ class RestV1Methods(RestCommonMethods):
             snapshot = []
         return snapshot
 
+    def _remove_package(self, pref):
+        self.remove_packages(pref.ref, [pref.id])
+
     @handle_return_deserializer()
     def _remove_conanfile_files(self, ref, files):
         self.check_credentials()
@@ -1,8 +1,9 @@
 import os
 import time
 import traceback
+from multiprocessing.pool import ThreadPool
 
-from conans.client.remote_manager import check_compressed_files
+from conans.client.archive_codecs import filter_archives
 from conans.client.rest.client_routes import ClientV2Router
 from conans.client.rest.rest_client_common import RestCommonMethods, get_exception_from_error
 from conans.client.rest.uploader_downloader import FileDownloader, FileUploader
@@ -11,7 +12,9 @@ from conans.errors import ConanException, NotFoundException, PackageNotFoundExce
 from conans.model.info import ConanInfo
 from conans.model.manifest import FileTreeManifest
 from conans.model.ref import PackageReference
-from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME
+from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, \
+    archive_names
+from conans.util import progress_bar
 from conans.util.files import decode_text
 from conans.util.log import logger
 
@@ -19,11 +22,12 @@ from conans.util.log import logger
 class RestV2Methods(RestCommonMethods):
 
     def __init__(self, remote_url, token, custom_headers, output, requester, verify_ssl,
-                 artifacts_properties=None, checksum_deploy=False):
+                 artifacts_properties=None, checksum_deploy=False, parallel_transfers=None):
 
         super(RestV2Methods, self).__init__(remote_url, token, custom_headers, output, requester,
                                             verify_ssl, artifacts_properties)
         self._checksum_deploy = checksum_deploy
+        self._parallel_transfers = parallel_transfers
 
     @property
     def router(self):
@@ -77,10 +81,9 @@ class RestV2Methods(RestCommonMethods):
     def get_recipe(self, ref, dest_folder):
         url = self.router.recipe_snapshot(ref)
         data = self._get_file_list_json(url)
-        files = data["files"]
-        check_compressed_files(EXPORT_TGZ_NAME, files)
-        if EXPORT_SOURCES_TGZ_NAME in files:
-            files.remove(EXPORT_SOURCES_TGZ_NAME)
+        files = filter_archives(EXPORT_TGZ_NAME, data["files"])
+        sources_archives = archive_names(EXPORT_SOURCES_TGZ_NAME)
+        files = [f for f in files if f not in sources_archives]
 
         # If we didn't indicated reference, server got the latest, use absolute now, it's safer
         urls = {fn: self.router.recipe_file(ref, fn) for fn in files}
@@ -94,11 +97,11 @@ class RestV2Methods(RestCommonMethods):
             ref = self.get_latest_recipe_revision(ref)
         url = self.router.recipe_snapshot(ref)
         data = self._get_file_list_json(url)
-        files = data["files"]
-        check_compressed_files(EXPORT_SOURCES_TGZ_NAME, files)
-        if EXPORT_SOURCES_TGZ_NAME not in files:
+        files = filter_archives(EXPORT_SOURCES_TGZ_NAME, data["files"])
+        sources_archives = archive_names(EXPORT_SOURCES_TGZ_NAME)
+        files = [f for f in files if f in sources_archives]
+        if not files:
             return None
-        files = [EXPORT_SOURCES_TGZ_NAME, ]
 
         # If we didn't indicated reference, server got the latest, use absolute now, it's safer
         urls = {fn: self.router.recipe_file(ref, fn) for fn in files}
@@ -109,14 +112,35 @@ class RestV2Methods(RestCommonMethods):
     def get_package(self, pref, dest_folder):
         url = self.router.package_snapshot(pref)
         data = self._get_file_list_json(url)
-        files = data["files"]
-        check_compressed_files(PACKAGE_TGZ_NAME, files)
+        files = filter_archives(PACKAGE_TGZ_NAME, data["files"])
         # If we didn't indicated reference, server got the latest, use absolute now, it's safer
         urls = {fn: self.router.package_file(pref, fn) for fn in files}
         self._download_and_save_files(urls, dest_folder, files)
         ret = {fn: os.path.join(dest_folder, fn) for fn in files}
         return ret
 
+    def get_package_extracted(self, pref, dest_folder):
+        """ as get_package(), but the conan_package archive is extracted while it is downloaded,
+        instead of stored
+        :return: ({filename: path} of the stored files, {filename: checksums} of the extracted)
+        """
+        url = self.router.package_snapshot(pref)
+        data = self._get_file_list_json(url)
+        files = filter_archives(PACKAGE_TGZ_NAME, data["files"])
+        urls = {fn: self.router.package_file(pref, fn) for fn in files}
+        package_archives = archive_names(PACKAGE_TGZ_NAME)
+        stored = [fn for fn in files if fn not in package_archives]
+        self._download_and_save_files(urls, dest_folder, stored)
+        ret = {fn: os.path.join(dest_folder, fn) for fn in stored}
+        checksums = {}
+        for archive in (fn for fn in files if fn in package_archives):
+            if self._output and not self._output.is_terminal:
+                self._output.writeln("Downloading %s" % archive)
+            downloader = FileDownloader(self.requester, self._output, self.verify_ssl)
+            checksums[archive] = downloader.download_extract(urls[archive], dest_folder,
+                                                             auth=self.auth)
+        return ret, checksums
+
     def get_recipe_path(self, ref, path):
         url = self.router.recipe_snapshot(ref)
         files = self._get_file_list_json(url)
@@ -159,58 +183,114 @@ class RestV2Methods(RestCommonMethods):
                     ret.append(tmp)
         return sorted(ret)
 
-    def _upload_recipe(self, ref, files_to_upload, retry, retry_wait):
+    def _upload_recipe(self, ref, files_to_upload, retry, retry_wait, checksums=None):
         # Direct upload the recipe
         urls = {fn: self.router.recipe_file(ref, fn) for fn in files_to_upload}
-        self._upload_files(files_to_upload, urls, retry, retry_wait)
+        self._upload_files(files_to_upload, urls, retry, retry_wait, checksums)
 
-    def _upload_package(self, pref, files_to_upload, retry, retry_wait):
+    def _upload_package(self, pref, files_to_upload, retry, retry_wait, checksums=None):
         urls = {fn: self.router.package_file(pref, fn)
                 for fn in files_to_upload}
-        self._upload_files(files_to_upload, urls, retry, retry_wait)
+        self._upload_files(files_to_upload, urls, retry, retry_wait, checksums)
 
-    def _upload_files(self, files, urls, retry, retry_wait):
+    def _upload_files(self, files, urls, retry, retry_wait, checksums=None):
         t1 = time.time()
         failed = []
-        uploader = FileUploader(self.requester, self._output, self.verify_ssl)
-        # conan_package.tgz and conan_export.tgz are uploaded first to avoid uploading conaninfo.txt
-        # or conanamanifest.txt with missing files due to a network failure
-        for filename in sorted(files):
-            if self._output and not self._output.is_terminal:
-                self._output.rewrite_line("Uploading %s" % filename)
-            resource_url = urls[filename]
+
+        def _upload(filename, output):
+            uploader = FileUploader(self.requester, output, self.verify_ssl)
             try:
-                uploader.upload(resource_url, files[filename], auth=self.auth,
+                uploader.upload(urls[filename], files[filename], auth=self.auth,
                                 dedup=self._checksum_deploy, retry=retry,
                                 retry_wait=retry_wait,
-                                headers=self._artifacts_properties)
+                                headers=dict(self._artifacts_properties or {}),
+                                sha1=(checksums or {}).get(filename, {}).get("sha1"))
             except (AuthenticationException, ForbiddenException):
                 raise
             except Exception as exc:
                 self._output.error("\nError uploading file: %s, '%s'" % (filename, exc))
                 failed.append(filename)
 
+        # conan_package.tgz and conan_export.tgz are uploaded first to avoid uploading conaninfo.txt
+        # or conanamanifest.txt with missing files due to a network failure
+        filenames = sorted(files)
+        archives = (archive_names(EXPORT_TGZ_NAME) + archive_names(EXPORT_SOURCES_TGZ_NAME) +
+                    archive_names(PACKAGE_TGZ_NAME))
+        tgz_files = [f for f in filenames if f in archives]
+        for group in (tgz_files, [f for f in filenames if f not in tgz_files]):
+            self._transfer_files(_upload, group, "Uploading")
+
         if failed:
             raise ConanException("Execute upload again to retry upload the failed files: %s"
-                                 % ", ".join(failed))
+                                 % ", ".join(sorted(failed)))
         else:
             logger.debug("\nUPLOAD: All uploaded! Total time: %s\n" % str(time.time() - t1))
 
     def _download_and_save_files(self, urls, dest_folder, files):
-        downloader = FileDownloader(self.requester, self._output, self.verify_ssl)
+        def _download(filename, output):
+            downloader = FileDownloader(self.requester, output, self.verify_ssl)
+            abs_path = os.path.join(dest_folder, filename)
+            downloader.download(urls[filename], abs_path, auth=self.auth)
+
         # Take advantage of filenames ordering, so that conan_package.tgz and conan_export.tgz
         # can be < conanfile, conaninfo, and sent always the last, so smaller files go first
-        for filename in sorted(files, reverse=True):
-            if self._output and not self._output.is_terminal:
-                self._output.writeln("Downloading %s" % filename)
-            resource_url = urls[filename]
-            abs_path = os.path.join(dest_folder, filename)
-            downloader.download(resource_url, abs_path, auth=self.auth)
+        self._transfer_files(_download, sorted(files, reverse=True), "Downloading")
+
+    def _transfer_files(self, transfer, filenames, action):
+        """ calls transfer(filename, output) for every file, one after another, or concurrently
+        with at most 'parallel_transfers' threads, sharing the connection pool of the requester.
+        The concurrent transfers don't print their own progress, but the number of transferred
+        files of the recipe or package. The first error is raised once all of them have finished
+        """
+        if not self._parallel_transfers or len(filenames) < 2:
+            for filename in filenames:
+                if self._output and not self._output.is_terminal:
+                    self._output.writeln("%s %s" % (action, filename))
+                transfer(filename, self._output)
+            return
+
+        def _transfer(filename):
+            try:
+                transfer(filename, None)
+            except BaseException as exc:
+                return exc
+
+        description = "%s %s" % (action, ", ".join(filenames))
+        if self._output and not self._output.is_terminal:
+            self._output.writeln(description)
+        thread_pool = ThreadPool(min(self._parallel_transfers, len(filenames)))
+        try:
+            with progress_bar.iterate_list_with_progress(filenames, self._output,
+                                                         description) as progress:
+                errors = []
+                for error in thread_pool.imap_unordered(_transfer, filenames):
+                    progress.update()
+                    if error is not None:
+                        errors.append(error)
+        finally:
+            thread_pool.close()
+            thread_pool.join()
+        if errors:
+            raise errors[0]
 
     def _remove_conanfile_files(self, ref, files):
         # V2 === revisions, do not remove files, it will create a new revision if the files changed
         return
 
+    def _remove_package(self, pref):
+        """ removes just the package revision, not all the ones of the package
+        """
+        self.check_credentials()
+        url = self.router.remove_package(pref)
+        response = self.requester.delete(url, auth=self.auth, headers=self.custom_headers,
+                                         verify=self.verify_ssl)
+        if response.status_code == 404:
+            raise PackageNotFoundException(pref)
+        if response.status_code != 200:  # Error message is text
+            # To be able to access ret.text (ret.content are bytes)
+            response.charset = "utf-8"
+            raise get_exception_from_error(response.status_code)(response.text)
+
     def remove_packages(self, ref, package_ids=None):
         """ Remove any packages specified by package_ids"""
         self.check_credentials()
@@ -2,14 +2,23 @@ import os
 import traceback
 import time
 
+from six.moves.urllib.parse import urlsplit
+
 from conans.util import progress_bar
 from conans.client.rest import response_to_str
 from conans.errors import AuthenticationException, ConanConnectionError, ConanException, \
     NotFoundException, ForbiddenException, RequestErrorException
-from conans.util.files import mkdir, save_append, sha1sum, to_file_bytes
+from conans.util.files import CHECKSUMS_BUFFER_SIZE, MultiHasher, mkdir, rmdir, save_append, \
+    sha1sum, tar_extract, to_file_bytes
 from conans.util.log import logger
 from conans.util.tracer import log_download
 
+PART_SUFFIX = ".part"
+
+
+class _RangeNotSatisfiable(ConanException):
+    pass
+
 
 class FileUploader(object):
 
@@ -20,7 +29,9 @@ class FileUploader(object):
         self.verify = verify
 
     def upload(self, url, abs_path, auth=None, dedup=False, retry=None, retry_wait=None,
-               headers=None):
+               headers=None, sha1=None):
+        """ sha1: the checksum of the file, if already known, it is computed otherwise
+        """
         retry = retry if retry is not None else self.requester.retry
         retry = retry if retry is not None else 1
         retry_wait = retry_wait if retry_wait is not None else self.requester.retry_wait
@@ -28,7 +39,7 @@ class FileUploader(object):
 
         # Send always the header with the Sha1
         headers = headers or {}
-        headers["X-Checksum-Sha1"] = sha1sum(abs_path)
+        headers["X-Checksum-Sha1"] = sha1 or sha1sum(abs_path)
         if dedup:
             dedup_headers = {"X-Checksum-Deploy": "true"}
             if headers:
@@ -139,11 +150,39 @@ class FileDownloader(object):
                 # the dest folder before
                 raise ConanException("Error, the file to download already exists: '%s'" % file_path)
 
-        return call_with_retry(self.output, retry, retry_wait, self._download_file, url, auth,
-                               headers, file_path)
+        # The file is downloaded to a .part file, so a retry can resume it from where the previous
+        # attempt was interrupted
+        part_path = file_path + PART_SUFFIX if file_path else None
+        if part_path and os.path.exists(part_path):
+            os.remove(part_path)
+        try:
+            return call_with_retry(self.output, retry, retry_wait, self._download_file, url, auth,
+                                   headers, file_path)
+        finally:
+            if part_path and os.path.exists(part_path):
+                os.remove(part_path)
+
+    def download_extract(self, url, dest_folder, auth=None, retry=None, retry_wait=None,
+                         headers=None):
+        """ downloads a tgz file and extracts it into dest_folder while it is being received,
+        without storing it
+        :return: dict with the md5 and sha1 checksums of the downloaded file
+        """
+        retry = retry if retry is not None else self.requester.retry
+        retry = retry if retry is not None else 2
+        retry_wait = retry_wait if retry_wait is not None else self.requester.retry_wait
+        retry_wait = retry_wait if retry_wait is not None else 0
 
-    def _download_file(self, url, auth, headers, file_path):
-        t1 = time.time()
+        existing = set(os.listdir(dest_folder)) if os.path.isdir(dest_folder) else set()
+        return call_with_retry(self.output, retry, retry_wait, self._download_extract, url, auth,
+                               headers, dest_folder, existing)
+
+    def _get_response(self, url, auth, headers, resume_from=0):
+        if resume_from:
+            # The offset is in the stored file, the server shouldn't encode the content
+            headers = dict(headers or {})
+            headers["Range"] = "bytes=%d-" % resume_from
+            headers["Accept-Encoding"] = "identity"
         try:
             response = self.requester.get(url, stream=True, verify=self.verify, auth=auth,
                                           headers=headers)
@@ -159,10 +198,89 @@ class FileDownloader(object):
                 raise ForbiddenException(response_to_str(response))
             elif response.status_code == 401:
                 raise AuthenticationException()
+            elif response.status_code == 416 and resume_from:
+                raise _RangeNotSatisfiable("Cannot resume the download of %s" % url)
             raise ConanException("Error %d downloading file %s" % (response.status_code, url))
+        return response
+
+    def _download_extract(self, url, auth, headers, dest_folder, existing):
+        # Remove whatever a previous failed attempt extracted, keeping the other downloaded files
+        if os.path.isdir(dest_folder):
+            for name in os.listdir(dest_folder):
+                if name not in existing:
+                    path = os.path.join(dest_folder, name)
+                    if os.path.isdir(path) and not os.path.islink(path):
+                        rmdir(path)
+                    else:
+                        os.remove(path)
+
+        t1 = time.time()
+        response = self._get_response(url, auth, headers)
+        checksums = MultiHasher(("md5", "sha1"))
+        downloaded_size = [0]
 
         def read_response(size):
             for chunk in response.iter_content(size):
+                checksums.update(chunk)
+                downloaded_size[0] += len(chunk)
+                yield chunk
+
+        try:
+            logger.debug("DOWNLOAD: %s" % url)
+            total_length = int(response.headers.get('content-length') or len(response.content))
+            file_name = os.path.basename(urlsplit(url).path)
+            progress = progress_bar.Progress(total_length, self.output,
+                                             "Downloading {}".format(file_name), print_dot=False)
+            chunk_size = 1024 * 100
+            chunks = IterableToFileAdapter(progress.update(read_response(chunk_size), chunk_size),
+                                           total_length)
+            tar_extract(chunks, dest_folder, stream=True)
+            for _ in chunks:  # The archive can be followed by padding, also part of the checksums
+                pass
+            response.close()
+
+            gzip = (response.headers.get('content-encoding') == "gzip")
+            if downloaded_size[0] != total_length and not gzip:
+                raise ConanException("Transfer interrupted before "
+                                     "complete: %s < %s" % (downloaded_size[0], total_length))
+        except Exception as e:
+            logger.debug(e.__class__)
+            logger.debug(traceback.format_exc())
+            raise ConanConnectionError("Error while downloading/extracting files to %s\n%s"
+                                       % (dest_folder, str(e)))
+
+        duration = time.time() - t1
+        log_download(url, duration)
+        return checksums.hexdigests()
+
+    def _download_file(self, url, auth, headers, file_path):
+        t1 = time.time()
+        part_path = file_path + PART_SUFFIX if file_path else None
+        resume_from = os.path.getsize(part_path) if part_path and os.path.exists(part_path) else 0
+        try:
+            response = self._get_response(url, auth, headers, resume_from)
+        except _RangeNotSatisfiable:
+            # The partial file cannot be completed, next attempt will download it from the start
+            os.remove(part_path)
+            raise
+        if resume_from and response.status_code != 206:  # The server ignored the range
+            resume_from = 0
+        if resume_from and self.output:
+            self.output.info("Resuming download of %s from byte %d"
+                             % (os.path.basename(file_path), resume_from))
+
+        # The server can provide the checksum of the whole file, to verify the downloaded one
+        expected_sha1 = response.headers.get("X-Checksum-Sha1")
+        checksum = MultiHasher(("sha1", )) if expected_sha1 else None
+        if checksum and resume_from:
+            with open(part_path, "rb") as part_file:
+                for chunk in iter(lambda: part_file.read(CHECKSUMS_BUFFER_SIZE), b""):
+                    checksum.update(chunk)
+
+        def read_response(size):
+            for chunk in response.iter_content(size):
+                if checksum:
+                    checksum.update(chunk)
                 yield chunk
 
         def write_chunks(chunks, path):
@@ -170,7 +288,7 @@ class FileDownloader(object):
             downloaded_size = 0
             if path:
                 mkdir(os.path.dirname(path))
-                with open(path, 'wb') as file_handler:
+                with open(path, 'ab' if resume_from else 'wb') as file_handler:
                     for chunk in chunks:
                         file_handler.write(to_file_bytes(chunk))
                         downloaded_size += len(chunk)
@@ -195,7 +313,7 @@ class FileDownloader(object):
 
             written_chunks, total_downloaded_size = write_chunks(
                 progress.update(read_response(chunk_size), chunk_size),
-                file_path
+                part_path
             )
 
             response.close()
@@ -203,6 +321,17 @@ class FileDownloader(object):
                 raise ConanException("Transfer interrupted before "
                                      "complete: %s < %s" % (total_downloaded_size, total_length))
 
+            if checksum and checksum.hexdigests()["sha1"] != expected_sha1:
+                if part_path:
+                    os.remove(part_path)
+                raise ConanException("Checksum verification failed for %s: expected %s, got %s"
+                                     % (url, expected_sha1, checksum.hexdigests()["sha1"]))
+
+            if part_path:
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                os.rename(part_path, file_path)
+
             duration = time.time() - t1
             log_download(url, duration)
             return written_chunks
@@ -12,7 +12,7 @@ from conans.client.output import ConanOutput
 from conans.errors import ConanException
 from conans.unicode import get_cwd
 from conans.util.fallbacks import default_output
-from conans.util.files import (_generic_algorithm_sum, load, save)
+from conans.util.files import file_checksums, load, save
 
 UNIT_SIZE = 1000.0
 # Library extensions supported by collect_libs
@@ -149,14 +149,22 @@ def untargz(filename, destination=".", pattern=None):
 
 
 def check_with_algorithm_sum(algorithm_name, file_path, signature):
-    real_signature = _generic_algorithm_sum(file_path, algorithm_name)
-    if real_signature != signature.lower():
-        raise ConanException("%s signature failed for '%s' file. \n"
-                             " Provided signature: %s  \n"
-                             " Computed signature: %s" % (algorithm_name,
-                                                          os.path.basename(file_path),
-                                                          signature,
-                                                          real_signature))
+    _check_signatures(file_path, [(algorithm_name, signature)])
+
+
+def _check_signatures(file_path, signatures):
+    """ checks the [(algorithm_name, signature)] of the file, reading it just once
+    """
+    real_signatures = file_checksums(file_path, [name for name, _ in signatures])
+    for algorithm_name, signature in signatures:
+        real_signature = real_signatures[algorithm_name]
+        if real_signature != signature.lower():
+            raise ConanException("%s signature failed for '%s' file. \n"
+                                 " Provided signature: %s  \n"
+                                 " Computed signature: %s" % (algorithm_name,
+                                                              os.path.basename(file_path),
+                                                              signature,
+                                                              real_signature))
 
 
 def check_sha1(file_path, signature):
@@ -1,7 +1,7 @@
 import os
 
 from conans.client.rest.uploader_downloader import FileDownloader
-from conans.client.tools.files import check_md5, check_sha1, check_sha256, unzip
+from conans.client.tools.files import _check_signatures, unzip
 from conans.errors import ConanException
 from conans.util.fallbacks import default_output, default_requester
 
@@ -18,12 +18,10 @@ def get(url, md5='', sha1='', sha256='', destination=".", filename="", keep_perm
     download(url, filename, out=output, requester=requester, verify=verify, retry=retry,
              retry_wait=retry_wait, overwrite=overwrite, auth=auth, headers=headers)
 
-    if md5:
-        check_md5(filename, md5)
-    if sha1:
-        check_sha1(filename, sha1)
-    if sha256:
-        check_sha256(filename, sha256)
+    signatures = [(name, signature) for name, signature in (("md5", md5), ("sha1", sha1),
+                                                                ("sha256", sha256)) if signature]
+    if signatures:
+        _check_signatures(filename, signatures)
 
     unzip(filename, destination=destination, keep_permissions=keep_permissions, pattern=pattern,
           output=output)
@@ -1,4 +1,5 @@
 import argparse
+import sys
 
 from conans.server.launcher import ServerLauncher
 
@@ -7,9 +8,22 @@ def run():
     parser = argparse.ArgumentParser(description='Launch the server')
     parser.add_argument('--migrate', default=False, action='store_true',
                         help='Run the pending migrations')
+    parser.add_argument('--rebuild-search-index', default=False, action='store_true',
+                        help='Rebuild the index of the packages of the storage used by the '
+                             'searches, and exit')
+    parser.add_argument('--scrub', default=False, action='store_true',
+                        help='Verify the stored files against the checksums computed when they '
+                             'were uploaded, remove the stored blobs not used anymore, and exit. '
+                             'It fails if any file is corrupted')
     args = parser.parse_args()
     launcher = ServerLauncher(force_migration=args.migrate)
-    launcher.launch()
+    if args.rebuild_search_index:
+        launcher.rebuild_search_index()
+    elif args.scrub:
+        if launcher.scrub():
+            sys.exit(1)
+    else:
+        launcher.launch()
 
 
 if __name__ == '__main__':
@@ -137,6 +137,14 @@ class GraphLock(object):
                                            requires, node.path)
                 self._nodes[node.id] = graph_node
 
+    @property
+    def initial_counter(self):
+        """ The first node ID for the new nodes of a graph using this lock, so they do not
+        collide with the locked ones
+        """
+        ids = [int(id_) for id_ in self._nodes if id_.isdigit()]
+        return max(ids) + 1 if ids else 0
+
     def root_node_ref(self):
         """ obtain the node in the graph that is not depended by anyone else,
         i.e. the root or downstream consumer
@@ -2,11 +2,13 @@ import calendar
 import datetime
 import os
 import time
+from multiprocessing.pool import ThreadPool
 
 from conans.errors import ConanException
-from conans.paths import CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME
+from conans.paths import CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, \
+    PACKAGE_TGZ_NAME, archive_names
 from conans.util.env_reader import get_env
-from conans.util.files import load, md5, md5sum, save, walk
+from conans.util.files import load, md5, md5sum, save, stat_key, walk
 
 
 def discarded_file(filename):
@@ -48,6 +50,74 @@ def gather_files(folder):
     return file_dict, symlinks
 
 
+RACY_SECONDS = 2
+# The files are hashed concurrently only if they are bigger than this, starting the threads
+# costs more than hashing a few small files
+CONCURRENT_MD5_SIZE = 8 * 1024 * 1024
+
+
+def _md5sums(paths):
+    """ md5 of the files, hashed concurrently if they are big, as hashlib releases the GIL
+    """
+    if len(paths) < 2 or sum(os.path.getsize(p) for p in paths) < CONCURRENT_MD5_SIZE:
+        return [md5sum(path) for path in paths]
+    from conans.client.tools.oss import cpu_count  # Not at module level, import cycle
+    workers = min(cpu_count(), len(paths))
+    if workers < 2:
+        return [md5sum(path) for path in paths]
+    thread_pool = ThreadPool(workers)
+    try:
+        return thread_pool.map(md5sum, paths)
+    finally:
+        thread_pool.close()
+        thread_pool.join()
+
+
+def _cached_md5sums(files, digest_cache, folder, origin_names):
+    """ {name: md5} of the {name: path} files, hashing just the ones without an entry in the
+    digest_cache for the folder that matches their (path, size, mtime_ns, inode). With
+    origin_names {name: relative path in folder}, the entry of a file copied from the folder
+    is the one of its origin, while the copy has the same size and mtime
+    """
+    entries = digest_cache.load(folder)
+    new_entries = {}
+    result = {}
+    missing = {}
+    for name, path in files.items():
+        key_path = path
+        key = stat_key(path)
+        if origin_names is not None:
+            key_path = os.path.join(folder, origin_names[name])
+            try:
+                origin_key = stat_key(key_path)
+            except OSError:
+                origin_key = None
+            if origin_key is None or origin_key[:2] != key[:2]:
+                missing[name] = (path, None, None)  # Not a copy, or modified after copied
+                continue
+            key = origin_key
+        entry = entries.get(key_path)
+        if entry and entry[:3] == key:
+            result[name] = entry[3]
+            new_entries[key_path] = entry
+        else:
+            missing[name] = (path, key_path, key)
+
+    # A file modified right after being hashed could keep the same mtime, if the filesystem
+    # has a coarse resolution. Recently modified files are not stored, as git does
+    racy_mtime_ns = int((time.time() - RACY_SECONDS) * 1000000000)
+    names = list(missing)
+    for name, md5 in zip(names, _md5sums([missing[name][0] for name in names])):
+        result[name] = md5
+        _, key_path, key = missing[name]
+        if key_path is not None and key[1] < racy_mtime_ns:
+            new_entries[key_path] = key + [md5]
+
+    if new_entries != entries:
+        digest_cache.save(folder, new_entries)
+    return result
+
+
 class FileTreeManifest(object):
 
     def __init__(self, the_time, file_sums):
@@ -110,22 +180,33 @@ class FileTreeManifest(object):
         save(path, repr(self))
 
     @classmethod
-    def create(cls, folder, exports_sources_folder=None):
+    def create(cls, folder, exports_sources_folder=None, digest_cache=None, origin_folder=None):
         """ Walks a folder and create a FileTreeManifest for it, reading file contents
         from disk, and capturing current time
+        :param digest_cache: DigestCache with the md5 of the files of previous manifests, not to
+        hash again the ones that didn't change
+        :param origin_folder: the folder the files were copied from, preserving their mtime,
+        as the exported ones. The md5 of a copy is cached as the one of its origin file
         """
         files, _ = gather_files(folder)
-        for f in (PACKAGE_TGZ_NAME, EXPORT_TGZ_NAME, CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME):
+        for f in [CONAN_MANIFEST]:
             files.pop(f, None)
+        for tgz_name in (PACKAGE_TGZ_NAME, EXPORT_TGZ_NAME, EXPORT_SOURCES_TGZ_NAME):
+            for f in archive_names(tgz_name):
+                files.pop(f, None)
 
-        file_dict = {}
-        for name, filepath in files.items():
-            file_dict[name] = md5sum(filepath)
-
+        origin_names = {name: name for name in files}
         if exports_sources_folder:
             export_files, _ = gather_files(exports_sources_folder)
             for name, filepath in export_files.items():
-                file_dict["export_source/%s" % name] = md5sum(filepath)
+                files["export_source/%s" % name] = filepath
+                origin_names["export_source/%s" % name] = name
+
+        if digest_cache is None:
+            file_dict = dict(zip(files, _md5sums(list(files.values()))))
+        else:
+            file_dict = _cached_md5sums(files, digest_cache, origin_folder or folder,
+                                        origin_names if origin_folder else None)
 
         date = calendar.timegm(time.gmtime())
 
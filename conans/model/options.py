@@ -56,9 +56,14 @@ class PackageOptionValues(object):
     These are non-validating, not constrained.
     Used for UserOptions, which is a dict{package_name: PackageOptionValues}
     """
+    # The options of every node of a graph have one for every upstream package, slots and the
+    # lazy _modified dict reduce the memory of big graphs
+    __slots__ = ("_dict", "_modified", "_freeze")
+
     def __init__(self):
         self._dict = {}  # {option_name: PackageOptionValue}
-        self._modified = {}
+        self._modified = None  # {option_name: (value, down_ref)}, created when first modified
+        self._freeze = False
 
     def __bool__(self):
         return bool(self._dict)
@@ -135,6 +140,8 @@ class PackageOptionValues(object):
                                      "but it was already defined as %s"
                                      % (down_ref, own_ref, name, value, self._dict.get(name)))
 
+            if self._modified is None:
+                self._modified = {}
             modified = self._modified.get(name)
             if modified is not None:
                 modified_value, modified_ref = modified
@@ -51,6 +51,8 @@ DEFAULT_PROFILE_NAME = "default"
 PACKAGE_METADATA = "metadata.json"
 CACERT_FILE = "cacert.pem"  # Server authorities file
 DATA_YML = "conandata.yml"
+# The extensions of the archives of the codecs in conans.client.archive_codecs
+ARCHIVE_EXTENSIONS = [".tgz", ".txz"]
 
 # Directories
 EXPORT_FOLDER = "export"
@@ -60,3 +62,10 @@ BUILD_FOLDER = "build"
 PACKAGES_FOLDER = "package"
 SYSTEM_REQS_FOLDER = "system_reqs"
 SCM_SRC_FOLDER = "scm_source"
+
+
+def archive_names(tgz_name):
+    """ the names of the archive for all the codecs, also the not available ones, i.e.
+    conan_package.tgz and conan_package.txz for conan_package.tgz
+    """
+    return [os.path.splitext(tgz_name)[0] + extension for extension in ARCHIVE_EXTENSIONS]
@@ -48,6 +48,12 @@ class ConanServerConfigParser(ConfigParser):
                            "port": get_env("CONAN_SERVER_PORT", None, environment),
                            "public_port": get_env("CONAN_SERVER_PUBLIC_PORT", None, environment),
                            "host_name": get_env("CONAN_HOST_NAME", None, environment),
+                           "workers": get_env("CONAN_SERVER_WORKERS", None, environment),
+                           "threads": get_env("CONAN_SERVER_THREADS", None, environment),
+                           "keep_alive_timeout": get_env("CONAN_SERVER_KEEP_ALIVE_TIMEOUT", None,
+                                                         environment),
+                           "request_timeout": get_env("CONAN_SERVER_REQUEST_TIMEOUT", None,
+                                                      environment),
                            "custom_authenticator": get_env("CONAN_CUSTOM_AUTHENTICATOR", None, environment),
                            # "user:pass,user2:pass2"
                            "users": get_env("CONAN_SERVER_USERS", None, environment)}
@@ -103,6 +109,24 @@ class ConanServerConfigParser(ConfigParser):
         except ConanException:
             return self.port
 
+    @property
+    def workers(self):
+        return self._get_conf_server_int("workers", 1)
+
+    @property
+    def threads(self):
+        """ 0 serves the requests one by one, as the servers configured before it existed
+        """
+        return self._get_conf_server_int("threads", 0)
+
+    @property
+    def keep_alive_timeout(self):
+        return self._get_conf_server_int("keep_alive_timeout", 5)
+
+    @property
+    def request_timeout(self):
+        return self._get_conf_server_int("request_timeout", 60)
+
     @property
     def host_name(self):
         try:
@@ -211,6 +235,17 @@ class ConanServerConfigParser(ConfigParser):
             raise ConanException("no value for 'server.%s' is defined in the config file" % keyname)
         return value
 
+    def _get_conf_server_int(self, keyname, default):
+        try:
+            value = self._get_conf_server_string(keyname)
+        except ConanException:  # Not defined
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise ConanException("Invalid value for 'server.%s', it has to be an integer: %s"
+                                 % (keyname, value))
+
     @property
     def authorize_timeout(self):
         return timedelta(seconds=int(self._get_conf_server_string("authorize_timeout")))
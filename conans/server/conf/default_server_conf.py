@@ -11,6 +11,15 @@ port: 9300
 public_port:
 host_name: localhost
 
+# Requests served concurrently by every worker process. If 0, they are served one by one.
+# More than 1 worker process is not available in Windows
+threads: 16
+workers: 1
+# Seconds an idle connection is kept open for the next request of the client (0 closes them),
+# and seconds a request can wait for the client to send or receive any data
+keep_alive_timeout: 5
+request_timeout: 60
+
 # Authorize timeout are seconds the client has to upload/download files until authorization expires
 authorize_timeout: 1800
 
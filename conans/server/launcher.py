@@ -35,24 +35,46 @@ class ServerLauncher(object):
         updown_auth_manager = JWTUpDownAuthManager(server_config.updown_secret,
                                                    server_config.authorize_timeout)
 
-        server_store = get_server_store(server_config.disk_storage_path,
-                                        server_config.public_url,
-                                        updown_auth_manager=updown_auth_manager)
+        self.server_store = get_server_store(server_config.disk_storage_path,
+                                             server_config.public_url,
+                                             updown_auth_manager=updown_auth_manager)
 
         server_capabilities = SERVER_CAPABILITIES
         server_capabilities.append(REVISIONS)
 
         self.server = ConanServer(server_config.port, credentials_manager, updown_auth_manager,
-                                  authorizer, authenticator, server_store,
+                                  authorizer, authenticator, self.server_store,
                                   server_capabilities)
+        self.server_config = server_config
         if not self.force_migration:
             print("***********************")
             print("Using config: %s" % server_config.config_filename)
             print("Storage: %s" % server_config.disk_storage_path)
             print("Public URL: %s" % server_config.public_url)
             print("PORT: %s" % server_config.port)
+            if server_config.threads:
+                print("Workers: %s, threads: %s" % (server_config.workers,
+                                                    server_config.threads))
             print("***********************")
 
+    def rebuild_search_index(self):
+        print("Rebuilding the search index of %s" % self.server_store.store)
+        self.server_store.rebuild_search_index()
+
+    def scrub(self):
+        """ verifies the stored files against their checksums, returns the corrupted ones
+        """
+        print("Verifying the files of %s" % self.server_store.store)
+        corrupted = self.server_store.scrub()
+        for path in corrupted:
+            print("Corrupted file: %s" % path)
+        print("%d corrupted files" % len(corrupted))
+        return corrupted
+
     def launch(self):
         if not self.force_migration:
-            self.server.run(host="0.0.0.0")
+            self.server.run(host="0.0.0.0",
+                            threads=self.server_config.threads,
+                            workers=self.server_config.workers,
+                            keep_alive_timeout=self.server_config.keep_alive_timeout,
+                            request_timeout=self.server_config.request_timeout)
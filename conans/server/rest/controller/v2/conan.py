@@ -1,6 +1,5 @@
-from bottle import request
+from bottle import request, response
 
-from conans.errors import NotFoundException
 from conans.model.ref import ConanFileReference
 from conans.server.rest.bottle_routes import BottleRoutes
 from conans.server.rest.controller.v2 import get_package_ref
@@ -34,11 +33,12 @@ class ConanControllerV2(object):
         @app.route(r.package_revision_file, method=["PUT"])
         def upload_package_file(name, version, username, channel, package_id,
                                 the_path, auth_user, revision, p_revision):
-
-            if "X-Checksum-Deploy" in request.headers:
-                raise NotFoundException("Non checksum storage")
             pref = get_package_ref(name, version, username, channel, package_id,
                                    revision, p_revision)
+            if "X-Checksum-Deploy" in request.headers:
+                conan_service.deploy_package_file(request.headers, pref, the_path, auth_user)
+                response.status = 201
+                return
             conan_service.upload_package_file(request.body, request.headers, pref,
                                               the_path, auth_user)
 
@@ -56,8 +56,10 @@ class ConanControllerV2(object):
 
         @app.route(r.recipe_revision_file, method=["PUT"])
         def upload_recipe_file(name, version, username, channel, the_path, auth_user, revision):
-            if "X-Checksum-Deploy" in request.headers:
-                raise NotFoundException("Not a checksum storage")
             ref = ConanFileReference(name, version, username, channel, revision)
+            if "X-Checksum-Deploy" in request.headers:
+                conan_service.deploy_recipe_file(request.headers, ref, the_path, auth_user)
+                response.status = 201
+                return
             conan_service.upload_recipe_file(request.body, request.headers, ref, the_path, auth_user)
 
@@ -2,6 +2,7 @@ import bottle
 
 from conans.server.rest.api_v1 import ApiV1
 from conans.server.rest.api_v2 import ApiV2
+from conans.server.rest.wsgi_server import ConanWSGIServer
 
 
 class ConanServer(object):
@@ -42,5 +43,14 @@ class ConanServer(object):
         port = kwargs.pop("port", self.run_port)
         debug_set = kwargs.pop("debug", False)
         host = kwargs.pop("host", "localhost")
-        bottle.Bottle.run(self.root_app, host=host,
-                          port=port, debug=debug_set, reloader=False)
+        quiet = kwargs.pop("quiet", False)
+        # Without threads, the requests are served one by one by the default bottle server
+        threads = kwargs.pop("threads", None)
+        server = "wsgiref"
+        if threads:
+            server = ConanWSGIServer(host=host, port=port, threads=threads,
+                                     workers=kwargs.pop("workers", 1),
+                                     keep_alive_timeout=kwargs.pop("keep_alive_timeout", 5),
+                                     request_timeout=kwargs.pop("request_timeout", 60))
+        bottle.Bottle.run(self.root_app, server=server, host=host,
+                          port=port, debug=debug_set, reloader=False, quiet=quiet)
@@ -0,0 +1,255 @@
+import os
+import signal
+import socket
+import sys
+import threading
+from wsgiref.handlers import SimpleHandler
+from wsgiref.simple_server import ServerHandler, WSGIRequestHandler, WSGIServer
+
+import bottle
+from six.moves import queue
+
+from conans.errors import ConanException
+from conans.util.log import logger
+
+# Unread request bodies up to this size are skipped to reuse the connection, it is closed
+# otherwise
+_MAX_SKIPPED_BODY = 64 * 1024
+
+
+class ConanWSGIServer(bottle.ServerAdapter):
+    """ Production server for the conan_server, instead of the bottle default (wsgiref), that
+    serves one request at a time. Every process serves 'threads' requests concurrently, with
+    HTTP/1.1 keep-alive connections. With 'workers' > 1, that many processes are pre-forked
+    (POSIX only), all of them accepting the connections of the same listening socket
+    """
+
+    def __init__(self, host, port, threads, workers=1, keep_alive_timeout=5,
+                 request_timeout=60, **options):
+        super(ConanWSGIServer, self).__init__(host=host, port=port, **options)
+        if threads < 1 or workers < 1:
+            raise ConanException("The server needs at least 1 worker and 1 thread")
+        if workers > 1 and not hasattr(os, "fork"):
+            raise ConanException("Multiple server workers are not available in this platform")
+        self.threads = threads
+        self.workers = workers
+        self.keep_alive_timeout = keep_alive_timeout
+        self.request_timeout = request_timeout
+
+    def run(self, handler):
+        server = _ThreadPoolWSGIServer((self.host, self.port), _RequestHandler, self.threads)
+        server.keep_alive_timeout = self.keep_alive_timeout
+        server.request_timeout = self.request_timeout or None
+        server.quiet = self.quiet
+        server.set_app(handler)
+        try:
+            if self.workers > 1:
+                _run_workers(server, self.workers)
+            else:
+                server.serve_forever()
+        finally:
+            server.server_close()
+
+
+class _ThreadPoolWSGIServer(WSGIServer):
+    """ the accepted connections are served by a fixed pool of threads, started when serving,
+    after the workers are forked
+    """
+    request_queue_size = 128  # listen() backlog
+
+    def __init__(self, server_address, handler_class, threads):
+        WSGIServer.__init__(self, server_address, handler_class)
+        self._threads = threads
+        self._connections = queue.Queue()
+
+    def serve_forever(self, *args, **kwargs):
+        for _ in range(self._threads):
+            thread = threading.Thread(target=self._serve_connections)
+            thread.daemon = True
+            thread.start()
+        WSGIServer.serve_forever(self, *args, **kwargs)
+
+    def process_request(self, request, client_address):
+        self._connections.put((request, client_address))
+
+    def _serve_connections(self):
+        while True:
+            request, client_address = self._connections.get()
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+
+class _RequestHandler(WSGIRequestHandler):
+    """ serves the requests of a connection while the client keeps it alive
+    """
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        self.timeout = self.server.request_timeout
+        WSGIRequestHandler.setup(self)
+
+    def handle(self):
+        self._handle_request()
+        while not self.close_connection:
+            self.connection.settimeout(self.server.keep_alive_timeout)
+            self._handle_request()
+
+    def _handle_request(self):
+        self.close_connection = True
+        try:
+            self.raw_requestline = self.rfile.readline(65537)
+        except socket.timeout:  # Idle connection
+            return
+        if not self.raw_requestline:
+            return
+        if len(self.raw_requestline) > 65536:
+            self.requestline = ""
+            self.request_version = ""
+            self.command = ""
+            self.send_error(414)
+            return
+        self.connection.settimeout(self.server.request_timeout)
+        if not self.parse_request():
+            return
+
+        keep_alive = (not self.close_connection and self.server.keep_alive_timeout > 0 and
+                      self.request_version == "HTTP/1.1")
+        environ = self.get_environ()
+        try:
+            content_length = int(environ.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            content_length = 0
+            keep_alive = False
+        if "HTTP_TRANSFER_ENCODING" in environ:  # The body size is unknown
+            keep_alive = False
+        body = _RequestBody(self.rfile, content_length)
+        handler = _ServerHandler(body, self.wfile, self.get_stderr(), environ)
+        handler.request_handler = self
+        handler.keep_alive = keep_alive
+        if keep_alive:
+            handler.http_version = "1.1"
+        try:
+            handler.run(self.server.get_app())
+        except socket.error:  # The client is gone
+            return
+        self.close_connection = not handler.keep_alive or not body.skip(_MAX_SKIPPED_BODY)
+
+    def log_message(self, *args):
+        if not self.server.quiet:
+            WSGIRequestHandler.log_message(self, *args)
+
+
+class _ServerHandler(ServerHandler):
+
+    def cleanup_headers(self):
+        ServerHandler.cleanup_headers(self)
+        # Without the size of the response, the client reads it until the connection is closed
+        if not self.keep_alive or "Content-Length" not in self.headers:
+            self.keep_alive = False
+            self.headers["Connection"] = "close"
+
+    def handle_error(self):
+        self.keep_alive = False  # The response might be incomplete
+        # The client is gone, or the response was already finished, the error can't be sent
+        if self.environ is None or isinstance(sys.exc_info()[1], socket.error):
+            self.close()
+        else:
+            ServerHandler.handle_error(self)
+
+    def close(self):
+        if self.status is None:  # Failed before responding, there is nothing to log
+            SimpleHandler.close(self)
+        else:
+            ServerHandler.close(self)
+
+
+class _RequestBody(object):
+    """ wsgi.input limited to the body of the request, so the application can't read the next
+    request of the connection, and what it doesn't read can be skipped
+    """
+
+    def __init__(self, rfile, length):
+        self._rfile = rfile
+        self._remaining = length
+
+    def _size(self, size):
+        if size is None or size < 0 or size > self._remaining:
+            return self._remaining
+        return size
+
+    def read(self, size=-1):
+        data = self._rfile.read(self._size(size))
+        self._remaining -= len(data)
+        return data
+
+    def readline(self, size=-1):
+        data = self._rfile.readline(self._size(size))
+        self._remaining -= len(data)
+        return data
+
+    def readlines(self, hint=-1):
+        return list(iter(self.readline, b""))
+
+    def __iter__(self):
+        return iter(self.readline, b"")
+
+    def skip(self, max_size):
+        """ reads the rest of the body, returns False if it is bigger than max_size
+        """
+        if self._remaining > max_size:
+            return False
+        try:
+            while self._remaining:
+                if not self.read(self._remaining):
+                    return False
+        except (IOError, OSError):
+            return False
+        return True
+
+
+def _run_workers(server, workers):
+    """ forks the processes that serve the requests, the parent process just starts them again
+    if they die, and stops them when it is stopped
+    """
+    children = set(_fork_worker(server) for _ in range(workers))
+
+    def stop(*_):
+        raise SystemExit(0)
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        while True:
+            pid, status = os.wait()
+            if pid in children:
+                children.remove(pid)
+                logger.error("Server worker %d finished (status %d), starting a new one"
+                             % (pid, status))
+                children.add(_fork_worker(server))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:  # Already finished
+                pass
+
+
+def _fork_worker(server):
+    pid = os.fork()
+    if pid:
+        return pid
+    status = 0
+    try:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except BaseException:
+        logger.exception("Server worker failed")
+        status = 1
+    finally:
+        os._exit(status)
@@ -1,12 +1,12 @@
 import os
 
-from bottle import FileUpload, static_file
+from bottle import request, static_file
 
-from conans.errors import RecipeNotFoundException, PackageNotFoundException
+from conans.errors import NotFoundException, RecipeNotFoundException, PackageNotFoundException
 from conans.server.service.common.common import CommonService
 from conans.server.service.mime import get_mime_type
 from conans.server.store.server_store import ServerStore
-from conans.util.files import mkdir
+from conans.util.files import CHECKSUMS_BUFFER_SIZE, MultiHasher, mkdir
 
 
 class ConanServiceV2(CommonService):
@@ -29,18 +29,24 @@ class ConanServiceV2(CommonService):
     def get_conanfile_file(self, reference, filename, auth_user):
         self._authorizer.check_read_conan(auth_user, reference)
         path = self._server_store.get_conanfile_file_path(reference, filename)
-        return static_file(os.path.basename(path), root=os.path.dirname(path),
-                           mimetype=get_mime_type(path))
+        return self._file_response(path)
 
     def upload_recipe_file(self, body, headers, reference, filename, auth_user):
         self._authorizer.check_write_conan(auth_user, reference)
         # FIXME: Check that reference contains revision (MANDATORY TO UPLOAD)
         path = self._server_store.get_conanfile_file_path(reference, filename)
-        self._upload_to_path(body, headers, path)
+        checksums = self._upload_to_path(body, path)
+        self._server_store.add_blob(path, checksums)
 
         # If the upload was ok, update the pointer to the latest
         self._server_store.update_last_revision(reference)
 
+    def deploy_recipe_file(self, headers, reference, filename, auth_user):
+        self._authorizer.check_write_conan(auth_user, reference)
+        path = self._server_store.get_conanfile_file_path(reference, filename)
+        self._deploy_to_path(headers, path)
+        self._server_store.update_last_revision(reference)
+
     def get_recipe_revisions(self, ref, auth_user):
         self._authorizer.check_read_conan(auth_user, ref)
         root = self._server_store.conan_revisions_root(ref.copy_clear_rev())
@@ -83,8 +89,7 @@ class ConanServiceV2(CommonService):
     def get_package_file(self, pref, filename, auth_user):
         self._authorizer.check_read_conan(auth_user, pref.ref)
         path = self._server_store.get_package_file_path(pref, filename)
-        return static_file(os.path.basename(path), root=os.path.dirname(path),
-                           mimetype=get_mime_type(path))
+        return self._file_response(path)
 
     def upload_package_file(self, body, headers, pref, filename, auth_user):
         self._authorizer.check_write_conan(auth_user, pref.ref)
@@ -95,19 +100,56 @@ class ConanServiceV2(CommonService):
         if not os.path.exists(recipe_path):
             raise RecipeNotFoundException(pref.ref)
         path = self._server_store.get_package_file_path(pref, filename)
-        self._upload_to_path(body, headers, path)
+        checksums = self._upload_to_path(body, path)
+        self._server_store.add_blob(path, checksums)
 
         # If the upload was ok, update the pointer to the latest
         self._server_store.update_last_package_revision(pref)
 
+    def deploy_package_file(self, headers, pref, filename, auth_user):
+        self._authorizer.check_write_conan(auth_user, pref.ref)
+        recipe_path = self._server_store.export(pref.ref)
+        if not os.path.exists(recipe_path):
+            raise RecipeNotFoundException(pref.ref)
+        path = self._server_store.get_package_file_path(pref, filename)
+        self._deploy_to_path(headers, path)
+        self._server_store.update_last_package_revision(pref)
+
     # Misc
     @staticmethod
-    def _upload_to_path(body, headers, path):
-        file_saver = FileUpload(body, None,
-                                filename=os.path.basename(path),
-                                headers=headers)
+    def _upload_to_path(body, path):
+        """ stores the uploaded file, returning its {"md5": , "sha1": }, computed while it is
+        received, so it is not read again to hash it
+        """
         if os.path.exists(path):
             os.unlink(path)
         if not os.path.exists(os.path.dirname(path)):
             mkdir(os.path.dirname(path))
-        file_saver.save(os.path.dirname(path))
+        hasher = MultiHasher(("md5", "sha1"))
+        with open(path, "wb") as f:
+            while True:
+                data = body.read(CHECKSUMS_BUFFER_SIZE)
+                if not data:
+                    break
+                hasher.update(data)
+                f.write(data)
+        return hasher.hexdigests()
+
+    def _deploy_to_path(self, headers, path):
+        """ checksum deploy: the file is not uploaded if there is a stored one with the same
+        checksum, it is linked. Not found otherwise, so the client uploads it
+        """
+        sha1 = headers.get("X-Checksum-Sha1")
+        if not self._server_store.link_blob(sha1, path):
+            raise NotFoundException("No file with checksum '%s'" % sha1)
+
+    def _file_response(self, path):
+        """ the file, or the requested byte range of it. The ranges are used by the clients to
+        resume interrupted downloads, so they also get the checksum of the whole file to verify
+        the resumed one, the one stored when it was uploaded
+        """
+        response = static_file(os.path.basename(path), root=os.path.dirname(path),
+                               mimetype=get_mime_type(path))
+        if response.status_code == 206 and "HTTP_RANGE" in request.environ:
+            response.set_header("X-Checksum-Sha1", self._server_store.get_sha1(path))
+        return response
@@ -0,0 +1,86 @@
+import os
+import re
+
+from conans.util.files import mkdir, replace_atomically, sha1sum
+from conans.util.log import logger
+
+BLOBS_FOLDER = ".blobs"
+
+_sha1_pattern = re.compile("^[0-9a-f]{40}$")
+
+
+class BlobStore(object):
+    """ Content addressed store of the uploaded files, by their sha1. The files of the revisions
+    are hard links to the blobs, so the identical files of different revisions, references or
+    channels use the disk once, and a file whose checksum is already stored is not uploaded
+    again (checksum deploy). The number of links of a blob is its reference count, a blob with
+    a single link is not used by any revision anymore and it is collected.
+    The stored files are never modified in place, they are always removed before writing them
+    """
+
+    def __init__(self, folder):
+        self._folder = folder
+
+    def _path(self, sha1):
+        return os.path.join(self._folder, sha1[:2], sha1)
+
+    def link(self, sha1, path):
+        """ makes 'path' a link to the blob with the checksum, returning False if not stored
+        """
+        if not sha1 or not _sha1_pattern.match(sha1):
+            return False
+        try:
+            mkdir(os.path.dirname(path))
+            _replace_with_link(self._path(sha1), path)
+        except OSError:
+            return False
+        return True
+
+    def add(self, path, sha1=None):
+        """ stores the file at path, or replaces it with a link to the stored blob with the same
+        contents. The sha1 of the file is computed if not given
+        """
+        blob_path = self._path(sha1 or sha1sum(path))
+        try:
+            if os.path.exists(blob_path):
+                _replace_with_link(blob_path, path)
+            else:
+                mkdir(os.path.dirname(blob_path))
+                _replace_with_link(path, blob_path)
+        except OSError as exc:  # i.e. a file system without hard links, the file is kept
+            logger.warning("Cannot link '%s' to the blob store: %s" % (path, exc))
+
+    def collect_garbage(self, sha1s=None):
+        """ removes the blobs with those checksums if they are not linked from any revision
+        anymore, or all the not linked ones (it walks the whole store) if sha1s is None
+        """
+        if not os.path.isdir(self._folder):
+            return
+        if sha1s is None:
+            blob_paths = []
+            for prefix in os.listdir(self._folder):
+                try:
+                    names = os.listdir(os.path.join(self._folder, prefix))
+                except OSError:  # Concurrently removed
+                    continue
+                blob_paths.extend(os.path.join(self._folder, prefix, n) for n in names)
+        else:
+            blob_paths = [self._path(sha1) for sha1 in sha1s if _sha1_pattern.match(sha1)]
+
+        for blob_path in blob_paths:
+            try:
+                if os.stat(blob_path).st_nlink == 1:
+                    os.remove(blob_path)
+            except OSError:  # Concurrently removed
+                continue
+            try:  # Take advantage that os.rmdir does not delete non-empty dirs
+                os.rmdir(os.path.dirname(blob_path))
+            except OSError:
+                pass
+
+
+def _replace_with_link(src, dst):
+    """ links dst to src, atomically replacing dst if it exists, so its readers get always a
+    complete file
+    """
+    replace_atomically(dst, lambda tmp_path: os.link(src, tmp_path))
@@ -1,11 +1,23 @@
+import json
 import os
+import threading
+from contextlib import contextmanager
 
 import fasteners
 
 from conans.client.tools.env import no_op
 from conans.errors import NotFoundException
 from conans.server.store.server_store import REVISIONS_FILE
-from conans.util.files import decode_text, md5sum, path_exists, relative_dirs, rmdir
+from conans.util.files import decode_text, file_checksums, load, path_exists, relative_dirs, \
+    rmdir, save_atomically, stat_key
+from conans.util.log import logger
+
+# The checksums of the files of a recipe or package folder, stored in it
+CHECKSUMS_FILE = ".checksums.json"
+
+# The interprocess locks don't exclude the threads of the same process. Reentrant, so lock()
+# can be held while reading and writing files with other lock files
+_thread_lock = threading.RLock()
 
 
 class ServerDiskAdapter(object):
@@ -60,16 +72,112 @@ class ServerDiskAdapter(object):
     def _get_paths(self, absolute_path, files_subset):
         if not path_exists(absolute_path, self._store_folder):
             raise NotFoundException("")
-        paths = relative_dirs(absolute_path)
+        paths = [p for p in relative_dirs(absolute_path)
+                 if not os.path.basename(p).startswith(CHECKSUMS_FILE)]
         if files_subset is not None:
             paths = set(paths).intersection(set(files_subset))
         abs_paths = [os.path.join(absolute_path, relpath) for relpath in paths]
         return abs_paths
 
     def get_snapshot(self, absolute_path="", files_subset=None):
-        """returns a dict with the filepaths and md5"""
+        """returns a dict with the filepaths and md5. The md5 are the ones stored when the files
+        were uploaded, or computed and stored now for the files without them, as the ones
+        linked by a checksum deploy"""
         abs_paths = self._get_paths(absolute_path, files_subset)
-        return {filepath: md5sum(filepath) for filepath in abs_paths}
+        checksums = self._load_checksums(absolute_path)
+        snapshot = {}
+        new_checksums = {}
+        for filepath in abs_paths:
+            name = os.path.relpath(filepath, absolute_path).replace("\\", "/")
+            entry = checksums.get(name)
+            key = stat_key(filepath)
+            if entry is None or entry[:3] != key:  # Modified after storing its checksums
+                entry = self._file_checksums_entry(filepath, key)
+                new_checksums[name] = entry
+            snapshot[filepath] = entry[3]
+        if new_checksums:
+            self.update_checksums(absolute_path, new_checksums)
+        return snapshot
+
+    def get_sha1(self, filepath):
+        """ the sha1 stored when the file was uploaded, it is computed (and stored) only if the
+        file was modified since then
+        """
+        folder, name = os.path.split(filepath)
+        entry = self._load_checksums(folder).get(name)
+        key = stat_key(filepath)
+        if entry is None or entry[:3] != key:
+            entry = self._file_checksums_entry(filepath, key)
+            self.update_checksums(folder, {name: entry})
+        return entry[4]
+
+    @staticmethod
+    def _file_checksums_entry(filepath, key=None, checksums=None):
+        checksums = checksums or file_checksums(filepath, ("md5", "sha1"))
+        return (key or stat_key(filepath)) + [checksums["md5"], checksums["sha1"]]
+
+    @staticmethod
+    def _load_checksums(folder):
+        """ {filename: [size, mtime_ns, inode, md5, sha1]} of the files of the folder
+        """
+        try:
+            return json.loads(load(os.path.join(folder, CHECKSUMS_FILE)))
+        except Exception:  # Missing or corrupted, they are computed again
+            return {}
+
+    def update_checksums(self, folder, checksums):
+        """ stores the checksums of some files of the folder, the ones of the other files
+        are kept, unless they were removed. The checksums file is locked from the read to the
+        write, so the entries stored by concurrent uploads to the same folder are not lost
+        """
+        def update(contents):
+            try:
+                stored = json.loads(contents)
+            except Exception:  # Missing or corrupted, they are computed again
+                stored = {}
+            stored.update(checksums)
+            stored = {name: entry for name, entry in stored.items()
+                      if os.path.exists(os.path.join(folder, name))}
+            return json.dumps(stored)
+
+        path = os.path.join(folder, CHECKSUMS_FILE)
+        try:
+            self.update_file(path, update, lock_file=path + ".lock")
+        except (IOError, OSError):  # Not stored, they will be hashed again next time
+            pass
+
+    def save_checksums(self, filepath, checksums):
+        """ stores the checksums {"md5": , "sha1": } computed while receiving the file
+        """
+        folder = os.path.dirname(filepath)
+        entry = self._file_checksums_entry(filepath, checksums=checksums)
+        self.update_checksums(folder, {os.path.basename(filepath): entry})
+
+    def scrub(self):
+        """ hashes again all the stored files with checksums, returning the ones whose contents
+        don't match them. The files replaced since their checksums were stored (APIv1 uploads)
+        are not corrupted, their checksums are updated
+        """
+        corrupted = []
+        for root, _, filenames in os.walk(self._store_folder):
+            if CHECKSUMS_FILE not in filenames:
+                continue
+            new_checksums = {}
+            for name, entry in self._load_checksums(root).items():
+                filepath = os.path.join(root, name)
+                try:
+                    key = stat_key(filepath)
+                    checksums = file_checksums(filepath, ("md5", "sha1"))
+                except (IOError, OSError):  # Concurrently removed
+                    continue
+                if entry[:3] != key:
+                    new_checksums[name] = self._file_checksums_entry(filepath, key, checksums)
+                elif [checksums["md5"], checksums["sha1"]] != entry[3:]:
+                    logger.error("Corrupted file %s" % filepath)
+                    corrupted.append(filepath)
+            if new_checksums:
+                self.update_checksums(root, new_checksums)
+        return sorted(corrupted)
 
     def get_file_list(self, absolute_path="", files_subset=None):
         abs_paths = self._get_paths(absolute_path, files_subset)
@@ -91,14 +199,44 @@ class ServerDiskAdapter(object):
         return os.path.exists(path)
 
     def read_file(self, path, lock_file):
-        with fasteners.InterProcessLock(lock_file) if lock_file else no_op():
-            with open(path) as f:
-                return f.read()
+        with _thread_lock if lock_file else no_op():
+            with fasteners.InterProcessLock(lock_file) if lock_file else no_op():
+                with open(path) as f:
+                    return f.read()
 
     def write_file(self, path, contents, lock_file):
-        with fasteners.InterProcessLock(lock_file) if lock_file else no_op():
-            with open(path, "w") as f:
-                f.write(contents)
+        with _thread_lock if lock_file else no_op():
+            with fasteners.InterProcessLock(lock_file) if lock_file else no_op():
+                # The readers without the lock get always a complete file, and a new inode
+                # identifies the change
+                save_atomically(path, contents)
+
+    @contextmanager
+    def lock(self, lock_file):
+        """ excludes the other threads and processes holding the same lock_file, i.e. to read
+        several files and write the result consistently. The files read and written while it
+        is held can't use the same lock_file
+        """
+        with _thread_lock:
+            with fasteners.InterProcessLock(lock_file):
+                yield
+
+    def update_file(self, path, update, lock_file):
+        """ writes update(contents) to the file, contents is None if it doesn't exist. The lock
+        is held from the read to the write, so the concurrent updates are not lost. Nothing is
+        written if update() doesn't change the contents
+        """
+        with _thread_lock:
+            with fasteners.InterProcessLock(lock_file):
+                try:
+                    with open(path) as f:
+                        contents = f.read()
+                except IOError:
+                    contents = None
+                new_contents = update(contents)
+                if new_contents != contents:
+                    save_atomically(path, new_contents)
 
     def base_storage_folder(self):
         return self._store_folder
+
@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+
+from conans.model.ref import ConanFileReference
+from conans.util.files import mkdir
+
+SEARCH_INDEX_FILE = ".search_index.db"
+
+
+class SearchIndex(object):
+    """ SQLite index of the recipe revisions and the binary packages of the server store, to
+    answer the searches without walking the storage folder and parsing every conaninfo.txt.
+    It is updated by the ServerStore with every upload and removal. The packages are stored
+    with the conaninfo of their latest package revision, as returned by the searches
+    (ConanInfo.serialize_min()). The references are stored by their folders (name, version,
+    user, channel), so the searches return the same references than walking the store
+    """
+
+    def __init__(self, path):
+        self._path = path
+        # The connections can't be shared by threads, nor by the processes forked by the server
+        self._local = threading.local()
+
+    @staticmethod
+    def available():
+        try:
+            import sqlite3  # Python can be built without it
+        except ImportError:
+            return False
+        return True
+
+    def _connection(self):
+        pid = os.getpid()
+        # The index file can be removed to build it again
+        if getattr(self._local, "pid", None) != pid or not os.path.exists(self._path):
+            import sqlite3
+            if getattr(self._local, "pid", None) == pid:
+                self._local.connection.close()
+            mkdir(os.path.dirname(self._path))
+            connection = sqlite3.connect(self._path, timeout=60)
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS recipes (name TEXT, version TEXT, user TEXT,
+                    channel TEXT, revision TEXT,
+                    PRIMARY KEY (name, version, user, channel, revision));
+                CREATE TABLE IF NOT EXISTS packages (name TEXT, version TEXT, user TEXT,
+                    channel TEXT, revision TEXT, package_id TEXT, info TEXT,
+                    PRIMARY KEY (name, version, user, channel, revision, package_id));
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+                """)
+            self._local.connection = connection
+            self._local.pid = pid
+        return self._local.connection
+
+    @staticmethod
+    def _ref_key(ref):
+        return tuple(ref.dir_repr().split("/"))
+
+    @property
+    def built(self):
+        row = self._connection().execute("SELECT value FROM meta WHERE key='built'").fetchone()
+        return row is not None
+
+    def rebuild(self, recipes, package_infos):
+        """ replaces the whole index, 'recipes' are the references with revision of the store,
+        package_infos(ref) the {package_id: info} of each one
+        """
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM recipes")
+            connection.execute("DELETE FROM packages")
+            for ref in recipes:
+                self._add_recipe(connection, ref)
+                for package_id, info in package_infos(ref).items():
+                    self._set_package(connection, ref, package_id, info)
+            connection.execute("INSERT OR REPLACE INTO meta VALUES ('built', '1')")
+
+    def add_recipe(self, ref):
+        connection = self._connection()
+        with connection:
+            self._add_recipe(connection, ref)
+
+    def _add_recipe(self, connection, ref):
+        connection.execute("INSERT OR IGNORE INTO recipes VALUES (?, ?, ?, ?, ?)",
+                           self._ref_key(ref) + (ref.revision, ))
+
+    def remove_recipe(self, ref):
+        """ the recipe revision and its packages, or all of them if ref has no revision
+        """
+        connection = self._connection()
+        with connection:
+            for table in ("recipes", "packages"):
+                self._delete(connection, table, ref)
+
+    def set_package(self, pref, info):
+        """ the info of the latest revision of the package, None if it has no revision left
+        """
+        connection = self._connection()
+        with connection:
+            self._set_package(connection, pref.ref, pref.id, info)
+
+    def _set_package(self, connection, ref, package_id, info):
+        key = self._ref_key(ref) + (ref.revision, package_id)
+        if info is None:
+            connection.execute("DELETE FROM packages WHERE name=? AND version=? AND user=? "
+                               "AND channel=? AND revision=? AND package_id=?", key)
+        else:
+            connection.execute("INSERT OR REPLACE INTO packages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                               key + (json.dumps(info), ))
+
+    def remove_packages(self, ref):
+        """ all the packages of the recipe revision
+        """
+        connection = self._connection()
+        with connection:
+            self._delete(connection, "packages", ref)
+
+    def _delete(self, connection, table, ref):
+        condition = "name=? AND version=? AND user=? AND channel=?"
+        params = self._ref_key(ref)
+        if ref.revision:
+            condition += " AND revision=?"
+            params += (ref.revision, )
+        connection.execute("DELETE FROM %s WHERE %s" % (table, condition), params)
+
+    def recipes(self):
+        """ the references, without revision, that have any revision in the store
+        """
+        rows = self._connection().execute("SELECT DISTINCT name, version, user, channel "
+                                          "FROM recipes")
+        return [ConanFileReference(*row) for row in rows]
+
+    def package_infos(self, ref):
+        """ {package_id: info} of the packages of the recipe revision
+        """
+        rows = self._connection().execute("SELECT package_id, info FROM packages WHERE "
+                                          "name=? AND version=? AND user=? AND channel=? AND "
+                                          "revision=?", self._ref_key(ref) + (ref.revision, ))
+        return {package_id: json.loads(info) for package_id, info in rows}
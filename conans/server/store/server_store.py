@@ -1,13 +1,22 @@
 import os
+import threading
+from collections import OrderedDict
 from os.path import join, normpath, relpath
 
 from conans import DEFAULT_REVISION_V1
 from conans.errors import ConanException, PackageNotFoundException, RecipeNotFoundException
+from conans.model.info import ConanInfo
 from conans.model.ref import ConanFileReference, PackageReference
-from conans.paths import EXPORT_FOLDER, PACKAGES_FOLDER
+from conans.paths import CONANINFO, EXPORT_FOLDER, PACKAGES_FOLDER
 from conans.server.revision_list import RevisionList
+from conans.server.store.blob_store import BLOBS_FOLDER, BlobStore
+from conans.server.store.search_index import SEARCH_INDEX_FILE, SearchIndex
+from conans.util.files import list_folder_subdirs, load, stat_key
+from conans.util.log import logger
 
 REVISIONS_FILE = "revisions.txt"
+# Max number of revisions files whose RevisionList is kept in memory
+_REVISIONS_CACHE_SIZE = 10000
 
 
 class ServerStore(object):
@@ -15,6 +24,14 @@ class ServerStore(object):
     def __init__(self, storage_adapter):
         self._storage_adapter = storage_adapter
         self._store_folder = storage_adapter._store_folder
+        self._blob_store = BlobStore(join(self._store_folder, BLOBS_FOLDER))
+        if SearchIndex.available():
+            self._search_index = SearchIndex(join(self._store_folder, SEARCH_INDEX_FILE))
+        else:
+            self._search_index = None
+        # {revisions file: (stat key, RevisionList)}, from the least to the most recently used
+        self._revisions_cache = OrderedDict()
+        self._revisions_lock = threading.Lock()
 
     @property
     def store(self):
@@ -61,6 +78,134 @@ class ServerStore(object):
     def path_exists(self, path):
         return self._storage_adapter.path_exists(path)
 
+    # ############ BLOBS (APIv2)
+    def link_blob(self, sha1, path):
+        """ the stored file at path becomes the one with that sha1, if there is any. Returns
+        False otherwise
+        """
+        return self._blob_store.link(sha1, path)
+
+    def add_blob(self, path, checksums):
+        """ the uploaded file at path can be linked by other revisions with link_blob. Its
+        checksums {"md5": , "sha1": }, computed while receiving it, are stored too, so the
+        snapshots don't read it again
+        """
+        self._blob_store.add(path, checksums["sha1"])
+        self._storage_adapter.save_checksums(path, checksums)
+
+    def get_sha1(self, path):
+        """ the sha1 of the stored file at path, the one stored with it unless the file was
+        modified since then
+        """
+        return self._storage_adapter.get_sha1(path)
+
+    def _linked_blobs(self, paths):
+        """ the checksums of the blobs linked from the files (or the files of the folders) at
+        paths, the ones to collect once they are removed, without walking all the blobs
+        """
+        sha1s = set()
+        for path in paths:
+            if os.path.isdir(path):
+                files = self._storage_adapter.get_file_list(path)
+            else:
+                files = [path]
+            for filepath in files:
+                try:
+                    if os.stat(filepath).st_nlink > 1:
+                        sha1s.add(self._storage_adapter.get_sha1(filepath))
+                except (IOError, OSError):  # Missing, or concurrently removed
+                    continue
+        return sha1s
+
+    def scrub(self):
+        """ the stored files whose contents don't match the checksums stored with them. It also
+        removes the blobs that are not linked anymore, i.e. by an interrupted removal
+        """
+        self._blob_store.collect_garbage()
+        return [relpath(path, self.store) for path in self._storage_adapter.scrub()]
+
+    # ############ SEARCH (APIv1 and APIv2)
+    def _index(self):
+        """ the search index, built from the store the first time it is used. None if sqlite3
+        is not available, the searches walk the store
+        """
+        if self._search_index is not None and not self._search_index.built:
+            self.rebuild_search_index()
+        return self._search_index
+
+    def rebuild_search_index(self):
+        if self._search_index is None:
+            raise ConanException("The search index requires the Python sqlite3 module")
+        self._search_index.rebuild(self._scan_recipes(), self._scan_package_infos)
+
+    def search_recipes(self):
+        """ the references, without revision, of all the recipes in the store
+        """
+        index = self._index()
+        if index is not None:
+            return index.recipes()
+        return list(set(ref.copy_clear_rev() for ref in self._scan_recipes()))
+
+    def get_package_infos(self, ref):
+        """ {package_id: ConanInfo.serialize_min()} of the latest package revision of the
+        packages of the recipe revision
+        """
+        index = self._index()
+        if index is not None:
+            return index.package_infos(ref)
+        return self._scan_package_infos(ref)
+
+    def _scan_recipes(self):
+        subdirs = list_folder_subdirs(basedir=self.store, level=5)
+        return [ConanFileReference(*folder.split("/")) for folder in subdirs]
+
+    def _scan_package_infos(self, ref):
+        result = {}
+        for package_id in list_folder_subdirs(self.packages(ref), level=1):
+            info = self._scan_package_info(PackageReference(ref, package_id))
+            if info is not None:
+                result[package_id] = info
+        return result
+
+    def _scan_package_info(self, pref):
+        """ the info of the latest revision of the package, None if it has no revisions
+        """
+        try:
+            revision_entry = self.get_last_package_revision(pref)
+            if not revision_entry:
+                return None
+            pref = pref.copy_with_revs(pref.ref.revision, revision_entry.revision)
+            info_path = join(self.package(pref), CONANINFO)
+            if not os.path.exists(info_path):
+                return None
+            return ConanInfo.loads(load(info_path)).serialize_min()
+        except Exception as exc:  # FIXME: Too wide
+            logger.error("Package %s has no ConanInfo file" % str(pref))
+            if str(exc):
+                logger.error(str(exc))
+            return None
+
+    def _update_package_index(self, pref):
+        """ the package, with or without PREV, changed. The concurrent uploads of its files
+        scan and set it one at a time, otherwise a scan that didn't find the conaninfo.txt yet
+        could be set the last one, removing the package from the index
+        """
+        index = self._index()
+        if index is not None:
+            pref = PackageReference(pref.ref, pref.id)
+            lock_file = self._package_revisions_file(pref) + ".index.lock"
+            with self._storage_adapter.lock(lock_file):
+                index.set_package(pref, self._scan_package_info(pref))
+
+    def file_uploaded(self, path):
+        """ the file at path was uploaded with a signed url (APIv1), that doesn't update the
+        search index, as the store does with the other uploads
+        """
+        parts = relpath(path, self.store).replace("\\", "/").split("/")
+        if len(parts) == 9 and parts[5] == PACKAGES_FOLDER and parts[8] == CONANINFO:
+            ref = ConanFileReference(*parts[:5])
+            self._update_package_index(PackageReference(ref, parts[6], parts[7]))
+
     # ############ SNAPSHOTS (APIv1)
     def get_recipe_snapshot(self, ref):
         """Returns a {filepath: md5} """
@@ -115,52 +260,80 @@ class ServerStore(object):
     def remove_conanfile(self, ref):
         assert isinstance(ref, ConanFileReference)
         if not ref.revision:
-            self._storage_adapter.delete_folder(self.conan_revisions_root(ref))
+            folder = self.conan_revisions_root(ref)
+            blobs = self._linked_blobs([folder])
+            self._storage_adapter.delete_folder(folder)
         else:
-            self._storage_adapter.delete_folder(self.base_folder(ref))
+            folder = self.base_folder(ref)
+            blobs = self._linked_blobs([folder])
+            self._storage_adapter.delete_folder(folder)
             self._remove_revision_from_index(ref)
         self._delete_empty_dirs(ref)
+        self._blob_store.collect_garbage(blobs)
+        index = self._index()
+        if index is not None:
+            index.remove_recipe(ref)
 
     def remove_packages(self, ref, package_ids_filter):
         assert isinstance(ref, ConanFileReference)
         assert isinstance(package_ids_filter, list)
 
         if not package_ids_filter:  # Remove all packages
-            packages_folder = self.packages(ref)
-            self._storage_adapter.delete_folder(packages_folder)
+            folders = [self.packages(ref)]
         else:
-            for package_id in package_ids_filter:
-                pref = PackageReference(ref, package_id)
-                # Remove all package revisions
-                package_folder = self.package_revisions_root(pref)
-                self._storage_adapter.delete_folder(package_folder)
+            # Remove all package revisions
+            folders = [self.package_revisions_root(PackageReference(ref, package_id))
+                       for package_id in package_ids_filter]
+        blobs = self._linked_blobs(folders)
+        for folder in folders:
+            self._storage_adapter.delete_folder(folder)
         self._delete_empty_dirs(ref)
+        self._blob_store.collect_garbage(blobs)
+        index = self._index()
+        if index is not None:
+            if not package_ids_filter:
+                index.remove_packages(ref)
+            for package_id in package_ids_filter:
+                index.set_package(PackageReference(ref, package_id), None)
 
     def remove_package(self, pref):
         assert isinstance(pref, PackageReference)
         assert pref.revision is not None, "BUG: server store needs PREV remove_package"
         assert pref.ref.revision is not None, "BUG: server store needs RREV remove_package"
         package_folder = self.package(pref)
+        blobs = self._linked_blobs([package_folder])
         self._storage_adapter.delete_folder(package_folder)
         self._remove_package_revision_from_index(pref)
+        self._blob_store.collect_garbage(blobs)
+        self._update_package_index(pref)
 
     def remove_all_packages(self, ref):
         assert ref.revision is not None, "BUG: server store needs RREV remove_all_packages"
         assert isinstance(ref, ConanFileReference)
         packages_folder = self.packages(ref)
+        blobs = self._linked_blobs([packages_folder])
         self._storage_adapter.delete_folder(packages_folder)
+        self._blob_store.collect_garbage(blobs)
+        index = self._index()
+        if index is not None:
+            index.remove_packages(ref)
 
     def remove_conanfile_files(self, ref, files):
         subpath = self.export(ref)
-        for filepath in files:
-            path = join(subpath, filepath)
+        paths = [join(subpath, filepath) for filepath in files]
+        blobs = self._linked_blobs(paths)
+        for path in paths:
             self._storage_adapter.delete_file(path)
+        self._blob_store.collect_garbage(blobs)
 
     def remove_package_files(self, pref, files):
         subpath = self.package(pref)
-        for filepath in files:
-            path = join(subpath, filepath)
+        paths = [join(subpath, filepath) for filepath in files]
+        blobs = self._linked_blobs(paths)
+        for path in paths:
             self._storage_adapter.delete_file(path)
+        self._blob_store.collect_garbage(blobs)
+        self._update_package_index(pref)
 
     # ONLY APIv1 URLS
     # ############ DOWNLOAD URLS
@@ -198,8 +371,9 @@ class ServerStore(object):
         """Get the download urls for the whole relative_path or just
         for a subset of files. files_subset has to be a list with paths
         relative to relative_path"""
-        relative_snap = self._storage_adapter.get_snapshot(relative_path, files_subset)
-        urls = self._storage_adapter.get_download_urls(list(relative_snap.keys()), user)
+        # Just the file names, their checksums are not needed for the urls
+        files = self._storage_adapter.get_file_list(relative_path, files_subset)
+        urls = self._storage_adapter.get_download_urls(files, user)
         urls = self._relativize_keys(urls, relative_path)
         return urls
 
@@ -246,25 +420,34 @@ class ServerStore(object):
     def update_last_revision(self, ref):
         assert(isinstance(ref, ConanFileReference))
         rev_file_path = self._recipe_revisions_file(ref)
-        self._update_last_revision(rev_file_path, ref)
+        if not self._update_last_revision(rev_file_path, ref):
+            return
+        index = self._index()
+        if index is not None:
+            index.add_recipe(ref)
 
     def update_last_package_revision(self, pref):
         assert(isinstance(pref, PackageReference))
         rev_file_path = self._package_revisions_file(pref)
         self._update_last_revision(rev_file_path, pref)
+        self._update_package_index(pref)
 
     def _update_last_revision(self, rev_file_path, ref):
-        if self._storage_adapter.path_exists(rev_file_path):
-            rev_file = self._storage_adapter.read_file(rev_file_path,
-                                                       lock_file=rev_file_path + ".lock")
-            rev_list = RevisionList.loads(rev_file)
-        else:
-            rev_list = RevisionList()
+        """ returns False if it was already the latest revision, as for all the files of an
+        upload but the first one, that doesn't write the file again
+        """
         if ref.revision is None:
             raise ConanException("Invalid revision for: %s" % ref.full_str())
-        rev_list.add_revision(ref.revision)
-        self._storage_adapter.write_file(rev_file_path, rev_list.dumps(),
-                                         lock_file=rev_file_path + ".lock")
+        latest = self._get_revisions_list(rev_file_path).latest_revision()
+        if latest is not None and latest.revision == ref.revision:
+            return False
+
+        def add_revision(rev_file):
+            rev_list = RevisionList.loads(rev_file) if rev_file is not None else RevisionList()
+            rev_list.add_revision(ref.revision)
+            return rev_list.dumps()
+        self._update_revisions_file(rev_file_path, add_revision)
+        return True
 
     def get_package_revisions(self, pref):
         """Returns a RevisionList"""
@@ -281,13 +464,38 @@ class ServerStore(object):
         return ret
 
     def _get_revisions_list(self, rev_file_path):
-        if self._storage_adapter.path_exists(rev_file_path):
-            rev_file = self._storage_adapter.read_file(rev_file_path,
-                                                       lock_file=rev_file_path + ".lock")
-            rev_list = RevisionList.loads(rev_file)
-            return rev_list
-        else:
+        """ the RevisionList of the file, cached while the file doesn't change (its size,
+        modification time and inode, as it is replaced with every write). The returned list is
+        shared, it cannot be modified
+        """
+        try:
+            key = stat_key(rev_file_path)
+        except OSError:
+            return RevisionList()
+        with self._revisions_lock:
+            cached = self._revisions_cache.pop(rev_file_path, None)
+            if cached is not None:  # The most recently used now (no move_to_end in Python 2)
+                self._revisions_cache[rev_file_path] = cached
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        try:  # Not locked, the writes replace the file atomically
+            rev_file = self._storage_adapter.read_file(rev_file_path, lock_file=None)
+        except IOError:  # Concurrently removed
             return RevisionList()
+        rev_list = RevisionList.loads(rev_file)
+        with self._revisions_lock:
+            self._revisions_cache.pop(rev_file_path, None)
+            if len(self._revisions_cache) >= _REVISIONS_CACHE_SIZE:
+                self._revisions_cache.popitem(last=False)  # The least recently used
+            # The key read before the file, if it changed in between it is just read again
+            self._revisions_cache[rev_file_path] = (key, rev_list)
+        return rev_list
+
+    def _update_revisions_file(self, rev_file_path, update):
+        self._storage_adapter.update_file(rev_file_path, update,
+                                          lock_file=rev_file_path + ".lock")
+        with self._revisions_lock:
+            self._revisions_cache.pop(rev_file_path, None)
 
     def _get_latest_revision(self, rev_file_path):
         rev_list = self._get_revisions_list(rev_file_path)
@@ -315,44 +523,24 @@ class ServerStore(object):
         return join(p_folder, REVISIONS_FILE)
 
     def get_revision_time(self, ref):
-        try:
-            rev_list = self._load_revision_list(ref)
-        except IOError:
-            return None
+        rev_list = self._get_revisions_list(self._recipe_revisions_file(ref))
         return rev_list.get_time(ref.revision)
 
     def get_package_revision_time(self, pref):
-        try:
-            rev_list = self._load_package_revision_list(pref)
-        except (IOError, OSError):
-            return None
-
+        rev_list = self._get_revisions_list(self._package_revisions_file(pref))
         return rev_list.get_time(pref.revision)
 
     def _remove_revision_from_index(self, ref):
-        rev_list = self._load_revision_list(ref)
-        rev_list.remove_revision(ref.revision)
-        self._save_revision_list(rev_list, ref)
+        self._remove_revision(self._recipe_revisions_file(ref), ref.revision)
 
     def _remove_package_revision_from_index(self, pref):
-        rev_list = self._load_package_revision_list(pref)
-        rev_list.remove_revision(pref.revision)
-        self._save_package_revision_list(rev_list, pref)
-
-    def _load_revision_list(self, ref):
-        path = self._recipe_revisions_file(ref)
-        rev_file = self._storage_adapter.read_file(path, lock_file=path + ".lock")
-        return RevisionList.loads(rev_file)
-
-    def _save_revision_list(self, rev_list, ref):
-        path = self._recipe_revisions_file(ref)
-        self._storage_adapter.write_file(path, rev_list.dumps(), lock_file=path + ".lock")
-
-    def _save_package_revision_list(self, rev_list, pref):
-        path = self._package_revisions_file(pref)
-        self._storage_adapter.write_file(path, rev_list.dumps(), lock_file=path + ".lock")
-
-    def _load_package_revision_list(self, pref):
-        path = self._package_revisions_file(pref)
-        rev_file = self._storage_adapter.read_file(path, lock_file=path + ".lock")
-        return RevisionList.loads(rev_file)
+        self._remove_revision(self._package_revisions_file(pref), pref.revision)
+
+    def _remove_revision(self, rev_file_path, revision):
+        def remove_revision(rev_file):
+            if rev_file is None:
+                return None
+            rev_list = RevisionList.loads(rev_file)
+            rev_list.remove_revision(revision)
+            return rev_list.dumps()
+        self._update_revisions_file(rev_file_path, remove_revision)
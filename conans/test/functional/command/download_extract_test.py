@@ -0,0 +1,55 @@
+import os
+import unittest
+
+from conans.model.ref import ConanFileReference
+from conans.paths import PACKAGE_TGZ_NAME
+from conans.test.utils.tools import GenConanfile, NO_SETTINGS_PACKAGE_ID, TestClient, \
+    TestServer
+from conans.util.files import load
+
+
+class StreamingPackageExtractionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = TestServer(write_permissions=[("*/*@*/*", "*")])
+        client = TestClient(servers={"default": self.server},
+                            users={"default": [("lasote", "mypass")]})
+        conanfile = (GenConanfile().with_package_file("include/header.h", "//header")
+                                   .with_package_file("lib/mylib.a", "binary contents"))
+        client.save({"conanfile.py": conanfile})
+        client.run("create . pkg/0.1@user/testing")
+        client.run("upload * --all --confirm")
+        self.client = TestClient(servers={"default": self.server},
+                                 users={"default": [("lasote", "mypass")]})
+        self.ref = ConanFileReference.loads("pkg/0.1@user/testing")
+
+    def _install(self, streaming, assert_error=False):
+        self.client.run("remove * -f")
+        self.client.run("config set general.streaming_package_extraction=%s" % streaming)
+        self.client.run("install pkg/0.1@user/testing", assert_error=assert_error)
+        layout = self.client.cache.package_layout(self.ref)
+        return layout, layout.packages_ids()
+
+    def streaming_test(self):
+        layout, package_ids = self._install(streaming=False)
+        checksums = layout.load_metadata().packages[package_ids[0]].checksums
+
+        layout, package_ids = self._install(streaming=True)
+        self.assertIn("Package installed", self.client.out)
+        metadata = layout.load_metadata()
+        self.assertEqual(checksums, metadata.packages[package_ids[0]].checksums)
+        package_folder = os.path.join(layout.packages(), package_ids[0])
+        self.assertEqual("//header", load(os.path.join(package_folder, "include", "header.h")))
+        self.assertEqual("binary contents", load(os.path.join(package_folder, "lib", "mylib.a")))
+        self.assertFalse(os.path.exists(os.path.join(package_folder, PACKAGE_TGZ_NAME)))
+
+    def corrupted_test(self):
+        for root, _, files in os.walk(self.server.server_store.store):
+            if PACKAGE_TGZ_NAME in files:
+                with open(os.path.join(root, PACKAGE_TGZ_NAME), "r+b") as tgz:
+                    tgz.truncate(os.path.getsize(tgz.name) - 40)
+
+        layout, _ = self._install(streaming=True, assert_error=True)
+        self.assertIn("Error while downloading/extracting files to", self.client.out)
+        package_folder = os.path.join(layout.packages(), NO_SETTINGS_PACKAGE_ID)
+        self.assertFalse(os.path.exists(package_folder))
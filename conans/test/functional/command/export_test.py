@@ -1,8 +1,10 @@
 import os
 import stat
 import textwrap
+import time
 import unittest
 
+from mock import patch
 from parameterized import parameterized
 
 from conans.model.manifest import FileTreeManifest
@@ -11,7 +13,7 @@ from conans.paths import CONANFILE, CONAN_MANIFEST
 from conans.test.utils.cpp_test_files import cpp_hello_conan_files
 from conans.test.utils.tools import TestClient, GenConanfile
 from conans.test.utils.tools import create_local_git_repo
-from conans.util.files import load, save
+from conans.util.files import load, md5sum, save
 
 
 class ExportSettingsTest(unittest.TestCase):
@@ -500,3 +502,34 @@ class ExportMetadataTest(unittest.TestCase):
         self.assertIn("pkg/0.1: A new conanfile.py version was exported", client.out)
         client.run('export . Pkg/0.1@', assert_error=True)
         self.assertIn("ERROR: Cannot export package with same name but different case", client.out)
+
+    def export_digest_cache_test(self):
+        client = TestClient()
+        client.run("config set general.digest_cache=True")
+        conanfile = textwrap.dedent("""
+            from conans import ConanFile
+
+            class Pkg(ConanFile):
+                exports = "*.txt"
+                exports_sources = "src/*"
+            """)
+        files = {"conanfile.py": conanfile, "data.txt": "data"}
+        files.update({"src/file%d.cpp" % i: "source %d" % i for i in range(5)})
+        client.save(files)
+        past = time.time() - 100  # Recently modified files are not cached
+        for name in files:
+            os.utime(os.path.join(client.current_folder, name), (past, past))
+
+        def export(*args):
+            with patch("conans.model.manifest.md5sum", side_effect=md5sum) as md5sum_mock:
+                client.run("export . pkg/0.1@user/testing %s" % " ".join(args))
+            return md5sum_mock.call_count
+
+        self.assertEqual(7, export())
+        self.assertEqual(0, export())
+        self.assertIn("pkg/0.1@user/testing: The stored package has not changed", client.out)
+        save(os.path.join(client.current_folder, "src", "file3.cpp"), "modified")
+        self.assertEqual(1, export())
+        self.assertIn("pkg/0.1@user/testing: A new conanfile.py version was exported", client.out)
+        self.assertEqual(7, export("--no-digest-cache"))
+        self.assertIn("pkg/0.1@user/testing: The stored package has not changed", client.out)
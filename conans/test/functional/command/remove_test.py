@@ -13,6 +13,7 @@ from conans.model.package_metadata import PackageMetadata
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.paths import BUILD_FOLDER, CONANFILE, CONANINFO, CONAN_MANIFEST, EXPORT_FOLDER, \
     PACKAGES_FOLDER, SRC_FOLDER
+from conans.server.store.search_index import SEARCH_INDEX_FILE
 from conans.server.store.server_store import ServerStore
 from conans.test.utils.cpp_test_files import cpp_hello_conan_files
 from conans.test.utils.test_files import temp_folder
@@ -390,7 +391,7 @@ class RemoveTest(unittest.TestCase):
                             build_folders={"H1": [1, 2], "H2": [1, 2], "B": [1, 2], "O": [1, 2]},
                             src_folders={"H1": True, "H2": True, "B": True, "O": True})
         remote_folder = os.path.join(self.server_folder, ".conan_server/data")
-        folders = os.listdir(remote_folder)
+        folders = [f for f in os.listdir(remote_folder) if f != SEARCH_INDEX_FILE]
         six.assertCountEqual(self, ["Other", "Bye"], folders)
 
     def remove_specific_package_test(self):
@@ -1,3 +1,4 @@
+import json
 import os
 import platform
 import stat
@@ -169,6 +170,66 @@ class UploadTest(unittest.TestCase):
         self.assertIn("Uploading conan_package.tgz", client.out)
         self.assertIn("Uploading conanfile.py", client.out)
 
+    def upload_known_checksums_test(self):
+        # The checksums computed for the metadata are sent, the files are not read again
+        client = self._client()
+        client.save({"conanfile.py": conanfile, "file.txt": "contents"})
+        client.run("create . user/testing")
+        with patch("conans.client.rest.uploader_downloader.sha1sum",
+                   side_effect=AssertionError("Checksum computed again")):
+            client.run("upload Hello0/*@user/testing --confirm --all")
+        self.assertIn("Uploaded conan recipe 'Hello0/1.2.1@user/testing'", client.out)
+        self.assertNotIn("Checksum computed again", client.out)
+        client.run("remove * -f")
+        client.run("install Hello0/1.2.1@user/testing")
+        self.assertIn("Package installed", client.out)
+
+    def parallel_upload_test(self):
+        client = self._client()
+        client.run("config set general.parallel_upload=4")
+        client.save({"conanfile.py": GenConanfile().with_setting("os").with_setting("arch")})
+        for name in ("Hello1", "Hello2"):
+            for _os in ("Windows", "Linux"):
+                client.run("create . %s/1.2.1@user/testing -s os=%s -s arch=x86_64"
+                           % (name, _os))
+        client.run("upload Hello*@user/testing --confirm --all --json=upload.json")
+        for name in ("Hello1", "Hello2"):
+            self.assertIn("Uploaded conan recipe '%s/1.2.1@user/testing'" % name, client.out)
+            for i in (1, 2):
+                self.assertIn("Uploading package %d/2" % i, client.out)
+                self.assertIn("of %s/1.2.1@user/testing to 'default'" % name, client.out)
+        uploaded = json.loads(client.load("upload.json"))["uploaded"]
+        self.assertEqual(["Hello1/1.2.1@user/testing", "Hello2/1.2.1@user/testing"],
+                         sorted(item["recipe"]["id"] for item in uploaded))
+        self.assertEqual([2, 2], [len(item["packages"]) for item in uploaded])
+        for item in uploaded:  # The remote of all the packages was stored in the metadata
+            ref = ConanFileReference.loads(item["recipe"]["id"])
+            metadata = client.cache.package_layout(ref).load_metadata()
+            self.assertEqual(["default", "default"],
+                             [p.remote for p in metadata.packages.values()])
+
+        client.run("remove * -f")
+        client.run("install Hello2/1.2.1@user/testing -s os=Linux -s arch=x86_64")
+        self.assertIn("Hello2/1.2.1@user/testing: Package installed", client.out)
+
+    def parallel_upload_recipe_error_test(self):
+        # No package is uploaded if any of the recipes fails
+        client = self._client()
+        client.save({"conanfile.py": GenConanfile().with_setting("os").with_setting("arch")})
+        client.run("create . Hello1/1.2.1@user/testing -s os=Linux -s arch=x86_64")
+        client.run("create . Hello2/1.2.1@user/testing -s os=Linux -s arch=x86_64")
+        client.run("upload Hello1/*@user/testing --confirm")
+        client.save({"conanfile.py": str(GenConanfile().with_setting("os")
+                                                .with_setting("arch")) + "# changed"})
+        client.run("create . Hello1/1.2.1@user/testing -s os=Linux -s arch=x86_64")
+        client.run("config set general.parallel_upload=4")
+        client.run("upload Hello*@user/testing --confirm --all --no-overwrite",
+                   assert_error=True)
+        self.assertIn("Local recipe is different from the remote recipe. Forbidden overwrite",
+                      client.out)
+        self.assertIn("Uploaded conan recipe 'Hello2/1.2.1@user/testing'", client.out)
+        self.assertNotIn("Uploading package", client.out)
+
     def query_upload_test(self):
         client = self._client()
         client.save({"conanfile.py": conanfile_upload_query})
@@ -209,7 +270,7 @@ class UploadTest(unittest.TestCase):
 
         def gzopen_patched(name, mode="r", fileobj=None, compresslevel=None, **kwargs):
             raise ConanException("Error gzopen %s" % name)
-        with mock.patch('conans.client.cmd.uploader.gzopen_without_timestamps',
+        with mock.patch('conans.client.archive_codecs.gzopen_without_timestamps',
                         new=gzopen_patched):
             client.run("upload * --confirm", assert_error=True)
             self.assertIn("ERROR: Error gzopen conan_sources.tgz", client.out)
@@ -237,7 +298,7 @@ class UploadTest(unittest.TestCase):
             if name == PACKAGE_TGZ_NAME:
                 raise ConanException("Error gzopen %s" % name)
             return gzopen_without_timestamps(name, mode, fileobj, compresslevel, **kwargs)
-        with mock.patch('conans.client.cmd.uploader.gzopen_without_timestamps',
+        with mock.patch('conans.client.archive_codecs.gzopen_without_timestamps',
                         new=gzopen_patched):
             client.run("upload * --confirm --all", assert_error=True)
             self.assertIn("ERROR: Error gzopen conan_package.tgz", client.out)
@@ -42,14 +42,19 @@ class CorruptedPackagesTest(unittest.TestCase):
         self.info_path = self.server.server_store.get_package_file_path(pref, "conaninfo.txt")
         self.tgz_path = self.server.server_store.get_package_file_path(pref, "conan_package.tgz")
 
+    def _remove_server_files(self, *paths):
+        for path in paths:
+            os.unlink(path)
+        # The search index is updated by the uploads and removals, not by the corruption
+        self.server.server_store.rebuild_search_index()
+
     def _assert_all_package_files_in_server(self):
         self.assertTrue(os.path.exists(self.manifest_path))
         self.assertTrue(os.path.exists(self.info_path))
         self.assertTrue(os.path.exists(self.tgz_path))
 
     def info_manifest_missing_test(self):
-        os.unlink(self.info_path)
-        os.unlink(self.manifest_path)
+        self._remove_server_files(self.info_path, self.manifest_path)
         # Try search
         self.client.run("search Pkg/0.1@user/testing -r default")
         self.assertIn("There are no packages for reference 'Pkg/0.1@user/testing', "
@@ -65,7 +70,7 @@ class CorruptedPackagesTest(unittest.TestCase):
         self._assert_all_package_files_in_server()
 
     def manifest_missing_test(self):
-        os.unlink(self.manifest_path)
+        self._remove_server_files(self.manifest_path)
         # Try search
         self.client.run("search Pkg/0.1@user/testing -r default")
         self.assertIn("Package_ID: 5ab84d6acfe1f23c4fae0ab88f26e3a396351ac9", self.client.out)
@@ -80,8 +85,7 @@ class CorruptedPackagesTest(unittest.TestCase):
         self._assert_all_package_files_in_server()
 
     def tgz_info_missing_test(self):
-        os.unlink(self.tgz_path)
-        os.unlink(self.info_path)
+        self._remove_server_files(self.tgz_path, self.info_path)
         # Try search
         self.client.run("search Pkg/0.1@user/testing -r default")
         self.assertIn("There are no packages for reference 'Pkg/0.1@user/testing', "
@@ -99,7 +103,7 @@ class CorruptedPackagesTest(unittest.TestCase):
         self._assert_all_package_files_in_server()
 
     def tgz_missing_test(self):
-        os.unlink(self.tgz_path)
+        self._remove_server_files(self.tgz_path)
         # Try search
         self.client.run("search Pkg/0.1@user/testing -r default")
         # Try fresh install
@@ -113,8 +117,7 @@ class CorruptedPackagesTest(unittest.TestCase):
         self._assert_all_package_files_in_server()
 
     def tgz_manifest_missing_test(self):
-        os.unlink(self.tgz_path)
-        os.unlink(self.manifest_path)
+        self._remove_server_files(self.tgz_path, self.manifest_path)
         # Try search
         self.client.run("search Pkg/0.1@user/testing -r default")
         self.assertIn("Package_ID: 5ab84d6acfe1f23c4fae0ab88f26e3a396351ac9", self.client.out)
@@ -128,9 +131,7 @@ class CorruptedPackagesTest(unittest.TestCase):
         self._assert_all_package_files_in_server()
 
     def tgz_manifest_info_missing_test(self):
-        os.unlink(self.tgz_path)
-        os.unlink(self.manifest_path)
-        os.unlink(self.info_path)
+        self._remove_server_files(self.tgz_path, self.manifest_path, self.info_path)
         # Try search
         self.client.run("search Pkg/0.1@user/testing -r default")
         self.assertIn("There are no packages for reference 'Pkg/0.1@user/testing', "
@@ -0,0 +1,68 @@
+import threading
+import unittest
+
+from mock import patch
+
+from conans.client.remote_manager import RemoteManager
+from conans.test.utils.tools import TestClient, TestServer, GenConanfile
+
+
+class BinariesPrefetchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = {"default": TestServer(write_permissions=[("*/*@*/*", "*")])}
+        client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]})
+        for name in ("LibA", "LibB", "LibC"):
+            client.save({"conanfile.py": GenConanfile().with_setting("build_type")},
+                        clean_first=True)
+            client.run("create . %s/0.1@user/testing" % name)
+        client.save({"conanfile.py": GenConanfile().with_require_plain("LibA/0.1@user/testing")
+                                                    .with_require_plain("LibB/0.1@user/testing")
+                                                    .with_require_plain("LibC/0.1@user/testing")},
+                    clean_first=True)
+        client.run("create . LibD/0.1@user/testing")
+        client.run("upload * --all --confirm")
+
+        self.client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]})
+        self.client.run("config set general.parallel_download=4")
+
+    def _install(self, args="", assert_error=False):
+        threads = {}
+
+        def get_package_info(remote_manager, pref, remote):
+            threads.setdefault(pref.ref.name, []).append(threading.current_thread())
+            return original(remote_manager, pref, remote)
+
+        original = RemoteManager.get_package_info
+        with patch.object(RemoteManager, "get_package_info", new=get_package_info):
+            self.client.run("install LibD/0.1@user/testing %s" % args, assert_error=assert_error)
+        return threads
+
+    def prefetch_test(self):
+        threads = self._install()
+        main_thread = threading.current_thread()
+        # The binaries of the same level are checked concurrently, just once
+        for name in ("LibA", "LibB", "LibC"):
+            self.assertEqual(1, len(threads[name]))
+            self.assertIsNot(main_thread, threads[name][0])
+            self.assertIn("%s/0.1@user/testing: Package installed" % name, self.client.out)
+        self.assertEqual([main_thread], threads["LibD"])
+        self.assertIn("LibD/0.1@user/testing: Package installed", self.client.out)
+
+    def prefetch_missing_test(self):
+        self._install("-s build_type=Debug", assert_error=True)
+        self.assertIn("Missing prebuilt package for 'LibA/0.1@user/testing'", self.client.out)
+        # Same result than the sequential check
+        self._install("-s build_type=Debug", assert_error=True)
+        parallel_output = str(self.client.out)
+        self.client.run("config rm general.parallel_download")
+        self._install("-s build_type=Debug", assert_error=True)
+        self.assertEqual(parallel_output, str(self.client.out))
+
+    def prefetch_forced_build_test(self):
+        threads = self._install("--build LibA")
+        # The binary to build is not checked in the remote
+        self.assertNotIn("LibA", threads)
+        for name in ("LibB", "LibC"):
+            self.assertEqual(1, len(threads[name]))
+        self.assertIn("LibA/0.1@user/testing: Created package", self.client.out)
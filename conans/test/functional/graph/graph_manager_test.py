@@ -2,6 +2,7 @@ import six
 from parameterized import parameterized
 
 from conans.client.graph.graph import RECIPE_CONSUMER, RECIPE_INCACHE
+from conans.client.tools.env import environment_append
 from conans.errors import ConanException
 from conans.model.ref import ConanFileReference
 from conans.test.functional.graph.graph_manager_base import GraphManagerTest
@@ -405,6 +406,76 @@ class TransitiveGraphTest(GraphManagerTest):
         self._check_node(mingw_app, "mingw/0.1@user/testing#123", deps=[], build_deps=[],
                          dependents=[app], closure=[])
 
+    def test_transitive_build_require_recipe_profile_shared(self):
+        # app -> lib -(br)-> gtest -(br)-> mingw
+        # profile \---(br)-> mingw
+        # app -(br)-> mingw
+        # The identical mingw build-requires subgraphs are expanded only once, and shared
+        mingw_ref = ConanFileReference.loads("mingw/0.1@user/testing")
+        gtest_ref = ConanFileReference.loads("gtest/0.1@user/testing")
+        lib_ref = ConanFileReference.loads("lib/0.1@user/testing")
+
+        self._cache_recipe(mingw_ref, GenConanfile().with_name("mingw").with_version("0.1"))
+        self._cache_recipe(gtest_ref, GenConanfile().with_name("gtest").with_version("0.1"))
+        self._cache_recipe(lib_ref, GenConanfile().with_name("lib").with_version("0.1")
+                                                  .with_build_require(gtest_ref))
+        profile_build_requires = {"*": [mingw_ref]}
+        with environment_append({"CONAN_SHARE_BUILD_REQUIRES": "True"}):
+            deps_graph = self.build_graph(GenConanfile().with_name("app").with_version("0.1")
+                                                        .with_require(lib_ref),
+                                          profile_build_requires=profile_build_requires)
+
+        self.assertEqual(4, len(deps_graph.nodes))
+        self.assertIn("Reused 2 build-requires expansions", self.output)
+        app = deps_graph.root
+        lib = app.dependencies[0].dst
+        gtest = lib.dependencies[0].dst
+        mingw = lib.dependencies[1].dst
+        self.assertIs(mingw, gtest.dependencies[0].dst)
+        self.assertIs(mingw, app.dependencies[1].dst)
+
+        self._check_node(app, "app/0.1@", deps=[lib], build_deps=[mingw], dependents=[],
+                         closure=[mingw, lib])
+
+        self._check_node(lib, "lib/0.1@user/testing#123", deps=[], build_deps=[mingw, gtest],
+                         dependents=[app], closure=[mingw, gtest])
+        self._check_node(gtest, "gtest/0.1@user/testing#123", deps=[], build_deps=[mingw],
+                         dependents=[lib], closure=[mingw])
+        # MinGW leaf node
+        self._check_node(mingw, "mingw/0.1@user/testing#123", deps=[], build_deps=[],
+                         dependents=[gtest, lib, app], closure=[])
+
+    def test_build_require_not_shared_closure(self):
+        # app -> lib -(br)-> tool -> zlib
+        #   \---------------------->/
+        # app -(br)-> tool
+        # The tool subgraph of lib cannot be reused by app, as it has zlib in its closure
+        zlib_ref = ConanFileReference.loads("zlib/0.1@user/testing")
+        tool_ref = ConanFileReference.loads("tool/0.1@user/testing")
+        lib_ref = ConanFileReference.loads("lib/0.1@user/testing")
+
+        self._cache_recipe(zlib_ref, GenConanfile().with_name("zlib").with_version("0.1"))
+        self._cache_recipe(tool_ref, GenConanfile().with_name("tool").with_version("0.1")
+                                                   .with_require(zlib_ref))
+        self._cache_recipe(lib_ref, GenConanfile().with_name("lib").with_version("0.1"))
+        profile_build_requires = {"lib*": [tool_ref], "app*": [tool_ref]}
+        with environment_append({"CONAN_SHARE_BUILD_REQUIRES": "True"}):
+            deps_graph = self.build_graph(GenConanfile().with_name("app").with_version("0.1")
+                                                        .with_require(lib_ref)
+                                                        .with_require(zlib_ref),
+                                          profile_build_requires=profile_build_requires)
+
+        self.assertEqual(6, len(deps_graph.nodes))
+        self.assertNotIn("Reused", self.output)
+        app = deps_graph.root
+        lib = app.dependencies[0].dst
+        zlib = app.dependencies[1].dst
+        tool_app = app.dependencies[2].dst
+        tool_lib = lib.dependencies[0].dst
+        self.assertIsNot(tool_app, tool_lib)
+        self.assertIs(zlib, tool_app.dependencies[0].dst)
+        self.assertIsNot(zlib, tool_lib.dependencies[0].dst)
+
     def test_conflict_transitive_build_requires(self):
         zlib_ref = ConanFileReference.loads("zlib/0.1@user/testing")
         zlib_ref2 = ConanFileReference.loads("zlib/0.2@user/testing")
@@ -0,0 +1,52 @@
+import time
+import unittest
+
+import six
+from nose.plugins.attrib import attr
+
+from conans.model.ref import ConanFileReference
+from conans.test.functional.graph.graph_manager_base import GraphManagerTest
+from conans.test.utils.tools import GenConanfile
+
+
+@attr("slow")
+@unittest.skipIf(six.PY2, "tracemalloc is only available in Python 3")
+class GraphMemoryBenchmarkTest(GraphManagerTest):
+    """ Large synthetic graph, levels of packages where every package requires 2 packages of
+    the next level, loaded and analyzed through GraphManager.load_graph
+    """
+
+    def _cache_graph(self, levels, width):
+        refs = []
+        for level in reversed(range(levels)):
+            new_refs = []
+            for i in range(width):
+                name = "pkg%s_%s" % (level, i)
+                ref = ConanFileReference.loads("%s/0.1@user/testing" % name)
+                conanfile = GenConanfile().with_name(name).with_version("0.1")
+                for require in set([refs[i], refs[(i + 1) % width]] if refs else []):
+                    conanfile.with_require(require)
+                self._cache_recipe(ref, conanfile)
+                new_refs.append(ref)
+            refs = new_refs
+        return refs
+
+    def graph_memory_test(self):
+        import tracemalloc
+
+        levels, width = 20, 100
+        refs = self._cache_graph(levels, width)
+        consumer = GenConanfile().with_name("app").with_version("0.1")
+        for ref in refs:
+            consumer.with_require(ref)
+
+        tracemalloc.start()
+        t1 = time.time()
+        deps_graph = self.build_graph(consumer, install=False)
+        elapsed = time.time() - t1
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print("Graph of %d nodes loaded in %.2f s, memory: %.1f MB (peak %.1f MB)"
+              % (len(deps_graph.nodes), elapsed, current / 1e6, peak / 1e6))
+
+        self.assertEqual(levels * width + 1, len(deps_graph.nodes))
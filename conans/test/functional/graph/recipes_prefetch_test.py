@@ -0,0 +1,90 @@
+import os
+import textwrap
+import unittest
+
+from mock import patch
+
+from conans.client.graph.graph_builder import DepsGraphBuilder
+from conans.test.utils.tools import TestClient, TestServer, GenConanfile
+from conans.util.files import save
+
+
+class RecipesPrefetchTest(unittest.TestCase):
+
+    def _upload_packages(self):
+        servers = {"default": TestServer(write_permissions=[("*/*@*/*", "*")])}
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        for name in ("LibA", "LibB", "LibC"):
+            client.save({"conanfile.py": GenConanfile()}, clean_first=True)
+            client.run("export . %s/0.1@user/testing" % name)
+        client.save({"conanfile.py": GenConanfile().with_require_plain("LibA/0.1@user/testing")
+                                                    .with_require_plain("LibB/0.1@user/testing")
+                                                    .with_require_plain("LibC/0.1@user/testing")},
+                    clean_first=True)
+        client.run("export . LibD/0.1@user/testing")
+        client.run("upload * --confirm")
+        return servers
+
+    def prefetch_test(self):
+        servers = self._upload_packages()
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        client.run("config set general.parallel_download=4")
+        client.save({"conanfile.txt": "[requires]\nLibD/0.1@user/testing"})
+        client.run("info .")
+        self.assertIn("Retrieved 3 recipes concurrently", client.out)
+        for name in ("LibA", "LibB", "LibC", "LibD"):
+            self.assertIn("%s/0.1@user/testing: Downloaded recipe revision" % name, client.out)
+        # The order of the graph is the same than the sequential one
+        client.run("info . --only=None")
+        self.assertNotIn("concurrently", client.out)
+        lines = [line for line in str(client.out).splitlines() if line.startswith("Lib")]
+        self.assertEqual(["LibA/0.1@user/testing", "LibB/0.1@user/testing",
+                          "LibC/0.1@user/testing", "LibD/0.1@user/testing"], lines)
+
+    def prefetch_missing_test(self):
+        servers = self._upload_packages()
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        client.run("config set general.parallel_download=4")
+        client.save({"conanfile.txt": "[requires]\nLibA/0.1@user/testing\n"
+                                      "LibZ/0.1@user/testing"})
+        client.run("info .", assert_error=True)
+        self.assertIn("LibA/0.1@user/testing: Downloaded recipe revision", client.out)
+        self.assertIn("ERROR: Unable to find 'LibZ/0.1@user/testing' in remotes", client.out)
+
+    def prefetch_not_used_test(self):
+        servers = self._upload_packages()
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        client.run("config set general.parallel_download=4")
+        builders = []
+        original = DepsGraphBuilder.load_graph
+
+        def load_graph(builder, *args, **kwargs):
+            builders.append(builder)
+            return original(builder, *args, **kwargs)
+
+        # LibZ fails before LibB and LibC, already prefetched, are required
+        client.save({"conanfile.txt": "[requires]\nLibZ/0.1@user/testing\n"
+                                      "LibB/0.1@user/testing\nLibC/0.1@user/testing"})
+        with patch.object(DepsGraphBuilder, "load_graph", new=load_graph):
+            client.run("info .", assert_error=True)
+        self.assertIn("LibB/0.1@user/testing: Downloaded recipe revision", client.out)
+        self.assertEqual({}, builders[0]._prefetched)
+
+    def prefetch_hooks_test(self):
+        servers = self._upload_packages()
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        client.run("config set general.parallel_download=4")
+        save(os.path.join(client.cache.hooks_path, "myhook.py"), textwrap.dedent("""
+            def post_download_recipe(output, reference, **kwargs):
+                output.info("Downloaded %s" % str(reference))
+            """))
+        client.run("config set hooks.myhook")
+        # All the recipes are downloaded concurrently, the hooks were not loaded yet
+        client.save({"conanfile.txt": "[requires]\nLibA/0.1@user/testing\n"
+                                      "LibB/0.1@user/testing\nLibC/0.1@user/testing\n"
+                                      "LibD/0.1@user/testing"})
+        client.run("info .")
+        self.assertIn("Retrieved 4 recipes concurrently", client.out)
+        for name in ("LibA", "LibB", "LibC", "LibD"):
+            self.assertEqual(1, str(client.out).count("post_download_recipe(): Downloaded %s/"
+                                                      % name))
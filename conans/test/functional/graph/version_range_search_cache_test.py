@@ -0,0 +1,58 @@
+import json
+import os
+import unittest
+
+from mock import patch
+
+from conans.client.cache.remote_search_cache import REMOTE_SEARCH_CACHE_FOLDER
+from conans.client.remote_manager import RemoteManager
+from conans.test.utils.tools import GenConanfile, TestClient, TestServer
+from conans.util.files import load, save
+
+
+class VersionRangeSearchCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(servers={"default": TestServer()},
+                                 users={"default": [("lasote", "mypass")]})
+        self.client.save({"conanfile.py": GenConanfile()})
+        self.client.run("create . pkg/1.0@lasote/testing")
+        self.client.run("upload pkg* -r=default --all --confirm")
+        self.client.run("remove * -f")
+        self.client.run("config set general.remote_search_cache_ttl=3600")
+        self.client.save({"conanfile.txt": "[requires]\npkg/[>=1.0]@lasote/testing"},
+                         clean_first=True)
+
+    def _install(self, args=""):
+        self.client.run("remove * -f")
+        with patch.object(RemoteManager, "search_recipes", autospec=True,
+                          side_effect=RemoteManager.search_recipes) as search:
+            self.client.run("install . %s" % args)
+        self.assertIn("resolved to 'pkg/1.0@lasote/testing' in remote 'default'",
+                      self.client.out)
+        return search.call_count
+
+    def cached_search_test(self):
+        self.assertEqual(1, self._install())
+        self.assertEqual(0, self._install())
+        self.assertEqual(1, self._install("--update"))
+        self.assertEqual(0, self._install())
+
+        self.client.run("remove --search-cache")
+        self.assertIn("Remote search cache removed", self.client.out)
+        self.assertEqual(1, self._install())
+
+    def expired_test(self):
+        self.assertEqual(1, self._install())
+        folder = os.path.join(self.client.cache_folder, REMOTE_SEARCH_CACHE_FOLDER)
+        for f in os.listdir(folder):
+            data = json.loads(load(os.path.join(folder, f)))
+            data["timestamp"] -= 3601
+            save(os.path.join(folder, f), json.dumps(data))
+        self.assertEqual(1, self._install())
+        self.assertEqual(0, self._install())
+
+    def disabled_test(self):
+        self.client.run("config rm general.remote_search_cache_ttl")
+        self.assertEqual(1, self._install())
+        self.assertEqual(1, self._install())
@@ -0,0 +1,54 @@
+import unittest
+
+from mock import patch
+
+from conans.client.graph import range_resolver
+from conans.client.remote_manager import RemoteManager
+from conans.test.utils.tools import GenConanfile, TestClient, TestServer
+
+
+class VersionRangesBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(servers={"default": TestServer()},
+                                 users={"default": [("lasote", "mypass")]})
+        self.client.save({"conanfile.py": GenConanfile()})
+        for ref in ("liba/1.0", "liba/1.1", "libb/1.0", "libc/1.0"):
+            self.client.run("create . %s@lasote/testing" % ref)
+        self.client.run("upload lib* -r=default --all --confirm")
+        self.client.save({"conanfile.txt": "[requires]\n"
+                                           "liba/[>=1.0]@lasote/testing\n"
+                                           "libb/[>=1.0]@lasote/testing\n"
+                                           "libc/[~1]@lasote/testing"},
+                         clean_first=True)
+
+    def _check_resolved(self):
+        for ref in ("liba/1.1", "libb/1.0", "libc/1.0"):
+            self.assertIn("%s@lasote/testing:5ab84d6acfe1f23c4fae0ab88f26e3a396351ac9"
+                          % ref, self.client.out)
+
+    def local_cache_scanned_once_test(self):
+        with patch.object(range_resolver, "search_recipes",
+                          side_effect=range_resolver.search_recipes) as search:
+            self.client.run("install .")
+        self._check_resolved()
+        self.assertEqual(1, search.call_count)
+
+    def remote_searches_test(self):
+        self.client.run("config set general.parallel_download=4")
+        self.client.run("remove * -f")
+        with patch.object(RemoteManager, "search_recipes", autospec=True,
+                          side_effect=RemoteManager.search_recipes) as search:
+            self.client.run("install .")
+        self._check_resolved()
+        self.assertIn("resolved to 'liba/1.1@lasote/testing' in remote 'default'",
+                      self.client.out)
+        searched = sorted(call[0][2] for call in search.call_args_list)
+        self.assertEqual(["liba", "libb", "libc"], searched)
+
+        # With --update, the remotes are searched first
+        with patch.object(RemoteManager, "search_recipes", autospec=True,
+                          side_effect=RemoteManager.search_recipes) as search:
+            self.client.run("install . --update")
+        self._check_resolved()
+        self.assertEqual(3, search.call_count)
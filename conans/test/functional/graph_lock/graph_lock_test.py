@@ -56,6 +56,26 @@ class GraphLockConanfileTXTTest(unittest.TestCase):
         self.assertNotIn("pkg/0.1", client2.out)
 
 
+class GraphLockNodeIdsTest(unittest.TestCase):
+    def sequential_ids_test(self):
+        client = TestClient()
+        client.save({"conanfile.py": GenConanfile()})
+        client.run("create . pkg/0.1@user/testing")
+        client.save({"conanfile.py": GenConanfile().with_name("app").with_version("0.1")
+                                                   .with_require_plain("pkg/0.1@user/testing")})
+        client.run("graph lock .")
+        lock = json.loads(load(os.path.join(client.current_folder, LOCKFILE)))
+        nodes = lock["graph_lock"]["nodes"]
+        self.assertEqual({"0", "1"}, set(nodes))
+        self.assertEqual(["1"], list(nodes["0"]["requires"].values()))
+
+        # New nodes of a graph with lockfile do not collide with the locked ones
+        client.run("install . --lockfile")
+        self.assertIn("pkg/0.1@user/testing from local cache - Cache", client.out)
+        lock = json.loads(load(os.path.join(client.current_folder, LOCKFILE)))
+        self.assertEqual({"0", "1"}, set(lock["graph_lock"]["nodes"]))
+
+
 class GraphLockCustomFilesTest(unittest.TestCase):
     consumer = GenConanfile().with_name("PkgB").with_version("0.1")\
                              .with_require_plain("PkgA/[>=0.1]@user/channel")
@@ -0,0 +1,146 @@
+import os
+import textwrap
+import time
+import unittest
+from collections import OrderedDict
+
+from conans.client.cache.archive_cache import ARCHIVE_CACHE_FOLDER, ArchiveCache
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import NO_SETTINGS_PACKAGE_ID, TestClient, TestServer
+from conans.util.files import load, save
+
+
+class ArchiveCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = OrderedDict()
+        for name in ("default", "other"):
+            self.servers[name] = TestServer(write_permissions=[("*/*@*/*", "*")])
+        self.users = {name: [("lasote", "mypass")] for name in self.servers}
+        self.conanfile = textwrap.dedent("""
+            from conans import ConanFile
+
+            class Pkg(ConanFile):
+                exports = "*.txt"
+                exports_sources = "*.cpp"
+
+                def package(self):
+                    self.copy("*.cpp")
+            """)
+
+    def _client(self):
+        client = TestClient(servers=self.servers, users=self.users)
+        client.run("config set general.archive_cache_size=100")
+        return client
+
+    def upload_again_test(self):
+        client = self._client()
+        client.save({"conanfile.py": self.conanfile,
+                     "data.txt": "data",
+                     "source.cpp": "source"})
+        client.run("create . pkg/0.1@user/testing")
+        client.run("upload pkg/0.1@user/testing --all --confirm")
+        self.assertIn("Compressing recipe", client.out)
+        self.assertIn("Compressing package", client.out)
+        # The archives are not kept in the export and package folders, but in the archive cache
+        ref = ConanFileReference.loads("pkg/0.1@user/testing")
+        pref = PackageReference(ref, NO_SETTINGS_PACKAGE_ID)
+        layout = client.cache.package_layout(ref)
+        self.assertNotIn("conan_package.tgz", os.listdir(layout.package(pref)))
+        self.assertNotIn("conan_export.tgz", os.listdir(layout.export()))
+        self.assertEqual(2, len(os.listdir(os.path.join(client.cache_folder,
+                                                        ARCHIVE_CACHE_FOLDER))))
+
+        client.run("upload pkg/0.1@user/testing --all --confirm -r=other")
+        self.assertIn("Uploaded conan recipe 'pkg/0.1@user/testing' to 'other'", client.out)
+        self.assertNotIn("Compressing", client.out)
+
+        # A different package is compressed again
+        client.save({"source.cpp": "changed"})
+        client.run("create . pkg/0.1@user/testing")
+        client.run("upload pkg/0.1@user/testing --all --confirm -r=other")
+        self.assertIn("Compressing recipe", client.out)
+        self.assertIn("Compressing package", client.out)
+
+        # Anyone can install the uploaded archives
+        client = TestClient(servers=self.servers, users=self.users)
+        client.run("install pkg/0.1@user/testing -r=other")
+        self.assertEqual("changed", load(os.path.join(client.cache.package_layout(ref)
+                                                      .package(pref), "source.cpp")))
+
+    def promote_downloaded_test(self):
+        client = TestClient(servers=self.servers, users=self.users)
+        client.save({"conanfile.py": self.conanfile,
+                     "data.txt": "data",
+                     "source.cpp": "source"})
+        client.run("create . pkg/0.1@user/testing")
+        client.run("upload pkg/0.1@user/testing --all --confirm")
+
+        client = self._client()
+        client.run("install pkg/0.1@user/testing --build")  # It downloads the sources too
+        client.run("upload pkg/0.1@user/testing --all --confirm -r=other")
+        self.assertNotIn("Compressing recipe", client.out)
+        self.assertIn("Compressing package", client.out)
+
+        client = self._client()
+        client.run("install pkg/0.1@user/testing")
+        client.run("upload pkg/0.1@user/testing --all --confirm -r=other --force")
+        self.assertIn("Uploading conan_package.tgz", client.out)
+        self.assertNotIn("Compressing", client.out)
+
+
+class ArchiveCacheEvictionTest(unittest.TestCase):
+
+    def eviction_test(self):
+        folder = temp_folder()
+        archive_cache = ArchiveCache(folder, max_size=1)
+        now = time.time()
+        for i in range(4):
+            path = os.path.join(folder, "conan_package.tgz")
+            save(path, "%d" % i * 300 * 1024)
+            self.assertIsNone(archive_cache.get("hash%d" % i, "conan_package.tgz"))
+            cache_path = archive_cache.store("hash%d" % i, "conan_package.tgz", path)
+            self.assertFalse(os.path.exists(path))
+            os.utime(cache_path, (now + i, now + i))
+            if i == 1:  # The least recently used is hash1, not hash0
+                os.utime(archive_cache.get("hash0", "conan_package.tgz"), (now + 2, now + 2))
+
+        self.assertIsNone(archive_cache.get("hash1", "conan_package.tgz"))
+        for i in (0, 2, 3):
+            self.assertEqual("%d" % i * 300 * 1024,
+                             load(archive_cache.get("hash%d" % i, "conan_package.tgz")))
+
+        # Bigger than the cache, not stored
+        path = os.path.join(folder, "conan_package.tgz")
+        save(path, "4" * 2 * 1024 * 1024)
+        self.assertIsNone(archive_cache.store("hash4", "conan_package.tgz", path))
+        self.assertTrue(os.path.exists(path))
+
+    def in_use_test(self):
+        # The archives other threads are uploading are not evicted
+        folder = temp_folder()
+        archive_cache = ArchiveCache(folder, max_size=1)
+        path = os.path.join(folder, "conan_package.tgz")
+        save(path, "0" * 600 * 1024)
+        with ArchiveCache(folder, max_size=1).in_use("hash0"):
+            archive_cache.store("hash0", "conan_package.tgz", path)
+            save(path, "1" * 600 * 1024)
+            archive_cache.store("hash1", "conan_package.tgz", path)
+            self.assertIsNotNone(archive_cache.get("hash0", "conan_package.tgz"))
+            self.assertIsNotNone(archive_cache.get("hash1", "conan_package.tgz"))
+
+        save(path, "2" * 600 * 1024)
+        archive_cache.store("hash2", "conan_package.tgz", path)
+        self.assertIsNone(archive_cache.get("hash0", "conan_package.tgz"))
+        self.assertIsNone(archive_cache.get("hash1", "conan_package.tgz"))
+        self.assertIsNotNone(archive_cache.get("hash2", "conan_package.tgz"))
+
+    def disabled_test(self):
+        folder = temp_folder()
+        archive_cache = ArchiveCache(folder, max_size=None)
+        path = os.path.join(folder, "conan_package.tgz")
+        save(path, "contents")
+        self.assertIsNone(archive_cache.store("hash", "conan_package.tgz", path))
+        self.assertIsNone(archive_cache.get("hash", "conan_package.tgz"))
+        self.assertTrue(os.path.exists(path))
@@ -0,0 +1,153 @@
+import os
+import textwrap
+import unittest
+
+import six
+
+from conans import REVISIONS
+from conans.client.archive_codecs import XzCodec, filter_archives
+from conans.errors import ConanException
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.test.utils.tools import NO_SETTINGS_PACKAGE_ID, TestClient, TestServer
+from conans.util.files import load
+
+
+@unittest.skipUnless(XzCodec.available(), "Requires lzma")
+class ArchiveCodecsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.ref = ConanFileReference.loads("pkg/0.1@user/testing")
+        conanfile = textwrap.dedent("""
+            import os
+            from conans import ConanFile
+
+            class Pkg(ConanFile):
+                exports = "*.txt"
+                exports_sources = "*.cpp"
+
+                def package(self):
+                    self.copy("*.cpp")
+            """)
+        self.files = {"conanfile.py": conanfile,
+                      "data.txt": "data",
+                      "source.cpp": "source"}
+
+    def _upload(self, server, archive_codec):
+        client = TestClient(servers={"default": server},
+                            users={"default": [("lasote", "mypass")]}, revisions_enabled=True)
+        client.run('config set "general.archive_codec=%s"' % archive_codec)
+        client.save(self.files)
+        client.run("create . pkg/0.1@user/testing")
+        client.run("upload pkg/0.1@user/testing --all --confirm")
+        rrev = client.cache.package_layout(self.ref).load_metadata().recipe.revision
+        ref = self.ref.copy_with_rev(rrev)
+        pref = PackageReference(ref, NO_SETTINGS_PACKAGE_ID)
+        prev = server.server_store.get_last_package_revision(pref).revision
+        pref = pref.copy_with_revs(rrev, prev)
+        return client, (sorted(server.server_store.get_recipe_file_list(ref)) +
+                        sorted(server.server_store.get_package_file_list(pref)))
+
+    def xz_test(self):
+        server = TestServer(write_permissions=[("*/*@*/*", "*")])
+        client, files = self._upload(server, "xz")
+        self.assertEqual(["conan_export.txz", "conan_sources.txz", "conanfile.py",
+                          "conanmanifest.txt", "conan_package.txz", "conaninfo.txt",
+                          "conanmanifest.txt"], files)
+
+        # Any client can download them, the archive codec is detected
+        client = TestClient(servers={"default": server},
+                            users={"default": [("lasote", "mypass")]}, revisions_enabled=True)
+        client.run("install pkg/0.1@user/testing")
+        self.assertIn("pkg/0.1@user/testing: Package installed", client.out)
+        layout = client.cache.package_layout(self.ref)
+        pref = PackageReference(self.ref, NO_SETTINGS_PACKAGE_ID)
+        self.assertEqual("source", load(os.path.join(layout.package(pref), "source.cpp")))
+        self.assertEqual("data", load(os.path.join(layout.export(), "data.txt")))
+        self.assertEqual(["conaninfo.txt", "conanmanifest.txt", "source.cpp"],
+                         sorted(os.listdir(layout.package(pref))))
+
+        # Uploading it again to other remote recompresses the recipe sources with gzip
+        other = TestServer(write_permissions=[("*/*@*/*", "*")])
+        client.servers["other"] = other
+        client.users["other"] = [("lasote", "mypass")]
+        client.run("remote add other %s" % other.fake_url)
+        client.run("upload pkg/0.1@user/testing --all --confirm -r=other")
+        ref = self.ref.copy_with_rev(layout.load_metadata().recipe.revision)
+        self.assertEqual(["conan_export.tgz", "conan_sources.tgz", "conanfile.py",
+                          "conanmanifest.txt"],
+                         sorted(other.server_store.get_recipe_file_list(ref)))
+
+    def switch_codec_test(self):
+        # The archives of the previous codec are replaced in the remote
+        for revisions_enabled in (False, True):
+            server = TestServer(write_permissions=[("*/*@*/*", "*")])
+            client = TestClient(servers={"default": server},
+                                users={"default": [("lasote", "mypass")]},
+                                revisions_enabled=revisions_enabled)
+            client.save(self.files)
+            client.run("create . pkg/0.1@user/testing")
+            client.run("upload pkg/0.1@user/testing --all --confirm")
+            client.run("config set general.archive_codec=xz")
+            if not revisions_enabled:  # The same package is overwritten
+                client.save({"source.cpp": "changed"})
+                client.run("create . pkg/0.1@user/testing")
+            client.run("upload pkg/0.1@user/testing --all --confirm --force")
+
+            ref = self.ref.copy_with_rev(server.server_store.get_last_revision(self.ref).revision)
+            pref = PackageReference(ref, NO_SETTINGS_PACKAGE_ID)
+            pref = pref.copy_with_revs(ref.revision,
+                                       server.server_store.get_last_package_revision(pref).revision)
+            self.assertEqual(["conan_package.txz", "conaninfo.txt", "conanmanifest.txt"],
+                             sorted(server.server_store.get_package_file_list(pref)))
+            if not revisions_enabled:  # APIv2 doesn't remove files of the recipe revision
+                self.assertNotIn("conan_export.tgz",
+                                 server.server_store.get_recipe_file_list(ref))
+
+            client = TestClient(servers={"default": server},
+                                users={"default": [("lasote", "mypass")]},
+                                revisions_enabled=revisions_enabled)
+            client.run("install pkg/0.1@user/testing")
+            layout = client.cache.package_layout(self.ref)
+            self.assertEqual("changed" if not revisions_enabled else "source",
+                             load(os.path.join(layout.package(pref.copy_clear_revs()),
+                                               "source.cpp")))
+
+    def not_supported_test(self):
+        server = TestServer(write_permissions=[("*/*@*/*", "*")],
+                            server_capabilities=[REVISIONS])
+        client, files = self._upload(server, "xz")
+        self.assertIn("WARN: Remote 'default' doesn't support 'xz' archives, using 'gzip'",
+                      client.out)
+        self.assertEqual(["conan_export.tgz", "conan_sources.tgz", "conanfile.py",
+                          "conanmanifest.txt", "conan_package.tgz", "conaninfo.txt",
+                          "conanmanifest.txt"], files)
+
+    def per_remote_test(self):
+        server = TestServer(write_permissions=[("*/*@*/*", "*")])
+        client, files = self._upload(server, "xz, default=gzip")
+        self.assertIn("conan_package.tgz", files)
+        server = TestServer(write_permissions=[("*/*@*/*", "*")])
+        client, files = self._upload(server, "other=gzip, default=xz")
+        self.assertIn("conan_package.txz", files)
+
+    def unknown_codec_test(self):
+        client = TestClient(servers={"default": TestServer()},
+                            users={"default": [("lasote", "mypass")]})
+        client.run("config set general.archive_codec=zstd")
+        client.save(self.files)
+        client.run("create . pkg/0.1@user/testing")
+        client.run("upload pkg/0.1@user/testing --all --confirm", assert_error=True)
+        self.assertIn("Unknown archive codec 'zstd', use one of: gzip, xz", client.out)
+
+
+class FilterArchivesTest(unittest.TestCase):
+
+    def filter_test(self):
+        files = ["conanfile.py", "conan_export.tgz", "conan_sources.txz", "conanmanifest.txt"]
+        self.assertEqual(files, filter_archives("conan_export.tgz", files))
+        self.assertEqual(["conanfile.py", "conan_export.tgz"],
+                         filter_archives("conan_export.tgz",
+                                         ["conanfile.py", "conan_export.txz", "conan_export.tgz"]))
+        with six.assertRaisesRegex(self, ConanException, "not prepared to handle "
+                                                         "'conan_package.tzst'"):
+            filter_archives("conan_package.tgz", ["conaninfo.txt", "conan_package.tzst"])
@@ -0,0 +1,111 @@
+import os
+import textwrap
+import unittest
+
+from mock import patch
+
+from conans.client.rest.uploader_downloader import FileUploader
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.test.utils.tools import NO_SETTINGS_PACKAGE_ID, TestClient, TestServer
+from conans.util.files import load, md5sum
+
+
+class ChecksumDeployTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = TestServer(write_permissions=[("*/*@*/*", "*")])
+        self.client = TestClient(servers={"default": self.server},
+                                 users={"default": [("lasote", "mypass")]},
+                                 revisions_enabled=True)
+        conanfile = textwrap.dedent("""
+            from conans import ConanFile
+
+            class Pkg(ConanFile):
+                exports_sources = "*.cpp"
+
+                def package(self):
+                    self.copy("*.cpp")
+            """)
+        self.client.save({"conanfile.py": conanfile,
+                          "source.cpp": "source"})
+
+    def _upload(self, ref):
+        uploaded = []
+        original_upload_file = FileUploader._upload_file
+
+        def _upload_file(uploader, url, abs_path, headers, auth):
+            uploaded.append(os.path.basename(abs_path))
+            return original_upload_file(uploader, url, abs_path, headers, auth)
+
+        self.client.run("create . %s" % ref)
+        with patch.object(FileUploader, "_upload_file", new=_upload_file):
+            self.client.run("upload %s --all --confirm" % ref)
+        return sorted(uploaded)
+
+    def _server_file(self, ref, filename):
+        ref = ConanFileReference.loads(ref)
+        rrev = self.server.server_store.get_last_revision(ref).revision
+        pref = PackageReference(ref.copy_with_rev(rrev), NO_SETTINGS_PACKAGE_ID)
+        prev = self.server.server_store.get_last_package_revision(pref).revision
+        if filename in ("conan_package.tgz", "conaninfo.txt"):
+            return self.server.server_store.get_package_file_path(pref.copy_with_revs(rrev, prev),
+                                                                  filename)
+        return self.server.server_store.get_conanfile_file_path(pref.ref, filename)
+
+    def checksum_deploy_test(self):
+        self.assertEqual(["conan_package.tgz", "conan_sources.tgz", "conanfile.py",
+                          "conaninfo.txt", "conanmanifest.txt", "conanmanifest.txt"],
+                         self._upload("pkg/0.1@user/testing"))
+
+        # The identical files of other channel are not transferred, just linked
+        uploaded = self._upload("pkg/0.1@user/stable")
+        for filename in ("conan_sources.tgz", "conanfile.py", "conan_package.tgz",
+                         "conaninfo.txt"):
+            self.assertNotIn(filename, uploaded)
+            testing = os.stat(self._server_file("pkg/0.1@user/testing", filename))
+            stable = os.stat(self._server_file("pkg/0.1@user/stable", filename))
+            self.assertEqual(testing.st_ino, stable.st_ino)
+
+        client = TestClient(servers={"default": self.server},
+                            users={"default": [("lasote", "mypass")]}, revisions_enabled=True)
+        client.run("install pkg/0.1@user/stable --build")
+        self.assertIn("pkg/0.1@user/stable: Package '%s' created" % NO_SETTINGS_PACKAGE_ID,
+                      client.out)
+
+        # The linked files are kept when one of the channels is removed
+        self.client.run("remove pkg/0.1@user/testing -f -r=default")
+        sources_path = self._server_file("pkg/0.1@user/stable", "conan_sources.tgz")
+        self.assertEqual(2, os.stat(sources_path).st_nlink)
+        self.client.run("remove pkg/0.1@user/stable -f -r=default")
+        self.assertEqual([], os.listdir(os.path.join(self.server.server_store.store, ".blobs")))
+
+    def no_write_permissions_test(self):
+        self._upload("pkg/0.1@user/testing")
+        self.server.test_server.ra.api_v2.authorizer.write_permissions = [("*/*@*/testing", "*")]
+        self.client.run("create . pkg/0.1@user/stable")
+        self.client.run("upload pkg/0.1@user/stable --all --confirm", assert_error=True)
+        self.assertIn("Permission denied", self.client.out)
+
+    def upload_checksums_test(self):
+        self._upload("pkg/0.1@user/testing")
+        ref = ConanFileReference.loads("pkg/0.1@user/testing")
+        ref = self.server.server_store.get_last_revision(ref)
+        ref = ConanFileReference.loads("pkg/0.1@user/testing#%s" % ref.revision)
+        # The checksums computed when receiving the files are used, they are not read again
+        with patch("conans.server.store.disk_adapter.file_checksums") as hash_mock:
+            snapshot = self.server.server_store.get_recipe_snapshot(ref)
+        self.assertFalse(hash_mock.called)
+        path = self._server_file("pkg/0.1@user/testing", "conan_sources.tgz")
+        self.assertEqual(md5sum(path), snapshot["conan_sources.tgz"])
+        self.assertEqual([], self.server.server_store.scrub())
+
+        # A file corrupted in the storage, that keeps its size and modification time
+        st = os.stat(path)
+        contents = load(path, binary=True)
+        with open(path, "wb") as f:
+            f.write(contents[:-1] + (b"A" if contents[-1:] != b"A" else b"B"))
+        os.utime(path, (st.st_atime, st.st_mtime))
+        if getattr(st, "st_mtime_ns", None) is not None:
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertEqual([os.path.relpath(path, self.server.server_store.store)],
+                         self.server.server_store.scrub())
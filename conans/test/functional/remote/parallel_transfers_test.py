@@ -0,0 +1,95 @@
+import os
+import textwrap
+import threading
+import unittest
+
+from mock import patch
+
+from conans.client.rest.uploader_downloader import FileDownloader, FileUploader
+from conans.errors import ConanException
+from conans.model.ref import ConanFileReference
+from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME
+from conans.test.utils.tools import TestClient, TestServer
+
+
+class ParallelTransfersTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = TestServer(write_permissions=[("*/*@*/*", "*")])
+        self.client = TestClient(servers={"default": self.server},
+                                 users={"default": [("lasote", "mypass")]},
+                                 revisions_enabled=True)
+        self.client.run("config set general.parallel_download=4")
+        conanfile = textwrap.dedent("""
+            from conans import ConanFile
+
+            class Pkg(ConanFile):
+                exports = "*.txt"
+                exports_sources = "*.cpp"
+            """)
+        self.client.save({"conanfile.py": conanfile,
+                          "data.txt": "data",
+                          "source.cpp": "source"})
+        self.client.run("create . pkg/0.1@user/testing")
+        self.ref = ConanFileReference.loads("pkg/0.1@user/testing")
+
+    @staticmethod
+    def _patch_transfer(cls, method):
+        """ records the transferred files and the threads doing it, waiting for a concurrent
+        transfer, if any, to start before finishing
+        """
+        original = getattr(cls, method)
+        transferred = {}
+        started = threading.Event()
+        main_thread = threading.current_thread()
+
+        def _transfer(self, url, *args, **kwargs):
+            transferred[os.path.basename(url)] = threading.current_thread()
+            if threading.current_thread() is not main_thread:
+                started.set() if len(transferred) > 1 else started.wait(1)
+            return original(self, url, *args, **kwargs)
+
+        return transferred, patch.object(cls, method, new=_transfer)
+
+    def upload_download_test(self):
+        uploaded, patcher = self._patch_transfer(FileUploader, "upload")
+        with patcher:
+            self.client.run("upload pkg/0.1@user/testing --all --confirm")
+        self.assertEqual({"conanfile.py", "conanmanifest.txt", EXPORT_TGZ_NAME,
+                          EXPORT_SOURCES_TGZ_NAME, "conaninfo.txt", "conan_package.tgz"},
+                         set(uploaded))
+        # The package tgz is alone in its group, uploaded before the package metadata files
+        self.assertEqual(["conan_package.tgz"],
+                         [f for f, t in uploaded.items() if t is threading.current_thread()])
+        self.assertIn("Uploading conan_export.tgz, conan_sources.tgz", self.client.out)
+
+        self.client.run("remove * -f")
+        downloaded, patcher = self._patch_transfer(FileDownloader, "download")
+        with patcher:
+            self.client.run("install pkg/0.1@user/testing")
+        self.assertEqual({"conanfile.py", "conanmanifest.txt", EXPORT_TGZ_NAME,
+                          "conaninfo.txt", "conan_package.tgz"}, set(downloaded))
+        self.assertNotIn(threading.current_thread(), downloaded.values())
+        self.assertIn("pkg/0.1@user/testing: Package installed", self.client.out)
+
+        layout = self.client.cache.package_layout(self.ref)
+        self.assertTrue(os.path.isfile(os.path.join(layout.export(), "data.txt")))
+        self.client.run("install pkg/0.1@user/testing --build")
+        self.assertTrue(os.path.isfile(os.path.join(layout.export_sources(), "source.cpp")))
+
+    def download_failure_test(self):
+        self.client.run("upload pkg/0.1@user/testing --all --confirm")
+        self.client.run("remove * -f")
+        original = FileDownloader.download
+
+        def _download(downloader, url, *args, **kwargs):
+            if url.endswith(EXPORT_TGZ_NAME):
+                raise ConanException("Broken download")
+            return original(downloader, url, *args, **kwargs)
+
+        with patch.object(FileDownloader, "download", new=_download):
+            self.client.run("install pkg/0.1@user/testing", assert_error=True)
+        self.assertIn("Broken download", self.client.out)
+        self.client.run("remove * -f")
+        self.client.run("install pkg/0.1@user/testing")
+        self.assertIn("pkg/0.1@user/testing: Package installed", self.client.out)
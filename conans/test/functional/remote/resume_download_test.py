@@ -0,0 +1,96 @@
+import os
+import textwrap
+import unittest
+
+from mock import patch
+from requests.exceptions import ConnectionError
+
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import PACKAGE_TGZ_NAME
+from conans.test.utils.tools import NO_SETTINGS_PACKAGE_ID, TestClient, TestServer, \
+    TestingResponse
+
+ref = ConanFileReference.loads("pkg/0.1@user/testing")
+pref = PackageReference(ref, NO_SETTINGS_PACKAGE_ID)
+
+
+class ResumeDownloadTest(unittest.TestCase):
+
+    def setUp(self):
+        server = TestServer(write_permissions=[("*/*@*/*", "*")])
+        self.client = TestClient(servers={"default": server},
+                                 users={"default": [("lasote", "mypass")]},
+                                 revisions_enabled=True)
+        self.client.run("config set general.retry_wait=0")
+        conanfile = textwrap.dedent("""
+            import os
+            from conans import ConanFile
+
+            class Pkg(ConanFile):
+                def package(self):
+                    with open(os.path.join(self.package_folder, "data.bin"), "wb") as f:
+                        f.write(os.urandom(1024 * 1024))
+            """)
+        self.client.save({"conanfile.py": conanfile})
+        self.client.run("create . pkg/0.1@user/testing")
+        self.client.run("upload pkg/0.1@user/testing --all --confirm")
+        self.package_folder = self.client.cache.package_layout(ref).package(pref)
+        with open(os.path.join(self.package_folder, "data.bin"), "rb") as f:
+            self.data = f.read()
+        self.client.run("remove * -f")
+
+    def _install(self, drop):
+        """ installs the package, calling drop(content, attempt) to get the chunks of every
+        conan_package.tgz response
+        """
+        original = TestingResponse.iter_content
+        ranges = []
+
+        def _iter_content(response, chunk_size=1):
+            request = response.test_response.request
+            if not request.path.endswith(PACKAGE_TGZ_NAME):
+                return original(response, chunk_size)
+            ranges.append(request.headers.get("Range"))
+            return drop(response.content, len(ranges))
+
+        with patch.object(TestingResponse, "iter_content", new=_iter_content):
+            self.client.run("install pkg/0.1@user/testing")
+        return ranges
+
+    def _check_installed(self):
+        self.assertIn("pkg/0.1@user/testing: Package installed", self.client.out)
+        with open(os.path.join(self.package_folder, "data.bin"), "rb") as f:
+            self.assertEqual(self.data, f.read())
+        self.assertEqual(["conaninfo.txt", "conanmanifest.txt", "data.bin"],
+                         sorted(os.listdir(self.package_folder)))
+
+    def resume_test(self):
+        size = []
+
+        def drop(content, attempt):
+            if attempt == 1:
+                size.append(len(content))
+                yield content[:len(content) // 2]
+                raise ConnectionError("Connection dropped")
+            yield content
+
+        ranges = self._install(drop)
+        self.assertEqual([None, "bytes=%d-" % (size[0] // 2)], ranges)
+        self.assertIn("Connection dropped", self.client.out)
+        self.assertIn("Resuming download of %s from byte %d" % (PACKAGE_TGZ_NAME, size[0] // 2),
+                      self.client.out)
+        self._check_installed()
+
+    def corrupted_test(self):
+        def drop(content, attempt):
+            if attempt == 1:
+                yield b"x" * (len(content) // 2)
+                raise ConnectionError("Connection dropped")
+            yield content
+
+        ranges = self._install(drop)
+        # The resumed file doesn't match the checksum of the server, downloaded again
+        self.assertEqual(3, len(ranges))
+        self.assertIsNone(ranges[2])
+        self.assertIn("Checksum verification failed", self.client.out)
+        self._check_installed()
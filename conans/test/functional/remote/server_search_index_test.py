@@ -0,0 +1,94 @@
+import os
+import textwrap
+import unittest
+
+from mock import patch
+
+from conans.model.info import ConanInfo
+from conans.model.ref import ConanFileReference
+from conans.server.store.search_index import SEARCH_INDEX_FILE
+from conans.test.utils.tools import TestClient, TestServer
+from conans.util.files import rmdir
+
+
+class ServerSearchIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = TestServer(write_permissions=[("*/*@*/*", "*")])
+        conanfile = textwrap.dedent("""
+            from conans import ConanFile
+
+            class Pkg(ConanFile):
+                settings = "os"
+            """)
+        self.files = {"conanfile.py": conanfile}
+
+    def _client(self, revisions_enabled):
+        client = TestClient(servers={"default": self.server},
+                            users={"default": [("lasote", "mypass")]},
+                            revisions_enabled=revisions_enabled)
+        client.save(self.files)
+        return client
+
+    def _check_search(self, client, packages):
+        # The searches don't walk the store, nor load any conaninfo.txt
+        with patch("conans.server.store.server_store.list_folder_subdirs",
+                   side_effect=AssertionError("Store walked")), \
+                patch.object(ConanInfo, "loads", side_effect=AssertionError("Info loaded")):
+            client.run("search -r=default")
+            for ref in packages:
+                self.assertIn(ref, client.out)
+            for ref, settings in packages.items():
+                client.run("search %s -r=default" % ref)
+                for os_ in ("Windows", "Linux", "Macos"):
+                    if os_ in settings:
+                        self.assertIn("os: %s" % os_, client.out)
+                    else:
+                        self.assertNotIn("os: %s" % os_, client.out)
+                client.run('search %s -r=default -q "os=Windows"' % ref)
+                self.assertEqual("Windows" in settings, "os: Windows" in client.out)
+
+    def _test_upload_remove(self, revisions_enabled):
+        client = self._client(revisions_enabled)
+        for ref in ("pkg/0.1@user/testing", "other/0.1@user/testing"):
+            for os_ in ("Windows", "Linux"):
+                client.run("create . %s -s os=%s" % (ref, os_))
+        client.run("upload * --all --confirm")
+        self._check_search(client, {"pkg/0.1@user/testing": ["Windows", "Linux"],
+                                    "other/0.1@user/testing": ["Windows", "Linux"]})
+
+        client.run('remove pkg/0.1@user/testing -q "os=Linux" -r=default -f')
+        client.run("remove other/0.1@user/testing -r=default -f")
+        client.run("search -r=default")
+        self.assertNotIn("other/0.1@user/testing", client.out)
+        self._check_search(client, {"pkg/0.1@user/testing": ["Windows"]})
+
+        client.run("create . pkg/0.1@user/testing -s os=Macos")
+        client.run('upload pkg/0.1@user/testing -q "os=Macos" --confirm')
+        self._check_search(client, {"pkg/0.1@user/testing": ["Windows", "Macos"]})
+
+    def upload_remove_v1_test(self):
+        self._test_upload_remove(revisions_enabled=False)
+
+    def upload_remove_v2_test(self):
+        self._test_upload_remove(revisions_enabled=True)
+
+    def rebuild_test(self):
+        client = self._client(revisions_enabled=True)
+        client.run("create . pkg/0.1@user/testing -s os=Windows")
+        client.run("upload * --all --confirm")
+
+        # Removing the index file, it is built again from the store
+        os.remove(os.path.join(self.server.server_store.store, SEARCH_INDEX_FILE))
+        client.run("search pkg/0.1@user/testing -r=default")
+        self.assertIn("os: Windows", client.out)
+        self._check_search(client, {"pkg/0.1@user/testing": ["Windows"]})
+
+        # The changes made directly in the store are not seen until the index is rebuilt
+        server_store = self.server.server_store
+        ref = ConanFileReference.loads("pkg/0.1@user/testing")
+        ref = ref.copy_with_rev(server_store.get_last_revision(ref).revision)
+        rmdir(server_store.packages(ref))
+        self._check_search(client, {"pkg/0.1@user/testing": ["Windows"]})
+        server_store.rebuild_search_index()
+        self._check_search(client, {"pkg/0.1@user/testing": []})
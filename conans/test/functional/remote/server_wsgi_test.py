@@ -0,0 +1,188 @@
+import socket
+import threading
+import time
+import unittest
+
+import requests
+from mock import patch
+from nose.plugins.attrib import attr
+
+from conans.model.ref import ConanFileReference
+from conans.paths import CONANINFO, CONAN_MANIFEST
+from conans.server.store.server_store import ServerStore
+from conans.test.utils.server_launcher import TESTING_REMOTE_PRIVATE_PASS, \
+    TESTING_REMOTE_PRIVATE_USER, TestServerLauncher
+from conans.util.files import save
+
+
+def _start_server(**kwargs):
+    sock = socket.socket()
+    sock.bind(("localhost", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    server = TestServerLauncher()
+    kwargs.update(host="localhost", port=port, quiet=True)
+    thread = threading.Thread(target=server.ra.run, kwargs=kwargs)
+    thread.daemon = True
+    thread.start()
+    for _ in range(50):
+        try:
+            socket.create_connection(("localhost", port)).close()
+            break
+        except socket.error:
+            time.sleep(0.1)
+    return server, port
+
+
+def _read_response(sock):
+    data = b""
+    while b"\r\n\r\n" not in data:
+        data += sock.recv(4096)
+    head, body = data.split(b"\r\n\r\n", 1)
+    length = [int(line.split(b":")[1]) for line in head.split(b"\r\n")
+              if line.lower().startswith(b"content-length")][0]
+    while len(body) < length:
+        body += sock.recv(4096)
+    return head, body
+
+
+class ConanWSGIServerTest(unittest.TestCase):
+
+    def keep_alive_test(self):
+        _, port = _start_server(threads=2)
+        sock = socket.create_connection(("localhost", port))
+        try:
+            # Several requests of the same connection, with an unread body in between
+            for request in (b"GET /v1/ping HTTP/1.1\r\nHost: localhost\r\n\r\n",
+                            b"PUT /v1/ping HTTP/1.1\r\nHost: localhost\r\n"
+                            b"Content-Length: 5\r\n\r\nhello",
+                            b"GET /v1/ping HTTP/1.1\r\nHost: localhost\r\n\r\n"):
+                sock.sendall(request)
+                head, _ = _read_response(sock)
+                self.assertTrue(head.startswith(b"HTTP/1.1 "))
+                self.assertNotIn(b"Connection: close", head)
+        finally:
+            sock.close()
+
+        # The HTTP/1.0 clients get the connection closed
+        sock = socket.create_connection(("localhost", port))
+        try:
+            sock.sendall(b"GET /v1/ping HTTP/1.0\r\n\r\n")
+            head, _ = _read_response(sock)
+            self.assertIn(b"Connection: close", head)
+            self.assertEqual(b"", sock.recv(4096))
+        finally:
+            sock.close()
+
+    def concurrent_test(self):
+        _, port = _start_server(threads=2, request_timeout=30)
+        # A slow client, that doesn't send its request, doesn't block the others
+        slow_client = socket.create_connection(("localhost", port))
+        try:
+            slow_client.sendall(b"GET /v1/ping HTTP/1.1\r\n")
+            response = requests.get("http://localhost:%d/v1/ping" % port, timeout=10)
+            self.assertEqual(200, response.status_code)
+        finally:
+            slow_client.close()
+
+    def idle_timeout_test(self):
+        _, port = _start_server(threads=1, keep_alive_timeout=1)
+        sock = socket.create_connection(("localhost", port))
+        try:
+            sock.sendall(b"GET /v1/ping HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            _read_response(sock)
+            time.sleep(2)
+            # The idle connection was closed, and its thread serves other clients
+            self.assertEqual(b"", sock.recv(4096))
+            response = requests.get("http://localhost:%d/v1/ping" % port, timeout=10)
+            self.assertEqual(200, response.status_code)
+        finally:
+            sock.close()
+
+    def concurrent_package_uploads_test(self):
+        server, port = _start_server(threads=8)
+        store = server.server_store
+        ref = ConanFileReference.loads("pkg/0.1@%s/testing#rev1" % TESTING_REMOTE_PRIVATE_USER)
+        save(store.get_conanfile_file_path(ref, "conanfile.py"), "recipe")
+        store.update_last_revision(ref)
+        self.assertEqual({}, store.get_package_infos(ref))  # The search index is built
+        token = requests.get("http://localhost:%d/v2/users/authenticate" % port,
+                             auth=(TESTING_REMOTE_PRIVATE_USER, TESTING_REMOTE_PRIVATE_PASS),
+                             timeout=10).text
+        url = ("http://localhost:%d/v2/conans/pkg/0.1/%s/testing/revisions/rev1/packages/%s/"
+               "revisions/prev1/files/%s")
+        package_ids = ["package%d" % i for i in range(2)]
+        scanned = {package_id: threading.Event() for package_id in package_ids}
+        errors = []
+
+        def upload(package_id, filename):
+            if filename == CONANINFO:
+                scanned[package_id].wait(10)
+            response = requests.put(url % (port, TESTING_REMOTE_PRIVATE_USER, package_id,
+                                           filename),
+                                    data="[settings]\n    os=Linux\n",
+                                    headers={"Authorization": "Bearer %s" % token}, timeout=30)
+            if response.status_code != 200:
+                errors.append(response.text)
+
+        scan_package_info = ServerStore._scan_package_info
+
+        def slow_scan(self_, pref):
+            info = scan_package_info(self_, pref)
+            if info is None:  # The conaninfo.txt is uploaded and scanned meanwhile
+                scanned[pref.id].set()
+                time.sleep(0.5)
+            return info
+
+        # The manifest scan doesn't find the conaninfo.txt, uploaded concurrently
+        with patch.object(ServerStore, "_scan_package_info", slow_scan):
+            threads = [threading.Thread(target=upload, args=(package_id, filename))
+                       for package_id in package_ids
+                       for filename in (CONAN_MANIFEST, CONANINFO)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual([], errors)
+        # None of them is missing in the search index
+        self.assertEqual(package_ids, sorted(store.get_package_infos(ref)))
+
+@attr("slow")
+class ConanWSGIServerBenchmarkTest(unittest.TestCase):
+    """ concurrent downloads of a big file by clients with a limited bandwidth, with the default
+    bottle server, that serves one request at a time, and with the threaded server
+    """
+
+    def _download_throughput(self, clients, **kwargs):
+        server, port = _start_server(**kwargs)
+        ref = ConanFileReference.loads("pkg/0.1@user/testing#rev1")
+        size = 16 * 1024 * 1024
+        save(server.server_store.get_conanfile_file_path(ref, "conan_sources.tgz"),
+             "x" * size)
+        server.server_store.update_last_revision(ref)
+        url = ("http://localhost:%d/v2/conans/pkg/0.1/user/testing/revisions/rev1/files/"
+               "conan_sources.tgz" % port)
+
+        def download():
+            response = requests.get(url, stream=True, timeout=300)
+            read = 0
+            for chunk in response.iter_content(1024 * 1024):
+                read += len(chunk)
+                time.sleep(0.02)  # ~50 MB/s per client
+            assert read == size
+
+        threads = [threading.Thread(target=download) for _ in range(clients)]
+        t1 = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.time() - t1
+        throughput = clients * size / elapsed / 1024 / 1024
+        print("%d concurrent downloads with %s: %.1f MB/s" % (clients, kwargs, throughput))
+        return throughput
+
+    def download_throughput_test(self):
+        single = self._download_throughput(8)
+        threaded = self._download_throughput(8, threads=8)
+        self.assertGreater(threaded, single * 2)
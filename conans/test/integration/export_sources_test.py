@@ -120,7 +120,7 @@ class ExportsSourcesTest(unittest.TestCase):
         server = server or self.server
         rev, _ = server.server_store.get_last_revision(self.ref)
         ref = self.ref.copy_with_rev(rev)
-        self.assertEqual(scan_folder(server.server_store.export(ref)), expected_server)
+        self.assertEqual(sorted(server.server_store.get_recipe_file_list(ref)), expected_server)
 
     def _check_export_folder(self, mode, export_folder=None, export_src_folder=None):
         if mode == "exports_sources":
@@ -0,0 +1,80 @@
+import os
+import threading
+import unittest
+
+from mock import patch
+
+from conans.client.remote_manager import RemoteManager
+from conans.errors import ConanException
+from conans.test.utils.tools import GenConanfile, TestClient, TestServer
+from conans.util.files import load
+
+
+class InstallParallelTest(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = {"default": TestServer(write_permissions=[("*/*@*/*", "*")])}
+        client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]})
+        for name in ("LibA", "LibB", "LibC"):
+            conanfile = (GenConanfile().with_package_file("%s.lib" % name, name)
+                                       .with_package_info(cpp_info={"libs": [name]},
+                                                          env_info={}))
+            client.save({"conanfile.py": conanfile}, clean_first=True)
+            client.run("create . %s/0.1@user/testing" % name)
+        client.save({"conanfile.py": GenConanfile().with_require_plain("LibA/0.1@user/testing")
+                                                    .with_require_plain("LibB/0.1@user/testing")
+                                                    .with_require_plain("LibC/0.1@user/testing")},
+                    clean_first=True)
+        client.run("create . LibD/0.1@user/testing")
+        client.run("upload * --all --confirm")
+
+        self.client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]})
+
+    def _install(self, get_package=None, assert_error=False):
+        threads = []
+        original = RemoteManager.get_package
+
+        def _get_package(remote_manager, pref, *args):
+            threads.append(threading.current_thread())
+            if get_package:
+                get_package(pref)
+            return original(remote_manager, pref, *args)
+
+        self.client.run("remove * -f")
+        with patch.object(RemoteManager, "get_package", new=_get_package):
+            self.client.run("install LibD/0.1@user/testing -g txt", assert_error=assert_error)
+        return threads
+
+    def parallel_test(self):
+        threads = self._install()
+        sequential_info = load(os.path.join(self.client.current_folder, "conanbuildinfo.txt"))
+        self.assertEqual(4, len(threads))
+        self.assertTrue(all(t is threading.current_thread() for t in threads))
+
+        self.client.run("config set general.parallel_download=4")
+        threads = self._install()
+        self.assertEqual(4, len(threads))
+        # LibD is alone in its level, the other ones are downloaded concurrently
+        self.assertEqual(1, len([t for t in threads if t is threading.current_thread()]))
+        for name in ("LibA", "LibB", "LibC", "LibD"):
+            self.assertIn("%s/0.1@user/testing: Downloaded package revision" % name,
+                          self.client.out)
+        self.assertEqual(sequential_info,
+                         load(os.path.join(self.client.current_folder, "conanbuildinfo.txt")))
+
+    def failure_test(self):
+        self.client.run("config set general.parallel_download=2")
+
+        def get_package(pref):
+            if pref.ref.name == "LibA":
+                raise ConanException("Broken download")
+
+        threads = self._install(get_package, assert_error=True)
+        self.assertIn("ERROR: Broken download", self.client.out)
+        self.assertNotIn("LibD/0.1@user/testing: Retrieving package", self.client.out)
+        self.assertLessEqual(len(threads), 3)
+
+        # Nothing is left half installed
+        self._install()
+        for name in ("LibA", "LibB", "LibC", "LibD"):
+            self.assertIn("%s/0.1@user/testing: Package installed" % name, self.client.out)
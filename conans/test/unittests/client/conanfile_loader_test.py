@@ -5,10 +5,11 @@ import unittest
 from collections import OrderedDict
 
 import six
-from mock import Mock
+from mock import Mock, patch
 from mock.mock import call
 from parameterized import parameterized
 
+from conans.client.cache.bytecode_cache import BYTECODE_CACHE_FOLDER, BytecodeCache
 from conans.client.graph.python_requires import ConanPythonRequire
 from conans.client.loader import ConanFileLoader, ConanFileTextLoader,\
     _parse_conanfile
@@ -20,7 +21,7 @@ from conans.model.requires import Requirements
 from conans.model.settings import Settings
 from conans.test.utils.test_files import temp_folder
 from conans.test.utils.tools import test_profile,\
-    TestBufferConanOutput
+    TestBufferConanOutput, TestClient
 from conans.util.files import save
 
 
@@ -340,3 +341,77 @@ def append(data):
             self.assertIs(loaded1.myconanlogger.value, loaded2.myconanlogger.value)
         finally:
             sys.path.remove(temp)
+
+
+class BytecodeCacheLoaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.bytecode_cache = BytecodeCache(temp_folder())
+        tmp = temp_folder()
+        self.conanfile_path = os.path.join(tmp, "conanfile.py")
+        save(self.conanfile_path, "from helper import value\nresult = value + 1")
+        save(os.path.join(tmp, "helper.py"), "value = 1")
+
+    def _load(self):
+        with patch("conans.client.cache.bytecode_cache.compile", create=True,
+                   side_effect=compile) as compile_mock:
+            loaded, module_id = _parse_conanfile(self.conanfile_path, self.bytecode_cache)
+        self.assertEqual(self.conanfile_path, loaded.__file__)
+        self.assertIn("%s.helper" % module_id, sys.modules)
+        self.assertNotIn("helper", sys.modules)
+        return loaded.result, compile_mock.call_count
+
+    def cached_test(self):
+        self.assertEqual((2, 1), self._load())
+        self.assertEqual((2, 0), self._load())
+
+    def changed_contents_test(self):
+        self.assertEqual((2, 1), self._load())
+        save(self.conanfile_path, "from helper import value\nresult = value + 2")
+        self.assertEqual((3, 1), self._load())
+        self.assertEqual((3, 0), self._load())
+
+    def corrupted_test(self):
+        self.assertEqual((2, 1), self._load())
+        folder = self.bytecode_cache._folder
+        for f in os.listdir(folder):
+            with open(os.path.join(folder, f), "r+b") as entry:
+                entry.truncate(os.path.getsize(entry.name) - 10)
+        self.assertEqual((2, 1), self._load())
+        self.assertEqual((2, 0), self._load())
+
+    def error_test(self):
+        save(self.conanfile_path, "result = value")
+        for _ in range(2):
+            with six.assertRaisesRegex(self, ConanException, "NameError"):
+                _parse_conanfile(self.conanfile_path, self.bytecode_cache)
+
+    def eviction_test(self):
+        tmp = temp_folder()
+        paths = [os.path.join(tmp, "conanfile%d.py" % i) for i in range(3)]
+        for path in paths:
+            save(path, "result = 1")
+        folder = self.bytecode_cache._folder
+        with patch("conans.client.cache.bytecode_cache.BYTECODE_CACHE_MAX_ENTRIES", 2):
+            self.bytecode_cache.code(paths[0])
+            self.bytecode_cache.code(paths[1])
+            entry0 = self.bytecode_cache._path(paths[0])
+            entry1 = self.bytecode_cache._path(paths[1])
+            os.utime(entry0, (1, 1))
+            os.utime(entry1, (2, 2))
+            self.bytecode_cache.code(paths[0])  # Used again, entry1 is the least recently used
+            self.bytecode_cache.code(paths[2])
+        self.assertEqual(2, len(os.listdir(folder)))
+        self.assertTrue(os.path.exists(entry0))
+        self.assertFalse(os.path.exists(entry1))
+
+    def config_test(self):
+        client = TestClient()
+        client.save({"conanfile.py": "from conans import ConanFile\n"
+                                     "class Pkg(ConanFile):\n    pass"})
+        folder = os.path.join(client.cache_folder, BYTECODE_CACHE_FOLDER)
+        client.run("export . pkg/0.1@")
+        self.assertFalse(os.path.exists(folder))
+        client.run("config set general.bytecode_cache=True")
+        client.run("export . pkg/0.1@")
+        self.assertEqual(1, len(os.listdir(folder)))
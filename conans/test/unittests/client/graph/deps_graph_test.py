@@ -1,4 +1,5 @@
 import unittest
+from mock import patch
 
 from conans.client.graph.graph_builder import DepsGraph, Node
 from conans.model.conan_file import ConanFile
@@ -109,3 +110,86 @@ class DepsGraphTest(unittest.TestCase):
         deps.add_edge(n2, n32, None)
         deps.add_edge(n32, n5, None)
         self.assertEqual([[n5, n31], [n32], [n2], [n1]], deps.by_levels())
+
+    def connect_transitive_closure_test(self):
+        ref1 = ConanFileReference.loads("Hello/1.0@user/stable")
+        ref2 = ConanFileReference.loads("Bye/2.0@user/stable")
+        ref3 = ConanFileReference.loads("Chat/3.0@user/stable")
+        ref3b = ConanFileReference.loads("Chat/3.1@user/stable")
+
+        deps = DepsGraph()
+        n1 = Node(ref1, 1)
+        n2 = Node(ref2, 2)
+        n3 = Node(ref3, 3)
+        n3b = Node(ref3b, 4)
+        for n in (n1, n2, n3, n3b):
+            deps.add_node(n)
+            n.init_closures()
+        n1.public_deps = {n1.name: n1}
+        n2.add_transitive(n3)
+
+        n1.connect_transitive_closure(n2)
+        self.assertEqual([n1, n2, n3], list(n1.public_closure.values()))
+        self.assertEqual({n1}, n3.inverse_closure)
+
+        # Overriding a node by name invalidates its bit, so it can be connected again
+        n1.connect_closure(n3b)
+        self.assertIs(n3b, n1.public_deps["Chat"])
+        n1.connect_transitive_closure(n2)
+        self.assertIs(n3, n1.public_closure["Chat"])
+        self.assertIs(n3, n1.public_deps["Chat"])
+        self.assertEqual([n1, n2, n3], list(n1.public_closure.values()))
+
+    def update_transitive_closure_test(self):
+        ref1 = ConanFileReference.loads("Hello/1.0@user/stable")
+        ref2 = ConanFileReference.loads("Bye/2.0@user/stable")
+        ref3 = ConanFileReference.loads("Chat/3.0@user/stable")
+        ref3b = ConanFileReference.loads("Chat/3.1@user/stable")
+
+        deps = DepsGraph()
+        n1 = Node(ref1, 1)
+        n2 = Node(ref2, 2)
+        n3 = Node(ref3, 3)
+        n3b = Node(ref3b, 4)
+        for n in (n1, n2, n3, n3b):
+            deps.add_node(n)
+            n.init_closures()
+        n2.add_transitive(n3)
+
+        self.assertTrue(n1.update_transitive_closure(n2))
+        self.assertEqual([n1, n2, n3], list(n1.transitive_closure.values()))
+        # Nothing new, the closure is not iterated
+        with patch.object(n2, "transitive_closure", None):
+            self.assertFalse(n1.update_transitive_closure(n2))
+
+        # Overriding a node by name invalidates its bit, so it can be updated again
+        n1.add_transitive(n3b)
+        self.assertIs(n3b, n1.transitive_closure["Chat"])
+        self.assertTrue(n1.update_transitive_closure(n2))
+        self.assertEqual([n1, n2, n3], list(n1.transitive_closure.values()))
+
+    def levels_invalidation_test(self):
+        ref1 = ConanFileReference.loads("Hello/1.0@user/stable")
+        ref2 = ConanFileReference.loads("Hello/2.0@user/stable")
+        ref3 = ConanFileReference.loads("Hello/3.0@user/stable")
+
+        deps = DepsGraph()
+        n1 = Node(ref1, 1)
+        n2 = Node(ref2, 2)
+        n3 = Node(ref3, 3)
+        deps.add_node(n1)
+        deps.add_node(n2)
+        deps.add_edge(n1, n2, None)
+        levels = deps.by_levels()
+        self.assertEqual([[n2], [n1]], levels)
+        levels.pop()  # Modifying the result doesn't affect the graph
+        self.assertEqual([[n2], [n1]], deps.by_levels())
+        self.assertEqual([[n1], [n2]], deps.inverse_levels())
+
+        deps.add_node(n3)
+        self.assertEqual([[n2, n3], [n1]], deps.by_levels())
+        deps.add_edge(n2, n3, None)
+        self.assertEqual([[n3], [n2], [n1]], deps.by_levels())
+        self.assertEqual([[n1], [n2], [n3]], deps.inverse_levels())
+        self.assertEqual([[n1, n3]], deps.by_levels(nodes_subset={n1, n3}))
+        self.assertEqual([[n2], [n1]], deps.by_levels(nodes_subset={n1, n2}))
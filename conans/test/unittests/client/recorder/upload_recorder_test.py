@@ -1,5 +1,6 @@
 import unittest
 from datetime import datetime
+from multiprocessing.pool import ThreadPool
 
 from conans.client.recorder.upload_recoder import UploadRecorder
 from conans.model.ref import ConanFileReference, PackageReference
@@ -132,6 +133,29 @@ class UploadRecorderTest(unittest.TestCase):
         }
         self._check_result(expected_result_without_time, info)
 
+    def concurrent_test(self):
+        refs = [ConanFileReference.loads("fake%d/0.1@user/channel" % i) for i in range(10)]
+        for ref in refs:
+            self.upload_recorder.add_recipe(ref, "my_remote", "https://fake_url.com")
+        prefs = [PackageReference(ref, "package_id%d" % i) for ref in refs for i in range(50)]
+
+        def _add_package(pref):
+            self.upload_recorder.add_package(pref, "my_remote", "https://fake_url.com")
+
+        thread_pool = ThreadPool(8)
+        try:
+            thread_pool.map(_add_package, prefs)
+        finally:
+            thread_pool.close()
+            thread_pool.join()
+        info = self.upload_recorder.get_info()
+        self.assertEqual(["fake%d/0.1@user/channel" % i for i in range(10)],
+                         [item["recipe"]["id"] for item in info["uploaded"]])
+        for item in info["uploaded"]:
+            self.assertEqual(["package_id%d" % i for i in range(50)],
+                             sorted((p["id"] for p in item["packages"]),
+                                    key=lambda id_: int(id_[len("package_id"):])))
+
     def _check_result(self, expected, result):
         for i, item in enumerate(result["uploaded"]):
             assert item["recipe"]["time"]
@@ -1,9 +1,16 @@
 import os
+import shutil
+import time
 import unittest
+from multiprocessing.pool import ThreadPool
 
+from mock import patch
+
+from conans.client.cache.digest_cache import DigestCache
+from conans.client.tools.env import environment_append
 from conans.model.manifest import FileTreeManifest
 from conans.test.utils.test_files import temp_folder
-from conans.util.files import load, md5, save
+from conans.util.files import load, md5, md5sum, rmdir, save
 
 
 class ManifestTest(unittest.TestCase):
@@ -45,3 +52,75 @@ class ManifestTest(unittest.TestCase):
         # Not included the pycs or pyo
         self.assertEqual(set(read_manifest.file_sums.keys()),
                           set(["conanfile.py"]))
+
+
+class ManifestDigestCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = temp_folder()
+        self.files = {"file%d.txt" % i: "contents %d" % i for i in range(10)}
+        self.digest_cache = DigestCache(temp_folder())
+        self._save(self.files)
+
+    def _save(self, files):
+        past = time.time() - 100  # Recently modified files are not cached
+        for name, content in files.items():
+            path = os.path.join(self.folder, name)
+            save(path, content)
+            os.utime(path, (past, past))
+
+    def _create(self, **kwargs):
+        with patch("conans.model.manifest.md5sum", side_effect=md5sum) as md5sum_mock:
+            manifest = FileTreeManifest.create(self.folder, **kwargs)
+        self.assertEqual({name: md5(content) for name, content in self.files.items()},
+                         manifest.file_sums)
+        return sorted(os.path.basename(c[0][0]) for c in md5sum_mock.call_args_list)
+
+    def incremental_test(self):
+        self.assertEqual(sorted(self.files), self._create(digest_cache=self.digest_cache))
+        self.assertEqual([], self._create(digest_cache=self.digest_cache))
+
+        self.files["file3.txt"] = "modified contents"
+        self.files["new.txt"] = "new"
+        self._save({"file3.txt": self.files["file3.txt"], "new.txt": "new"})
+        self.assertEqual(["file3.txt", "new.txt"], self._create(digest_cache=self.digest_cache))
+        self.assertEqual([], self._create(digest_cache=self.digest_cache))
+
+        # Not using the cache hashes everything
+        self.assertEqual(sorted(self.files), self._create())
+
+    def recently_modified_test(self):
+        save(os.path.join(self.folder, "file1.txt"), self.files["file1.txt"])
+        self.assertEqual(sorted(self.files), self._create(digest_cache=self.digest_cache))
+        self.assertEqual(["file1.txt"], self._create(digest_cache=self.digest_cache))
+
+    def origin_folder_test(self):
+        origin_folder = self.folder
+        self.folder = temp_folder()
+        for name in self.files:
+            shutil.copy2(os.path.join(origin_folder, name), os.path.join(self.folder, name))
+        self.assertEqual(sorted(self.files), self._create(digest_cache=self.digest_cache,
+                                                          origin_folder=origin_folder))
+
+        # A new copy, the digests of the origin files are used
+        rmdir(self.folder)
+        os.makedirs(self.folder)
+        for name in self.files:
+            shutil.copy2(os.path.join(origin_folder, name), os.path.join(self.folder, name))
+        # Modified after copied
+        self.files["file2.txt"] = "modified"
+        save(os.path.join(self.folder, "file2.txt"), "modified")
+        self.assertEqual(["file2.txt"], self._create(digest_cache=self.digest_cache,
+                                                     origin_folder=origin_folder))
+
+    def parallel_test(self):
+        with environment_append({"CONAN_CPU_COUNT": "4"}):
+            # Small files are hashed without threads
+            with patch("conans.model.manifest.ThreadPool") as pool_mock:
+                self.assertEqual(sorted(self.files), self._create())
+            self.assertFalse(pool_mock.called)
+            with patch("conans.model.manifest.CONCURRENT_MD5_SIZE", 10):
+                with patch("conans.model.manifest.ThreadPool",
+                           side_effect=ThreadPool) as pool_mock:
+                    self.assertEqual(sorted(self.files), self._create())
+            pool_mock.assert_called_once_with(4)
@@ -1,5 +1,7 @@
 import unittest
 
+import six
+
 from conans.client.graph.range_resolver import satisfying
 from conans.errors import ConanException
 from conans.test.utils.tools import TestBufferConanOutput
@@ -103,3 +105,22 @@ class BasicMaxVersionTest(unittest.TestCase):
             satisfying(["2.1.1"], "2.3 3.2, include_prerelease=Ture, loose=False", output)
         with self.assertRaises(ConanException):
             satisfying(["2.1.1"], "~2.3, abc, loose=False", output)
+
+    def repeated_test(self):
+        # Parsed ranges and versions are reused, the result and messages must be the same
+        parsed_ranges, parsed_versions = {}, {}
+        for _ in range(2):
+            output = []
+            result = satisfying(["1.1", "master", "1.2"], ">1.0", output, parsed_ranges,
+                                parsed_versions)
+            self.assertEqual(result, "1.2")
+            self.assertIn("Version 'master' is not semver", "".join(output))
+            result = satisfying(["1.1", "1.2"], ">1.0, loose=False", output, parsed_ranges,
+                                parsed_versions)
+            self.assertEqual(result, None)
+            with six.assertRaisesRegex(self, ConanException, "'>>1.2' is not valid"):
+                satisfying(["1.2"], ">>1.2", output, parsed_ranges, parsed_versions)
+        self.assertEqual({(">1.0", True), (">1.0", False), (">>1.2", True)},
+                         set(parsed_ranges))
+        self.assertEqual({("1.1", True), ("master", True), ("1.2", True), ("1.1", False),
+                          ("1.2", False)}, set(parsed_versions))
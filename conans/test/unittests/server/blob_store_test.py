@@ -0,0 +1,71 @@
+import os
+import unittest
+
+from conans.server.store.blob_store import BlobStore
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import load, save, sha1sum
+
+
+class BlobStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = temp_folder()
+        self.blob_store = BlobStore(os.path.join(self.folder, ".blobs"))
+
+    def link_test(self):
+        rev1 = os.path.join(self.folder, "rev1", "conan_sources.tgz")
+        save(rev1, "sources")
+        sha1 = sha1sum(rev1)
+        rev2 = os.path.join(self.folder, "rev2", "conan_sources.tgz")
+        self.assertFalse(self.blob_store.link(sha1, rev2))
+        self.assertFalse(os.path.exists(rev2))
+
+        self.blob_store.add(rev1)
+        self.assertTrue(self.blob_store.link(sha1, rev2))
+        self.assertEqual("sources", load(rev2))
+        self.assertEqual(os.stat(rev1).st_ino, os.stat(rev2).st_ino)
+        self.assertEqual(3, os.stat(rev1).st_nlink)
+
+        # The same contents uploaded again are linked to the blob
+        rev3 = os.path.join(self.folder, "rev3", "conan_sources.tgz")
+        save(rev3, "sources")
+        self.blob_store.add(rev3)
+        self.assertEqual(os.stat(rev1).st_ino, os.stat(rev3).st_ino)
+        self.assertEqual(4, os.stat(rev1).st_nlink)
+
+    def invalid_checksum_test(self):
+        path = os.path.join(self.folder, "rev1", "conanfile.py")
+        for sha1 in (None, "", "../../conanfile.py", "A" * 40):
+            self.assertFalse(self.blob_store.link(sha1, path))
+
+    def collect_garbage_test(self):
+        rev1 = os.path.join(self.folder, "rev1", "conan_sources.tgz")
+        rev2 = os.path.join(self.folder, "rev2", "conan_sources.tgz")
+        save(rev1, "sources")
+        self.blob_store.add(rev1)
+        sha1 = sha1sum(rev1)
+        self.blob_store.link(sha1, rev2)
+
+        os.remove(rev1)
+        self.blob_store.collect_garbage([sha1])
+        self.assertEqual("sources", load(rev2))
+        self.assertTrue(self.blob_store.link(sha1, rev1))
+        os.remove(rev1)
+        os.remove(rev2)
+        # Just the given blobs are collected
+        self.blob_store.collect_garbage(["0" * 40])
+        self.assertTrue(self.blob_store.link(sha1, rev1))
+        os.remove(rev1)
+        self.blob_store.collect_garbage([sha1])
+        self.assertFalse(self.blob_store.link(sha1, rev1))
+        self.assertEqual([], os.listdir(os.path.join(self.folder, ".blobs")))
+
+    def collect_all_garbage_test(self):
+        rev1 = os.path.join(self.folder, "rev1", "conan_sources.tgz")
+        save(rev1, "sources")
+        sha1 = sha1sum(rev1)
+        self.blob_store.add(rev1)
+        os.remove(rev1)
+        self.blob_store.collect_garbage()
+        self.assertFalse(self.blob_store.link(sha1, rev1))
+        self.assertEqual([], os.listdir(os.path.join(self.folder, ".blobs")))
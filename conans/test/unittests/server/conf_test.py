@@ -112,3 +112,26 @@ text=value
         self.assertEqual(config.host_name, "remotehost")
         self.assertEqual(config.public_port, 33333)
         self.assertEqual(config.public_url, "http://remotehost:33333/v1")
+
+    def test_serving_values(self):
+        # Not defined, the requests are served one by one
+        config = ConanServerConfigParser(self.file_path, environment=self.environ)
+        self.assertEqual(config.threads, 0)
+        self.assertEqual(config.workers, 1)
+        self.assertEqual(config.keep_alive_timeout, 5)
+        self.assertEqual(config.request_timeout, 60)
+
+        server_conf = os.path.join(self.file_path, '.conan_server/server.conf')
+        save(server_conf, fileconfig.replace("port: 9220", "port: 9220\nthreads: 8\nworkers: 4\n"
+                                             "keep_alive_timeout: 0\nrequest_timeout: 300")
+             % self.storage_path)
+        config = ConanServerConfigParser(self.file_path, environment=self.environ)
+        self.assertEqual(config.threads, 8)
+        self.assertEqual(config.workers, 4)
+        self.assertEqual(config.keep_alive_timeout, 0)
+        self.assertEqual(config.request_timeout, 300)
+
+        self.environ["CONAN_SERVER_THREADS"] = "many"
+        config = ConanServerConfigParser(self.file_path, environment=self.environ)
+        with six.assertRaisesRegex(self, ConanException, "Invalid value for 'server.threads'"):
+            config.threads
@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+import unittest
+
+from mock import patch
+
+from conans.server.store.disk_adapter import CHECKSUMS_FILE, ServerDiskAdapter
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import file_checksums, md5sum, save, sha1sum
+
+
+class ServerDiskAdapterChecksumsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.store = temp_folder()
+        self.adapter = ServerDiskAdapter("http://localhost/files", self.store, None)
+        self.folder = os.path.join(self.store, "pkg", "export")
+        self.path = os.path.join(self.folder, "conan_export.tgz")
+        save(self.path, "contents")
+        save(os.path.join(self.folder, "conanfile.py"), "recipe")
+
+    def stored_checksums_test(self):
+        self.adapter.save_checksums(self.path, file_checksums(self.path))
+        with patch("conans.server.store.disk_adapter.file_checksums") as hash_mock:
+            hash_mock.return_value = {"md5": "md5", "sha1": "sha1"}
+            snapshot = self.adapter.get_snapshot(self.folder)
+        # Just the file without stored checksums is hashed, and stored
+        hash_mock.assert_called_once_with(os.path.join(self.folder, "conanfile.py"),
+                                          ("md5", "sha1"))
+        self.assertEqual({self.path: md5sum(self.path),
+                          os.path.join(self.folder, "conanfile.py"): "md5"}, snapshot)
+        with patch("conans.server.store.disk_adapter.file_checksums") as hash_mock:
+            self.adapter.get_snapshot(self.folder)
+        self.assertFalse(hash_mock.called)
+
+        # The checksums file is not one of the files of the revision
+        self.assertTrue(os.path.exists(os.path.join(self.folder, CHECKSUMS_FILE)))
+        self.assertEqual(2, len(self.adapter.get_file_list(self.folder)))
+
+    def sha1_test(self):
+        self.adapter.save_checksums(self.path, {"md5": "md5", "sha1": "stored"})
+        with patch("conans.server.store.disk_adapter.file_checksums") as hash_mock:
+            self.assertEqual("stored", self.adapter.get_sha1(self.path))
+        self.assertFalse(hash_mock.called)
+
+        # Hashed again only if modified
+        os.remove(self.path)
+        save(self.path, "other contents")
+        self.assertEqual(sha1sum(self.path), self.adapter.get_sha1(self.path))
+        with patch("conans.server.store.disk_adapter.file_checksums") as hash_mock:
+            self.assertEqual(sha1sum(self.path), self.adapter.get_sha1(self.path))
+        self.assertFalse(hash_mock.called)
+
+    def modified_test(self):
+        self.adapter.get_snapshot(self.folder)
+        os.remove(self.path)
+        save(self.path, "other contents")
+        self.assertEqual({self.path: md5sum(self.path)},
+                         self.adapter.get_snapshot(self.folder, ["conan_export.tgz"]))
+        self.assertEqual([], self.adapter.scrub())
+
+    def scrub_test(self):
+        self.adapter.get_snapshot(self.folder)
+        self.assertEqual([], self.adapter.scrub())
+
+        # Corrupted in place, without changing its size or modification time
+        st = os.stat(self.path)
+        with open(self.path, "r+b") as f:
+            f.write(b"C")
+        os.utime(self.path, (st.st_atime, st.st_mtime))
+        if getattr(st, "st_mtime_ns", None) is not None:
+            os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertEqual([self.path], self.adapter.scrub())
+
+
+class ServerDiskAdapterLockTest(unittest.TestCase):
+
+    def concurrent_update_test(self):
+        # The requests served by the threads of the same server process don't lose updates
+        adapter = ServerDiskAdapter("http://localhost/files", temp_folder(), None)
+        path = os.path.join(adapter.base_storage_folder(), "revisions.txt")
+        lock_file = path + ".lock"
+
+        def append(contents):
+            time.sleep(0.001)  # Other threads are given the chance to read the same contents
+            return (contents or "") + "x"
+
+        def updates():
+            for _ in range(20):
+                adapter.update_file(path, append, lock_file)
+
+        threads = [threading.Thread(target=updates) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual("x" * 80, adapter.read_file(path, lock_file))
+
+    def concurrent_checksums_test(self):
+        # The files of the same folder uploaded concurrently keep all their checksums
+        adapter = ServerDiskAdapter("http://localhost/files", temp_folder(), None)
+        folder = os.path.join(adapter.base_storage_folder(), "pkg", "package")
+        paths = [os.path.join(folder, "file%d.txt" % i) for i in range(40)]
+        for path in paths:
+            save(path, path)
+
+        def upload(thread_paths):
+            for path in thread_paths:
+                time.sleep(0.001)
+                adapter.save_checksums(path, file_checksums(path))
+
+        threads = [threading.Thread(target=upload, args=(paths[i::4], )) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with patch("conans.server.store.disk_adapter.file_checksums") as hash_mock:
+            hash_mock.return_value = {"md5": "md5", "sha1": "sha1"}
+            snapshot = adapter.get_snapshot(folder)
+        self.assertFalse(hash_mock.called)
+        self.assertEqual({path: md5sum(path) for path in paths}, snapshot)
@@ -40,3 +40,18 @@ class RevisionListTest(unittest.TestCase):
         r_list = RevisionList.loads(old_contents)
         when = r_list.get_time("rev1")
         self.assertEqual(when, iso)
+
+    def test_add_existing(self):
+        rev = RevisionList()
+        rev.add_revision("rev1")
+        rev.add_revision("rev2")
+        rev.add_revision("rev1")
+        self.assertEqual(["rev1", "rev2"], [e.revision for e in rev.as_list()])
+
+        # The files with repeated revisions keep the latest one
+        contents = '{"revisions": [{"revision": "rev1", "time": "t1"}, ' \
+                   '{"revision": "rev2", "time": "t2"}, {"revision": "rev1", "time": "t3"}]}'
+        loaded = RevisionList.loads(contents)
+        self.assertEqual("rev1", loaded.latest_revision().revision)
+        self.assertEqual("t3", loaded.get_time("rev1"))
+        self.assertEqual(2, len(loaded.as_list()))
@@ -0,0 +1,100 @@
+import os
+import unittest
+
+from mock import patch
+
+from conans.model.ref import ConanFileReference
+from conans.server.store.disk_adapter import ServerDiskAdapter
+from conans.server.store.server_store import ServerStore
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import file_checksums, mkdir, save
+
+
+class ServerStoreRevisionsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.storage = temp_folder()
+        self.adapter = ServerDiskAdapter("http://localhost/files", self.storage, None)
+        self.server_store = ServerStore(self.adapter)
+        self.ref = ConanFileReference.loads("pkg/0.1@user/testing#rev1")
+
+    def cached_revisions_test(self):
+        self.server_store.update_last_revision(self.ref)
+        with patch.object(self.adapter, "read_file", wraps=self.adapter.read_file) as read_mock:
+            for _ in range(3):
+                latest = self.server_store.get_last_revision(self.ref.copy_clear_rev())
+                self.assertEqual("rev1", latest.revision)
+                self.assertIsNotNone(self.server_store.get_revision_time(self.ref))
+        self.assertEqual(1, read_mock.call_count)
+
+        # Changed by other process
+        other_store = ServerStore(ServerDiskAdapter("http://localhost/files", self.storage,
+                                                    None))
+        other_store.update_last_revision(self.ref.copy_with_rev("rev2"))
+        latest = self.server_store.get_last_revision(self.ref.copy_clear_rev())
+        self.assertEqual("rev2", latest.revision)
+        self.assertEqual(["rev2", "rev1"],
+                         [e.revision for e in self.server_store.get_recipe_revisions(
+                             self.ref.copy_clear_rev())])
+
+    def evicted_least_recently_used_test(self):
+        refs = [ConanFileReference.loads("pkg%d/0.1@user/testing#rev1" % i) for i in range(4)]
+        for ref in refs:
+            self.server_store.update_last_revision(ref)
+
+        def read(index):
+            with patch.object(self.adapter, "read_file",
+                              wraps=self.adapter.read_file) as read_mock:
+                self.server_store.get_last_revision(refs[index].copy_clear_rev())
+            return read_mock.called
+
+        with patch("conans.server.store.server_store._REVISIONS_CACHE_SIZE", 2):
+            self.assertTrue(read(0))
+            self.assertTrue(read(1))
+            self.assertFalse(read(0))  # The most recently used now
+            self.assertTrue(read(2))  # Evicts 1
+            self.assertTrue(read(3))  # Evicts 0
+            self.assertFalse(read(2))
+            self.assertTrue(read(0))
+
+    def update_once_test(self):
+        # Every uploaded file updates the revision, it is written just for the first one
+        with patch.object(self.adapter, "update_file",
+                          wraps=self.adapter.update_file) as update_mock:
+            for _ in range(3):
+                self.server_store.update_last_revision(self.ref)
+        self.assertEqual(1, update_mock.call_count)
+
+        ref2 = self.ref.copy_with_rev("rev2")
+        mkdir(self.server_store.export(self.ref))
+        mkdir(self.server_store.export(ref2))
+        self.server_store.update_last_revision(ref2)
+        self.server_store.remove_conanfile(ref2)
+        latest = self.server_store.get_last_revision(self.ref.copy_clear_rev())
+        self.assertEqual("rev1", latest.revision)
+
+
+class ServerStoreBlobsTest(unittest.TestCase):
+
+    def remove_test(self):
+        storage = temp_folder()
+        server_store = ServerStore(ServerDiskAdapter("http://localhost/files", storage, None))
+        blobs_folder = os.path.join(storage, ".blobs")
+        paths = {}
+        for rev in ("rev1", "rev2"):
+            ref = ConanFileReference.loads("pkg/0.1@user/testing#%s" % rev)
+            path = server_store.get_conanfile_file_path(ref, "conan_sources.tgz")
+            save(path, "sources %s" % rev)
+            server_store.add_blob(path, file_checksums(path))
+            server_store.update_last_revision(ref)
+            paths[rev] = path
+        # A blob not linked anymore, that is not collected removing other revision
+        os.remove(paths["rev2"])
+
+        with patch("os.listdir", wraps=os.listdir) as listdir_mock:
+            server_store.remove_conanfile(ConanFileReference.loads("pkg/0.1@user/testing#rev1"))
+        self.assertNotIn(blobs_folder, [c[0][0] for c in listdir_mock.call_args_list])
+        self.assertEqual(1, len(os.listdir(blobs_folder)))
+
+        server_store.scrub()  # Collects all of them
+        self.assertEqual([], os.listdir(blobs_folder))
@@ -216,6 +216,8 @@ class ConanServiceTest(unittest.TestCase):
         self.server_store.update_last_package_revision(pref3)
 
         save_files(self.server_store.export(ref4), {"dummy.txt": "//"})
+        # The recipes were saved directly in the store, not uploaded
+        self.server_store.rebuild_search_index()
 
         info = self.search_service.search()
         expected = [r.copy_clear_rev() for r in [ref3, ref4, self.ref, ref2]]
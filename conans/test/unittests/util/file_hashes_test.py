@@ -6,7 +6,7 @@ import six
 from conans.client.tools.files import check_md5, check_sha1, check_sha256
 from conans.errors import ConanException
 from conans.test.utils.test_files import temp_folder
-from conans.util.files import save
+from conans.util.files import file_checksums, md5sum, save, sha1sum, sha256sum
 
 
 class HashesTest(unittest.TestCase):
@@ -29,3 +29,14 @@ class HashesTest(unittest.TestCase):
 
         with six.assertRaisesRegex(self, ConanException, "sha256 signature failed for 'file.txt' file."):
             check_sha256(filepath, "invalid")
+
+    def file_checksums_test(self):
+        folder = temp_folder()
+        filepath = os.path.join(folder, "file.bin")
+        save(filepath, os.urandom(3 * 1024 * 1024 + 5))
+
+        checksums = file_checksums(filepath, ("md5", "sha1", "sha256"))
+        self.assertEqual({"md5": md5sum(filepath),
+                          "sha1": sha1sum(filepath),
+                          "sha256": sha256sum(filepath)}, checksums)
+        self.assertEqual(["md5", "sha1"], sorted(file_checksums(filepath)))
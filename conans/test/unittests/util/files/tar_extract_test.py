@@ -61,3 +61,24 @@ class TarExtractTest(unittest.TestCase):
             with open(self.tgz_file, 'rb') as file_handler:
                 tar_extract(file_handler, destination_dir)
             check_files(destination_dir)
+
+    def test_stream(self):
+        # A non seekable file object is extracted in a single pass
+        class _Stream(object):
+            def __init__(self, handle):
+                self._handle = handle
+
+            def read(self, size=-1):
+                return self._handle.read(size)
+
+        # Unsafe paths are skipped, also when streaming
+        tgz_file = os.path.join(self.tmp_folder, "unsafe.tgz")
+        with tarfile.open(tgz_file, "w:gz") as tgz:
+            tgz.add(self.tgz_file, arcname="../outside")
+            tgz.add(self.tgz_file, arcname="inside")
+
+        destination_dir = os.path.join(self.tmp_folder, "dest")
+        with open(tgz_file, "rb") as handle:
+            tar_extract(_Stream(handle), destination_dir, stream=True)
+        self.assertEqual(["inside"], os.listdir(destination_dir))
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_folder, "outside")))
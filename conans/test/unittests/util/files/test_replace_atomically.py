@@ -0,0 +1,68 @@
+# coding=utf-8
+
+import os
+import time
+import unittest
+
+import six
+
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import evict_least_recently_used, load, replace_atomically, \
+    save, save_atomically, touch
+
+
+class ReplaceAtomicallyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = temp_folder()
+        self.file = os.path.join(self.folder, "file.txt")
+
+    def test_save_atomically(self):
+        save_atomically(os.path.join(self.folder, "subfolder", "file.txt"), "contents")
+        self.assertEqual("contents", load(os.path.join(self.folder, "subfolder", "file.txt")))
+        save(self.file, "old")
+        save_atomically(self.file, "new")
+        self.assertEqual("new", load(self.file))
+        self.assertEqual(["file.txt", "subfolder"], sorted(os.listdir(self.folder)))
+
+    def test_failure_discards_temporary(self):
+        save(self.file, "old")
+
+        def create(tmp_path):
+            save(tmp_path, "new")
+            raise IOError("Disk full")
+
+        with six.assertRaisesRegex(self, IOError, "Disk full"):
+            replace_atomically(self.file, create)
+        self.assertEqual("old", load(self.file))
+        self.assertEqual(["file.txt"], os.listdir(self.folder))
+
+    def test_failure_custom_discard(self):
+        src = os.path.join(self.folder, "src.txt")
+        save(src, "contents")
+        os.mkdir(self.file)  # A file can't replace a folder
+
+        def discard(tmp_path):
+            os.rename(tmp_path, src)
+
+        with self.assertRaises(OSError):
+            replace_atomically(self.file, lambda tmp_path: os.rename(src, tmp_path), discard)
+        self.assertEqual("contents", load(src))
+        self.assertEqual(["file.txt", "src.txt"], sorted(os.listdir(self.folder)))
+
+
+class EvictLeastRecentlyUsedTest(unittest.TestCase):
+
+    def test_evict(self):
+        folder = temp_folder()
+        now = time.time()
+        for i in range(5):
+            path = os.path.join(folder, "entry%d" % i)
+            save(path, "contents")
+            touch(path, (now - 100 + i, now - 100 + i))
+        touch(os.path.join(folder, "entry0"))  # Recently used
+
+        evict_least_recently_used(folder, 3)
+        self.assertEqual(["entry0", "entry3", "entry4"], sorted(os.listdir(folder)))
+        evict_least_recently_used(folder, 3)
+        self.assertEqual(["entry0", "entry3", "entry4"], sorted(os.listdir(folder)))
@@ -28,12 +28,12 @@ class XZTest(TestCase):
         server.server_store.update_last_revision(ref)
         save_files(export, {"conanfile.py": "#",
                             "conanmanifest.txt": "#",
-                            "conan_export.txz": "#"})
+                            "conan_export.tzst": "#"})
         client = TestClient(servers={"default": server},
                             users={"default": [("lasote", "mypass")]})
         client.run("install Pkg/0.1@user/channel", assert_error=True)
         self.assertIn("ERROR: This Conan version is not prepared to handle "
-                      "'conan_export.txz' file format", client.out)
+                      "'conan_export.tzst' file format", client.out)
 
     def test_error_sources_xz(self):
         server = TestServer()
@@ -49,10 +49,10 @@ class Pkg(ConanFile):
 """
         save_files(export, {"conanfile.py": conanfile,
                             "conanmanifest.txt": "1",
-                            "conan_sources.txz": "#"})
+                            "conan_sources.tzst": "#"})
         client.run("install Pkg/0.1@user/channel --build", assert_error=True)
         self.assertIn("ERROR: This Conan version is not prepared to handle "
-                      "'conan_sources.txz' file format", client.out)
+                      "'conan_sources.tzst' file format", client.out)
 
     def test_error_package_xz(self):
         server = TestServer()
@@ -75,10 +75,10 @@ class Pkg(ConanFile):
         package = server.server_store.package(pref)
         save_files(package, {"conaninfo.txt": "#",
                              "conanmanifest.txt": "1",
-                             "conan_package.txz": "#"})
+                             "conan_package.tzst": "#"})
         client.run("install Pkg/0.1@user/channel", assert_error=True)
         self.assertIn("ERROR: This Conan version is not prepared to handle "
-                      "'conan_package.txz' file format", client.out)
+                      "'conan_package.tzst' file format", client.out)
 
     @unittest.skipUnless(six.PY3, "only Py3")
     def test(self):
@@ -8,6 +8,7 @@ import stat
 import sys
 import tarfile
 import tempfile
+import uuid
 
 
 from os.path import abspath, join as joinpath, realpath
@@ -145,15 +146,49 @@ def sha256sum(file_path):
 
 
 def _generic_algorithm_sum(file_path, algorithm_name):
+    return file_checksums(file_path, (algorithm_name, ))[algorithm_name]
 
+
+CHECKSUMS_BUFFER_SIZE = 1024 * 1024
+
+
+class MultiHasher(object):
+    """ Computes several hashes (md5, sha1, sha256...) of the same data in a single pass, as it is
+    read from a file, written to it or received from the network
+    """
+
+    def __init__(self, algorithms=("md5", "sha1")):
+        self._hashes = [(name, hashlib.new(name)) for name in algorithms]
+
+    def update(self, data):
+        for _, h in self._hashes:
+            h.update(data)
+
+    def hexdigests(self):
+        return {name: h.hexdigest() for name, h in self._hashes}
+
+
+def file_checksums(file_path, algorithms=("md5", "sha1")):
+    """ {algorithm: hex digest} of the contents of the file, reading it just once
+    """
+    hasher = MultiHasher(algorithms)
     with open(file_path, 'rb') as fh:
-        m = hashlib.new(algorithm_name)
         while True:
-            data = fh.read(8192)
+            data = fh.read(CHECKSUMS_BUFFER_SIZE)
             if not data:
                 break
-            m.update(data)
-        return m.hexdigest()
+            hasher.update(data)
+    return hasher.hexdigests()
+
+
+def stat_key(path):
+    """ what identifies the contents of a file without reading it: (size, mtime_ns, inode)
+    """
+    st = os.stat(path)
+    mtime_ns = getattr(st, "st_mtime_ns", None)  # Python 2 has just the float mtime
+    if mtime_ns is None:
+        mtime_ns = int(st.st_mtime * 1000000000)
+    return [st.st_size, mtime_ns, st.st_ino]
 
 
 def save_append(path, content, encoding="utf-8"):
@@ -191,6 +226,46 @@ def save(path, content, only_if_modified=False, encoding="utf-8"):
         handle.write(new_content)
 
 
+def replace_atomically(path, create, discard=os.remove):
+    """ create(tmp_path) makes a unique temporary file next to path, that is then atomically
+    renamed to path, so the readers of path always get a complete file, even while other
+    processes are writing it. If anything fails, discard(tmp_path) is called and the error raised
+    """
+    tmp_path = "%s.%s" % (path, uuid.uuid4().hex)
+    try:
+        create(tmp_path)
+        replace = getattr(os, "replace", os.rename)  # os.rename can't overwrite in Windows
+        replace(tmp_path, path)
+    except BaseException:
+        if os.path.lexists(tmp_path):
+            discard(tmp_path)
+        raise
+
+
+def save_atomically(path, content, encoding="utf-8"):
+    """ as save(), but atomically replacing the file with replace_atomically()
+    """
+    replace_atomically(path, lambda tmp_path: save(tmp_path, content, encoding=encoding))
+
+
+def evict_least_recently_used(folder, max_entries):
+    """ removes the files of the folder beyond the max_entries most recently modified ones. The
+    caches touch() their entries when they are used, so the least recently used are removed
+    """
+    entries = []
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        try:
+            entries.append((os.stat(path).st_mtime, path))
+        except OSError:  # Concurrently removed
+            continue
+    for _, path in sorted(entries)[:-max_entries]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
 def mkdir_tmp():
     return tempfile.mkdtemp(suffix='tmp_conan')
 
@@ -330,9 +405,10 @@ def gzopen_without_timestamps(name, mode="r", fileobj=None, compresslevel=None,
     return t
 
 
-def tar_extract(fileobj, destination_dir):
+def tar_extract(fileobj, destination_dir, stream=False):
     """Extract tar file controlling not absolute paths and fixing the routes
-    if the tar was zipped in windows"""
+    if the tar was zipped in windows. With stream=True the fileobj is read sequentially, just
+    once, so it can be a non seekable stream"""
     def badpath(path, base):
         # joinpath will ignore base if path is absolute
         return not realpath(abspath(joinpath(base, path))).startswith(base)
@@ -349,7 +425,7 @@ def tar_extract(fileobj, destination_dir):
                 finfo.name = finfo.name.replace("\\", "/")
                 yield finfo
 
-    the_tar = tarfile.open(fileobj=fileobj)
+    the_tar = tarfile.open(fileobj=fileobj, mode="r|*" if stream else "r")
     # NOTE: The errorlevel=2 has been removed because it was failing in Win10, it didn't allow to
     # "could not change modification time", with time=0
     # the_tar.errorlevel = 2  # raise exception if any error